@@ -0,0 +1,73 @@
+"""Operator CLI for the admin service of a running server.
+
+    ADMIN_TOKEN=... python admin_client.py start --requests 20 --memory
+    ADMIN_TOKEN=... python admin_client.py status
+    ADMIN_TOKEN=... python admin_client.py stop --pstats profile.pstats
+    ADMIN_TOKEN=... python admin_client.py sample 0.001
+    ADMIN_TOKEN=... python admin_client.py metrics
+"""
+
+import argparse
+import json
+
+import grpc
+from google.protobuf.json_format import MessageToDict
+
+from config import settings
+from grpc_service import admin_pb2
+from grpc_service.admin_pb2_grpc import AdminServiceStub
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", default=f"{settings.GRPC_HOST}:{settings.GRPC_PORT}")
+    commands = parser.add_subparsers(dest="command", required=True)
+    start = commands.add_parser("start", help="Start a profiling capture")
+    start.add_argument("--requests", type=int, default=0, help="Profile the next N requests")
+    start.add_argument("--seconds", type=float, default=0.0, help="Stop after T seconds")
+    start.add_argument("--no-cpu", action="store_true", help="Skip cProfile")
+    start.add_argument("--memory", action="store_true", help="Trace allocations per stage")
+    stop = commands.add_parser("stop", help="Stop the capture and print its profile")
+    stop.add_argument("--pstats", help="Save the pstats file here")
+    commands.add_parser("status", help="Show the running capture")
+    sample = commands.add_parser("sample", help="Set the background sampling rate")
+    sample.add_argument("rate", type=float)
+    commands.add_parser("metrics", help="Print the process metrics")
+    args = parser.parse_args()
+
+    stub = AdminServiceStub(grpc.insecure_channel(args.target))
+    metadata = (("x-admin-token", settings.ADMIN_TOKEN),)
+    if args.command == "start":
+        request = admin_pb2.StartProfilingRequest(
+            requests=args.requests, seconds=args.seconds, cpu=not args.no_cpu, memory=args.memory
+        )
+        print(MessageToDict(stub.StartProfiling(request, metadata=metadata)))
+    elif args.command == "stop":
+        request = admin_pb2.StopProfilingRequest(includePstats=bool(args.pstats))
+        result = stub.StopProfiling(request, metadata=metadata)
+        print(
+            f"Capture {result.captureId}: "
+            f"{result.requestsProfiled} requests in {result.seconds:.1f}s"
+        )
+        print(f"Artifacts: {result.artifactDir}")
+        print(result.cpuSummary)
+        for stage in result.stages:
+            print(f"{stage.stage}: {stage.calls} calls, {stage.netBytes / 2**20:+.2f} MB net")
+            for allocation in stage.top:
+                print(f"    {allocation.sizeBytes / 1024:>10.1f} KiB  {allocation.location}")
+        if args.pstats:
+            with open(args.pstats, "wb") as f:
+                f.write(result.pstats)
+    elif args.command == "status":
+        request = admin_pb2.ProfilingStatusRequest()
+        print(MessageToDict(stub.GetProfilingStatus(request, metadata=metadata)))
+    elif args.command == "sample":
+        request = admin_pb2.SetProfileSamplingRequest(rate=args.rate)
+        print(MessageToDict(stub.SetProfileSampling(request, metadata=metadata)))
+    else:
+        snapshot = stub.GetMetrics(admin_pb2.MetricsRequest(), metadata=metadata)
+        print(json.dumps(json.loads(snapshot.json), indent=2))
+
+
+if __name__ == "__main__":
+    main()
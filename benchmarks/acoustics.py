@@ -0,0 +1,90 @@
+"""CPU time of the acoustic backends on our audio set.
+
+librosa runs `piptrack` for word stress and `yin` for intonation; praat
+computes one pitch and one intensity track that both stages share. Each input
+is decoded once up front, so only the analysis is timed.
+
+    python -m benchmarks.acoustics --iterations 5 --synthetic 30 120
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.stats import summarize
+
+
+def librosa_tracks(audio) -> None:
+    from services.innotation import extract_pitch_faster
+    from services.wordstress import extract_pitch
+
+    extract_pitch("", audio)
+    extract_pitch_faster(audio.samples, audio.sample_rate)
+
+
+def praat_tracks(audio) -> None:
+    from utils.acoustics import praat_tracks
+
+    praat_tracks(audio)
+
+
+BACKENDS: Dict[str, Callable] = {"librosa": librosa_tracks, "praat": praat_tracks}
+
+
+def measure(fn: Callable, audio, iterations: int) -> Dict[str, List[float]]:
+    fn(audio)  # numba JIT / first-call setup
+    cpu, wall = [], []
+    for _ in range(iterations):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        fn(audio)
+        cpu.append(time.process_time() - cpu_start)
+        wall.append(time.perf_counter() - wall_start)
+    return {"cpu": cpu, "wall": wall}
+
+
+def main():
+    import logging
+
+    from utils.audio import decode_audio
+    from utils.synthetic import synthesize_speech_like
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--audio", default="resources/audio/*")
+    parser.add_argument("--synthetic", type=float, nargs="*", default=[30, 120])
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    paths = [p for p in sorted(glob.glob(args.audio)) if os.path.getsize(p) > 1024]
+    tmpdir = tempfile.mkdtemp(prefix="linglooma-acoustics-")
+    for seconds in args.synthetic:
+        paths.append(
+            synthesize_speech_like(os.path.join(tmpdir, f"synthetic-{int(seconds)}s.wav"), seconds)
+        )
+
+    print(f"{'input':<24}{'seconds':>8}" + "".join(f"{name + ' cpu p50':>18}" for name in BACKENDS) + f"{'speedup':>9}")
+    totals = {name: 0.0 for name in BACKENDS}
+    for path in paths:
+        audio = decode_audio(path)
+        p50 = {}
+        for name, fn in BACKENDS.items():
+            samples = measure(fn, audio, args.iterations)
+            p50[name] = summarize(samples["cpu"])["p50"]
+            totals[name] += p50[name]
+        print(
+            f"{os.path.basename(path):<24}{audio.duration:>8.1f}"
+            + "".join(f"{p50[name]:>17.3f}s" for name in BACKENDS)
+            + f"{p50['librosa'] / p50['praat']:>8.1f}x"
+        )
+    print(
+        f"{'total':<24}{'':>8}"
+        + "".join(f"{totals[name]:>17.3f}s" for name in BACKENDS)
+        + f"{totals['librosa'] / totals['praat']:>8.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
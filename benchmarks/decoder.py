@@ -0,0 +1,96 @@
+"""Decode latency by container: `librosa.load` vs. the decoder subsystem.
+
+Transcodes one recording into each upload container with ffmpeg, then times
+both decoders on every file and checks they return the same signal. Wall
+time includes ffmpeg's startup, which the pre-started workers take off the
+critical path when decodes are spaced out as real requests are.
+
+    python -m benchmarks.decoder --iterations 10
+    python -m benchmarks.decoder --source resources/audio/part2-2.mp3 --formats webm m4a
+"""
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from typing import Callable, List
+
+from benchmarks.stats import summarize
+
+FORMATS = ["wav", "flac", "ogg", "mp3", "webm", "m4a"]
+# Float sources vs. librosa's 16-bit audioread path
+TOLERANCE = 1e-3
+
+
+def librosa_load(path: str):
+    import librosa
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return librosa.load(path, sr=None)
+
+
+def decoder_load(path: str):
+    from utils.audio import decode_audio
+
+    audio = decode_audio(path)
+    return audio.samples, audio.sample_rate
+
+
+def measure(fn: Callable, path: str, iterations: int, pause: float) -> List[float]:
+    times = []
+    for _ in range(iterations):
+        time.sleep(pause)
+        start = time.perf_counter()
+        fn(path)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    import numpy as np
+
+    from config import settings
+    from utils.decoder import ffmpeg_pool, sniff_file
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--source", default="resources/audio/recorded_audio.mp3")
+    parser.add_argument("--formats", nargs="+", default=FORMATS)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument(
+        "--pause", type=float, default=0.05, help="Seconds between decodes (lets workers respawn)"
+    )
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    ffmpeg_pool().warm()
+    failed = False
+    print(f"{'format':<8}{'sniffed':<9}{'librosa p50':>12}{'decoder p50':>12}{'max diff':>10}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for fmt in args.formats:
+            path = os.path.join(tmpdir, f"input.{fmt}")
+            subprocess.run(
+                [settings.FFMPEG_BINARY, "-loglevel", "error", "-y", "-i", args.source, path],
+                check=True,
+            )
+            expected, expected_rate = librosa_load(path)
+            samples, rate = decoder_load(path)
+            n = min(len(expected), len(samples))
+            diff = float(np.max(np.abs(expected[:n] - samples[:n]))) if n else 0.0
+            ok = rate == expected_rate and abs(len(expected) - len(samples)) <= 1 and diff < TOLERANCE
+            failed |= not ok
+            before = summarize(measure(librosa_load, path, args.iterations, args.pause))["p50"]
+            after = summarize(measure(decoder_load, path, args.iterations, args.pause))["p50"]
+            print(
+                f"{fmt:<8}{sniff_file(path):<9}{before * 1000:>10.1f}ms{after * 1000:>10.1f}ms"
+                f"{diff:>10.2g}{'' if ok else '  MISMATCH'}"
+            )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Prompt size of the grading/advice payload: full assessment JSON vs. digest.
+
+Builds assessments for answers of increasing length (word stress lists every
+word, as the pipeline does) and prints the estimated prompt tokens of the old
+`json.dumps` payload next to the digest rendered at each stage's cap.
+
+    python -m benchmarks.digest --durations 30 60 120 240 --errors 20
+"""
+
+import argparse
+import json
+
+from google.protobuf.json_format import MessageToDict
+
+from benchmarks.serialization import stage_results
+from config import settings
+from grpc_service.speaking_pb2 import SpeakingAssessment, WordStressErrorDetail
+from services.assessment import AssessmentBuilder
+from services.digest import AssessmentDigest, estimate_tokens
+from utils.synthetic import script_words
+
+
+def assessment(duration: float, errors: int) -> SpeakingAssessment:
+    results = stage_results(errors)
+    text, words = script_words(duration)
+    result = AssessmentBuilder()
+    result.set_audio_stats(results["stats"])
+    result.set_transcription(text)
+    result.set_pronunciation(results["pronunciation"])
+    result.set_word_stress(results["stress"])
+    result.message.pronunciationAssessment.wordStressErrorDetails.extend(
+        WordStressErrorDetail(
+            word=word,
+            syllableBreakdown=[word],
+            errorType="None",
+            improvementAdvice="Good Job, Keep Practicing!",
+            errorStartIndex=-1,
+            errorEndIndex=-1,
+        )
+        for word, _, _ in words[errors:]
+    )
+    result.set_intonation(results["intonation"])
+    return result.message
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=[30, 60, 120, 240])
+    parser.add_argument("--errors", type=int, default=20, help="Phoneme and stress errors per answer")
+    args = parser.parse_args()
+
+    print(f"{'answer':>8}{'json tokens':>13}{'digest':>9}{'grading':>9}{'advice':>8}")
+    for duration in args.durations:
+        message = assessment(duration, args.errors)
+        payload = json.dumps(MessageToDict(message, always_print_fields_with_no_presence=True))
+        digest = AssessmentDigest.from_message(message)
+        print(
+            f"{duration:>7.0f}s{estimate_tokens(payload):>13}"
+            f"{estimate_tokens(digest.render()):>9}"
+            f"{estimate_tokens(digest.render(settings.DIGEST_GRADING_MAX_TOKENS)):>9}"
+            f"{estimate_tokens(digest.render(settings.DIGEST_ADVICE_MAX_TOKENS)):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
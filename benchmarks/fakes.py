@@ -0,0 +1,199 @@
+"""Local stand-ins for the upstream ASR and LLM calls.
+
+The fakes replace only the methods that talk to OpenAI/Groq/Fireworks, so the
+decode, pitch and rule-based stages of the pipeline still run for real.
+"""
+
+import asyncio
+import random
+from contextlib import contextmanager
+from typing import List
+
+from services.advice import AdviceSummarizerService
+from services.feedback import Feedback, FeedbackService
+from services.grading import Grading, IELTSGradingService
+from services.innotation import InnotationEvaluationService
+from services.phoneme import (
+    FusedPronunciationResponse,
+    PhonemeErrorDetail,
+    PronunciationEvaluationService,
+)
+from services.transcribe import AudioProcessor, Transcript
+from utils.logging import log_execution_time
+from utils.synthetic import script_words
+from utils.transcript import WordTimings, normalize
+
+
+class LatencyModel:
+    """Latency distribution parsed from `kind:args`.
+
+    Supported kinds: `fixed:SECONDS`, `uniform:LOW,HIGH`,
+    `lognormal:MEDIAN,SIGMA`, `zero`.
+    """
+
+    def __init__(self, spec: str, rng: random.Random):
+        self.spec = spec
+        self.rng = rng
+        kind, _, args = spec.partition(":")
+        self.kind = kind
+        self.args = [float(a) for a in args.split(",") if a]
+        if kind not in ("fixed", "uniform", "lognormal", "zero"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        if self.kind == "zero":
+            return 0.0
+        if self.kind == "fixed":
+            return self.args[0]
+        if self.kind == "uniform":
+            return self.rng.uniform(self.args[0], self.args[1])
+        median, sigma = self.args
+        return self.rng.lognormvariate(0, sigma) * median
+
+    async def wait(self) -> None:
+        delay = self.sample()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def fake_transcription(duration: float) -> Transcript:
+    """Evenly spread the canned script over `duration` seconds."""
+    text, words = script_words(duration)
+    return Transcript(transcription=text, words=WordTimings.from_rows(words))
+
+
+@contextmanager
+def install_fakes(
+    asr_latency: str, llm_latency: str, seed: int = 0, llm_word_latency: float = 0.0
+):
+    """Swap the upstream-calling service methods for local fakes.
+
+    `llm_word_latency` adds that many seconds per word of the text a
+    pronunciation call generates over, as decoding time grows with the output.
+    """
+    import librosa
+
+    rng = random.Random(seed)
+    asr = LatencyModel(asr_latency, rng)
+    llm = LatencyModel(llm_latency, rng)
+
+    async def generate(text: str) -> None:
+        await llm.wait()
+        if llm_word_latency:
+            await asyncio.sleep(llm_word_latency * len(text.split()))
+
+    @log_execution_time
+    async def transcribe(file_path: str, audio=None, segments=None) -> Transcript:
+        # Local work before the upload (re-encoding) still runs for real.
+        chunks = AudioProcessor.plan_long_audio(audio, segments or [])
+        if chunks:
+            from utils.transcode import encode_for_upload
+
+            async def transcribe_chunk(chunk):
+                piece = audio.slice(chunk.start - audio.offset, chunk.end - audio.offset)
+                await asyncio.to_thread(encode_for_upload, piece)
+                await asr.wait()
+
+            await asyncio.gather(*(transcribe_chunk(c) for c in chunks))
+        else:
+            AudioProcessor.prepare_upload(file_path, audio)
+            await asr.wait()
+        return fake_transcription(librosa.get_duration(path=file_path))
+
+    @log_execution_time
+    async def predict_intended_word(actual_text: str, actual_ipa: str) -> str:
+        await generate(actual_text)
+        return actual_text
+
+    def phoneme_errors(text: str) -> List[PhonemeErrorDetail]:
+        """One error per 'rarely' in `text`."""
+        count = sum(normalize(word) == "rarely" for word in text.split())
+        return [
+            PhonemeErrorDetail(
+                transcribedWord="rarely",
+                expectedWord="really",
+                expectedPronunciation="/ˈrɪli/",
+                actualPronunciation="/ˈrɛrli/",
+                errorType="substitution",
+                errorStartIndexWord=1,
+                errorEndIndexWord=2,
+                errorStartIndexTranscription=None,
+                errorEndIndexTranscription=None,
+                substituted="ɛr",
+                errorDescription="The /ɪ/ sound was substituted with /ɛr/.",
+                improvementAdvice="Relax the tongue and raise it slightly.",
+            )
+            for _ in range(count)
+        ]
+
+    @log_execution_time
+    async def compare_phonemes(
+        actual_word: str, expected_word: str, actual_ipa: str, expected_ipa: str
+    ) -> List[PhonemeErrorDetail]:
+        await generate(actual_word)
+        return phoneme_errors(actual_word)
+
+    @log_execution_time
+    async def analyze_pronunciation(actual_text: str, actual_ipa: str) -> FusedPronunciationResponse:
+        await generate(actual_text)
+        return FusedPronunciationResponse(
+            expectedText=actual_text, phonemeErrorDetails=phoneme_errors(actual_text)
+        )
+
+    score = Grading(
+        overall=6.0,
+        fluencyCoherence=6.0,
+        lexicalResource=6.0,
+        grammaticalRangeAccuracy=5.5,
+        pronunciation=6.0,
+    )
+    advices = [
+        "Work on the /ɪ/ sound in 'really'.",
+        "Stress the first syllable in 'library'.",
+        "Let your voice fall at the end of statements.",
+    ]
+
+    @log_execution_time
+    async def grading(digest: str) -> Grading:
+        await llm.wait()
+        return score
+
+    @log_execution_time
+    async def summarize(digest: str) -> List[str]:
+        await llm.wait()
+        return advices
+
+    @log_execution_time
+    async def grade_and_advise(digest: str) -> Feedback:
+        await llm.wait()
+        return Feedback(score=score, advice=advices)
+
+    @log_execution_time
+    async def get_gpt_analysis(text, actual_intonation, rule_analysis) -> dict:
+        await llm.wait()
+        return {
+            "expectedIntonationType": rule_analysis.expected_type,
+            "errorDescription": "The intonation is unclear.",
+            "improvementAdvice": "Lower your pitch on the final word.",
+            "errorStartIndex": rule_analysis.error_start,
+            "errorEndIndex": rule_analysis.error_end,
+        }
+
+    patches = [
+        (AudioProcessor, "transcribe", transcribe),
+        (PronunciationEvaluationService, "predict_intended_word", predict_intended_word),
+        (PronunciationEvaluationService, "compare_phonemes", compare_phonemes),
+        (PronunciationEvaluationService, "analyze_pronunciation", analyze_pronunciation),
+        (IELTSGradingService, "grading", grading),
+        (AdviceSummarizerService, "summarize", summarize),
+        (FeedbackService, "grade_and_advise", grade_and_advise),
+        (InnotationEvaluationService, "get_gpt_analysis", get_gpt_analysis),
+    ]
+    originals = [(owner, name, owner.__dict__[name]) for owner, name, _ in patches]
+    try:
+        for owner, name, fake in patches:
+            setattr(owner, name, staticmethod(fake))
+        yield
+    finally:
+        for owner, name, original in originals:
+            setattr(owner, name, original)
@@ -0,0 +1,200 @@
+"""Fused vs. unfused LLM calls: latency saved and how closely the outputs agree.
+
+Runs the pronunciation and feedback (grading + advice) stages on each
+transcript in both modes. Unfused is predict_intended_word -> compare_phonemes,
+then grading and summarize in parallel; fused (LLM_FUSION) is one call for each
+half. Agreement is measured against the unfused output:
+
+- expected IPA: token similarity of the expected phonetic transcription
+- error words: Jaccard overlap of the mispronounced words
+- bands: mean absolute difference over the five band scores
+- advice: lexical similarity of the three advices
+
+With two or more iterations the same numbers between consecutive unfused runs
+are reported as the noise floor (grading and advice sample at temperature 0.5).
+
+    python -m benchmarks.fusion --iterations 3
+    python -m benchmarks.fusion --cassette resources/cassettes/fusion.cassette
+    python -m benchmarks.fusion --fake-latency lognormal:1.2,0.3
+"""
+
+import argparse
+import asyncio
+import contextlib
+import difflib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.stats import summarize
+
+TRANSCRIPTS = [
+    "I rarely like reading English. I find it youthful.",
+    "She bought a three pair of shoes for her sister last weak.",
+    "In my free time I usually go to the library and read about the history of my city.",
+]
+BANDS = ("overall", "fluencyCoherence", "lexicalResource", "grammaticalRangeAccuracy", "pronunciation")
+
+
+async def run_once(text: str, fused: bool) -> Dict:
+    from config import settings
+    from services.advice import AdviceSummarizerService
+    from services.assessment import AssessmentBuilder
+    from services.digest import AssessmentDigest
+    from services.feedback import FeedbackService
+    from services.grading import IELTSGradingService
+    from services.phoneme import PronunciationEvaluationService
+
+    settings.LLM_FUSION = fused
+    start = time.perf_counter()
+    pronunciation = await PronunciationEvaluationService.pronunciation_assessment(text)
+    middle = time.perf_counter()
+    result = AssessmentBuilder()
+    result.set_transcription(text)
+    result.set_pronunciation(pronunciation)
+    digest = AssessmentDigest.from_message(result.message)
+    if fused:
+        feedback = await FeedbackService.grade_and_advise(
+            digest.render(settings.DIGEST_GRADING_MAX_TOKENS)
+        )
+        score, advice = feedback.score, feedback.advice
+    else:
+        score, advice = await asyncio.gather(
+            IELTSGradingService.grading(digest.render(settings.DIGEST_GRADING_MAX_TOKENS)),
+            AdviceSummarizerService.summarize(digest.render(settings.DIGEST_ADVICE_MAX_TOKENS)),
+        )
+    end = time.perf_counter()
+    return {
+        "pronunciation_s": middle - start,
+        "feedback_s": end - middle,
+        "total_s": end - start,
+        "expected_ipa": pronunciation.expectedPhoneticTranscription,
+        "error_words": sorted(
+            {error.transcribedWord.lower() for error in pronunciation.phonemeErrorDetails}
+        ),
+        "score": score.model_dump(),
+        "advice": list(advice),
+    }
+
+
+def similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, a.lower().split(), b.lower().split()).ratio()
+
+
+def agreement(reference: Dict, candidate: Dict) -> Dict[str, float]:
+    ref_words, cand_words = set(reference["error_words"]), set(candidate["error_words"])
+    union = ref_words | cand_words
+    return {
+        "expected_ipa": similarity(reference["expected_ipa"], candidate["expected_ipa"]),
+        "error_words": len(ref_words & cand_words) / len(union) if union else 1.0,
+        "band_mae": sum(abs(reference["score"][b] - candidate["score"][b]) for b in BANDS)
+        / len(BANDS),
+        "advice": similarity(" ".join(reference["advice"]), " ".join(candidate["advice"])),
+    }
+
+
+def mean_agreement(pairs: List[Dict[str, float]]) -> Optional[Dict[str, float]]:
+    if not pairs:
+        return None
+    return {key: round(sum(p[key] for p in pairs) / len(pairs), 3) for key in pairs[0]}
+
+
+async def compare(transcripts: List[str], iterations: int) -> Dict:
+    report = {"transcripts": [], "latency_s": {}, "agreement": {}}
+    runs: Dict[str, Dict[str, List[float]]] = {"unfused": {}, "fused": {}}
+    vs_unfused, noise_floor = [], []
+    for text in transcripts:
+        results = {"unfused": [], "fused": []}
+        for _ in range(iterations):
+            # Alternate so upstream drift hits both modes alike.
+            for mode in ("unfused", "fused"):
+                result = await run_once(text, fused=mode == "fused")
+                results[mode].append(result)
+                for key in ("pronunciation_s", "feedback_s", "total_s"):
+                    runs[mode].setdefault(key, []).append(result[key])
+        pairs = [agreement(u, f) for u, f in zip(results["unfused"], results["fused"])]
+        floor = [agreement(a, b) for a, b in zip(results["unfused"], results["unfused"][1:])]
+        vs_unfused.extend(pairs)
+        noise_floor.extend(floor)
+        report["transcripts"].append(
+            {
+                "text": text,
+                "total_s": {
+                    mode: round(sum(r["total_s"] for r in results[mode]) / iterations, 3)
+                    for mode in results
+                },
+                "agreement": mean_agreement(pairs),
+                "noise_floor": mean_agreement(floor),
+            }
+        )
+    report["latency_s"] = {
+        mode: {key: summarize(values) for key, values in stages.items()}
+        for mode, stages in runs.items()
+    }
+    report["agreement"] = {
+        "fused_vs_unfused": mean_agreement(vs_unfused),
+        "unfused_vs_unfused": mean_agreement(noise_floor),
+    }
+    return report
+
+
+def print_report(report: Dict) -> None:
+    latency = report["latency_s"]
+    print(f"{'stage':<18}{'unfused p50':>12}{'fused p50':>12}{'saved':>10}")
+    for key in ("pronunciation_s", "feedback_s", "total_s"):
+        before, after = latency["unfused"][key]["p50"], latency["fused"][key]["p50"]
+        saved = (before - after) / before * 100 if before else 0.0
+        print(f"{key[:-2]:<18}{before:>11.2f}s{after:>11.2f}s{saved:>9.1f}%")
+    print()
+    print(f"{'agreement':<18}{'fused':>12}{'noise floor':>12}")
+    fused = report["agreement"]["fused_vs_unfused"] or {}
+    floor = report["agreement"]["unfused_vs_unfused"] or {}
+    for key in ("expected_ipa", "error_words", "band_mae", "advice"):
+        floor_text = f"{floor[key]:>12.3f}" if key in floor else f"{'-':>12}"
+        print(f"{key:<18}{fused.get(key, 0.0):>12.3f}{floor_text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument(
+        "--transcripts", help="File with one transcript per line (default: built-in samples)"
+    )
+    parser.add_argument("--cassette", help="Replay upstream calls from this cassette")
+    parser.add_argument("--cassette-latency", default="original")
+    parser.add_argument(
+        "--fake-latency",
+        help="Use the benchmark fakes with this LLM latency (checks the plumbing only)",
+    )
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.cassette:
+        # Must be set before config.client is first imported.
+        os.environ["CASSETTE_MODE"] = "replay"
+        os.environ["CASSETTE_PATH"] = args.cassette
+        os.environ["CASSETTE_LATENCY"] = args.cassette_latency
+    transcripts = TRANSCRIPTS
+    if args.transcripts:
+        with open(args.transcripts, encoding="utf-8") as f:
+            transcripts = [line.strip() for line in f if line.strip()]
+
+    upstreams = contextlib.nullcontext()
+    if args.fake_latency:
+        from benchmarks.fakes import install_fakes
+
+        upstreams = install_fakes("zero", args.fake_latency)
+    with upstreams:
+        report = asyncio.run(compare(transcripts, args.iterations))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
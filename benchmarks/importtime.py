@@ -0,0 +1,96 @@
+"""Import-time budget check built on `python -X importtime`.
+
+Each target module is imported in a fresh interpreter; the check fails if it
+takes longer than its budget or drags in a module it must not touch.
+
+    python -m benchmarks.importtime            # check all budgets
+    python -m benchmarks.importtime --report services.speaking --top 25
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# The DSP stack and SDKs load on first use or in WarmupService, never at import.
+HEAVY_MODULES = [
+    "librosa",
+    "numba",
+    "scipy",
+    "sklearn",
+    "instructor",
+    "openai",
+    "groq",
+    "fireworks",
+    "nltk",
+    "eng_to_ipa",
+    "pydub",
+    "matplotlib",
+]
+
+# module -> (budget in ms, forbidden top-level packages)
+BUDGETS: Dict[str, Tuple[float, List[str]]] = {
+    "main": (800.0, HEAVY_MODULES + ["numpy"]),
+    "services.speaking": (600.0, HEAVY_MODULES),
+    "client": (600.0, HEAVY_MODULES + ["numpy", "services"]),
+    "benchmarks.loadgen": (600.0, HEAVY_MODULES + ["numpy", "services"]),
+}
+
+
+def import_profile(module: str) -> List[Tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) rows for a cold import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def check(module: str, budget_ms: float, forbidden: List[str]) -> List[str]:
+    rows = import_profile(module)
+    total_ms = next(cum for name, _, cum in rows if name == module) / 1000
+    loaded = {name.split(".")[0] for name, _, _ in rows}
+    problems = [f"imports {pkg}" for pkg in forbidden if pkg in loaded]
+    if total_ms > budget_ms:
+        problems.append(f"took {total_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+    status = "FAIL" if problems else "ok"
+    print(f"{status:<5}{module:<24}{total_ms:>8.0f} ms  {'; '.join(problems)}")
+    return problems
+
+
+def report(module: str, top: int) -> None:
+    rows = sorted(import_profile(module), key=lambda r: r[2], reverse=True)
+    print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+    for name, self_us, cumulative_us in rows[:top]:
+        print(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--report", metavar="MODULE", help="Print the slowest imports")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.report:
+        report(args.report, args.top)
+        return
+
+    failed = False
+    for module, (budget_ms, forbidden) in BUDGETS.items():
+        failed |= bool(check(module, budget_ms, forbidden))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
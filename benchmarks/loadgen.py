@@ -0,0 +1,228 @@
+"""Concurrent gRPC load generator for `AssessSpeaking`.
+
+Closed loop keeps N requests in flight; open loop fires requests at a target
+rate regardless of how fast the server answers, which is what exposes the
+saturation point.
+
+    python -m benchmarks.loadgen closed --concurrency 50 --duration 120
+    python -m benchmarks.loadgen open --qps 4 --duration 120 --deadline 30
+    python -m benchmarks.loadgen closed --concurrency 40 --tenant school-a --priority batch
+"""
+
+import argparse
+import asyncio
+import collections
+import glob
+import json
+import random
+import time
+from typing import Dict, List, Tuple
+
+import grpc
+
+from benchmarks.stats import summarize
+from config import settings
+from grpc_service.speaking_pb2 import SpeakingAssessmentRequest
+from grpc_service.speaking_pb2_grpc import SpeakingAssessmentServiceStub
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.latencies_by_file: Dict[str, List[float]] = collections.defaultdict(list)
+        self.codes: collections.Counter = collections.Counter()
+        self.in_flight = 0
+        self.sent = 0
+        self.completed = 0
+
+    def record(self, name: str, code: str, latency: float) -> None:
+        self.completed += 1
+        self.codes[code] += 1
+        if code == grpc.StatusCode.OK.name:
+            self.latencies.append(latency)
+            self.latencies_by_file[name].append(latency)
+
+
+def load_audio_mix(patterns: List[str]) -> List[Tuple[str, bytes, float]]:
+    """Each entry is `glob[:weight]`; returns (name, payload, weight)."""
+    mix = []
+    for entry in patterns:
+        pattern, _, weight = entry.partition(":")
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "rb") as f:
+                payload = f.read()
+            if payload:
+                mix.append((path, payload, float(weight or 1)))
+    if not mix:
+        raise SystemExit(f"No audio files matched {patterns}")
+    return mix
+
+
+async def send_one(stub, stats: LoadStats, name: str, payload: bytes, deadline, metadata=()):
+    stats.sent += 1
+    stats.in_flight += 1
+    start = time.perf_counter()
+    try:
+        await stub.AssessSpeaking(
+            SpeakingAssessmentRequest(audio=payload), timeout=deadline, metadata=metadata
+        )
+        code = grpc.StatusCode.OK.name
+    except grpc.aio.AioRpcError as e:
+        code = e.code().name
+    except Exception:
+        # A client-side failure is one failed request, not the end of the run.
+        code = "CLIENT_ERROR"
+    finally:
+        stats.in_flight -= 1
+    stats.record(name, code, time.perf_counter() - start)
+
+
+async def closed_loop(stub, stats, pick, args, stop_at):
+    async def worker():
+        while time.monotonic() < stop_at:
+            name, payload = pick()
+            await send_one(stub, stats, name, payload, args.deadline, args.metadata)
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+
+async def open_loop(stub, stats, pick, args, stop_at):
+    rng = random.Random(args.seed)
+    tasks = set()
+    next_send = time.monotonic()
+    while next_send < stop_at:
+        await asyncio.sleep(max(0.0, next_send - time.monotonic()))
+        if args.max_in_flight and stats.in_flight >= args.max_in_flight:
+            stats.codes["CLIENT_SHED"] += 1
+        else:
+            name, payload = pick()
+            task = asyncio.create_task(
+                send_one(stub, stats, name, payload, args.deadline, args.metadata)
+            )
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        gap = rng.expovariate(args.qps) if args.poisson else 1 / args.qps
+        next_send += gap
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def report_progress(stats: LoadStats, interval: float, started: float):
+    last_completed, last_time = 0, started
+    while True:
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        rate = (stats.completed - last_completed) / (now - last_time)
+        recent = stats.latencies[-50:]
+        p50 = summarize(recent)["p50"] if recent else 0.0
+        errors = stats.completed - stats.codes.get("OK", 0)
+        print(
+            f"[{now - started:6.1f}s] sent={stats.sent} done={stats.completed} "
+            f"in_flight={stats.in_flight} rate={rate:.2f}/s p50(last50)={p50:.2f}s "
+            f"errors={errors}",
+            flush=True,
+        )
+        last_completed, last_time = stats.completed, now
+
+
+async def run(args) -> Dict:
+    mix = load_audio_mix(args.audio)
+    rng = random.Random(args.seed)
+    names = [m[0] for m in mix]
+    payloads = {m[0]: m[1] for m in mix}
+    weights = [m[2] for m in mix]
+
+    def pick():
+        name = rng.choices(names, weights)[0]
+        return name, payloads[name]
+
+    stats = LoadStats()
+    options = [
+        ("grpc.max_send_message_length", 64 * 1024 * 1024),
+        ("grpc.max_receive_message_length", 64 * 1024 * 1024),
+    ]
+    async with grpc.aio.insecure_channel(args.target, options=options) as channel:
+        stub = SpeakingAssessmentServiceStub(channel)
+        started = time.monotonic()
+        stop_at = started + args.duration
+        reporter = asyncio.create_task(
+            report_progress(stats, args.report_interval, started)
+        )
+        try:
+            if args.mode == "closed":
+                await closed_loop(stub, stats, pick, args, stop_at)
+            else:
+                await open_loop(stub, stats, pick, args, stop_at)
+        finally:
+            reporter.cancel()
+        elapsed = time.monotonic() - started
+
+    return {
+        "mode": args.mode,
+        "target": args.target,
+        "concurrency": args.concurrency if args.mode == "closed" else None,
+        "qps": args.qps if args.mode == "open" else None,
+        "deadline_s": args.deadline,
+        "metadata": dict(args.metadata),
+        "elapsed_s": round(elapsed, 3),
+        "sent": stats.sent,
+        "completed": stats.completed,
+        "throughput_rps": round(stats.codes.get("OK", 0) / elapsed, 3),
+        "status_codes": dict(stats.codes),
+        "latency_s": summarize(stats.latencies),
+        "latency_by_file_s": {
+            name: summarize(values) for name, values in stats.latencies_by_file.items()
+        },
+    }
+
+
+def positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be > 0, got {value}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("mode", choices=["closed", "open"])
+    parser.add_argument(
+        "--target", default=f"{settings.GRPC_HOST}:{settings.GRPC_PORT}"
+    )
+    parser.add_argument(
+        "--audio",
+        nargs="+",
+        default=["resources/audio/*.mp3"],
+        help="Audio globs, optionally weighted as glob:weight",
+    )
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--qps", type=positive_float, default=1.0)
+    parser.add_argument("--poisson", action="store_true", help="Poisson arrivals")
+    parser.add_argument(
+        "--max-in-flight", type=int, default=0, help="Open loop: shed above this"
+    )
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--deadline", type=float, default=None, help="Per-RPC seconds")
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tenant", help="Send as this tenant (x-tenant-id)")
+    parser.add_argument(
+        "--priority", choices=["interactive", "batch"], help="Scheduler lane (x-priority)"
+    )
+    parser.add_argument("--output", help="Write the final report as JSON")
+    args = parser.parse_args()
+    args.metadata = tuple(
+        (key, value)
+        for key, value in (("x-tenant-id", args.tenant), ("x-priority", args.priority))
+        if value
+    )
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""End-to-end benchmark for `SpeakingEvaluationService.evaluate`.
+
+Runs the full pipeline over `resources/audio/*` plus synthetic long recordings,
+with the upstream ASR/LLM calls replaced by local fakes (or replayed from a
+cassette recorded with CASSETTE_MODE=record), and writes per-stage
+and end-to-end latency percentiles, CPU time and memory as JSON. Each input
+reports the peak of traced allocations during one extra, untimed evaluation
+(`peak_alloc_mb`); the summary reports the process's RSS high-water mark.
+
+    python -m benchmarks.pipeline run --iterations 5
+    python -m benchmarks.pipeline compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import glob
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+from benchmarks.stats import summarize
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+async def peak_alloc_mb(path: str) -> float:
+    """Peak traced allocations of one evaluation, apart from the timed runs."""
+    from services.speaking import SpeakingEvaluationService
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        await SpeakingEvaluationService.evaluate(path)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def bench_input(path: str, iterations: int, warmup: int) -> Dict:
+    import librosa
+    from services.speaking import SpeakingEvaluationService
+    from utils.logging import collect_stage_timings
+
+    for _ in range(warmup):
+        await SpeakingEvaluationService.evaluate(path)
+
+    end_to_end: List[float] = []
+    cpu_times: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    for _ in range(iterations):
+        with collect_stage_timings() as timings:
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            await SpeakingEvaluationService.evaluate(path)
+            end_to_end.append(time.perf_counter() - wall_start)
+            cpu_times.append(time.process_time() - cpu_start)
+        for stage, values in timings.items():
+            stages.setdefault(stage, []).extend(values)
+
+    return {
+        "name": os.path.basename(path),
+        "duration_s": round(librosa.get_duration(path=path), 3),
+        "iterations": iterations,
+        "end_to_end_s": summarize(end_to_end),
+        "cpu_time_s": summarize(cpu_times),
+        "stages_s": {stage: summarize(values) for stage, values in sorted(stages.items())},
+        "peak_alloc_mb": round(await peak_alloc_mb(path), 1),
+        "_raw": {"end_to_end": end_to_end, "cpu": cpu_times, "stages": stages},
+    }
+
+
+async def run(args) -> Dict:
+    if args.cassette:
+        # Must be set before config.client is first imported.
+        os.environ["CASSETTE_MODE"] = "replay"
+        os.environ["CASSETTE_PATH"] = args.cassette
+        os.environ["CASSETTE_LATENCY"] = args.cassette_latency
+    from benchmarks.fakes import install_fakes
+    from utils.synthetic import synthesize_speech_like
+
+    paths = sorted(glob.glob(args.audio))
+    paths = [p for p in paths if os.path.getsize(p) > 1024]  # skip empty stubs
+    tmpdir = tempfile.mkdtemp(prefix="linglooma-bench-")
+    for seconds in args.synthetic:
+        paths.append(
+            synthesize_speech_like(
+                os.path.join(tmpdir, f"synthetic-{int(seconds)}s.wav"), seconds
+            )
+        )
+
+    inputs = []
+    upstreams = (
+        contextlib.nullcontext()
+        if args.cassette
+        else install_fakes(args.asr_latency, args.llm_latency, seed=args.seed)
+    )
+    with upstreams:
+        for path in paths:
+            logging.info(f"Benchmarking {path}")
+            inputs.append(await bench_input(path, args.iterations, args.warmup))
+
+    all_e2e, all_cpu, all_stages = [], [], {}
+    for item in inputs:
+        raw = item.pop("_raw")
+        all_e2e.extend(raw["end_to_end"])
+        all_cpu.extend(raw["cpu"])
+        for stage, values in raw["stages"].items():
+            all_stages.setdefault(stage, []).extend(values)
+
+    return {
+        "meta": {
+            "commit": current_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {
+                "iterations": args.iterations,
+                "warmup": args.warmup,
+                "asr_latency": args.asr_latency,
+                "llm_latency": args.llm_latency,
+                "seed": args.seed,
+                "cassette": args.cassette,
+                "cassette_latency": args.cassette_latency if args.cassette else None,
+                "synthetic": args.synthetic,
+            },
+        },
+        "inputs": inputs,
+        "summary": {
+            "end_to_end_s": summarize(all_e2e),
+            "cpu_time_s": summarize(all_cpu),
+            "stages_s": {s: summarize(v) for s, v in sorted(all_stages.items())},
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+        },
+    }
+
+
+def compare(baseline_path: str, candidate_path: str, threshold: float) -> int:
+    """Print per-stage p50/p95 deltas; return 1 if any p95 regressed past threshold."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["summary"]
+    with open(candidate_path) as f:
+        candidate = json.load(f)["summary"]
+
+    rows = [("end_to_end", baseline["end_to_end_s"], candidate["end_to_end_s"])]
+    rows.append(("cpu_time", baseline["cpu_time_s"], candidate["cpu_time_s"]))
+    for stage in sorted(set(baseline["stages_s"]) | set(candidate["stages_s"])):
+        rows.append(
+            (stage, baseline["stages_s"].get(stage), candidate["stages_s"].get(stage))
+        )
+
+    regressed = False
+    print(f"{'stage':<28}{'p50 old':>10}{'p50 new':>10}{'p95 old':>10}{'p95 new':>10}{'Δp95':>9}")
+    for name, old, new in rows:
+        if old is None or new is None:
+            print(f"{name:<28}{'(only in one run)':>49}")
+            continue
+        delta = (new["p95"] - old["p95"]) / old["p95"] * 100 if old["p95"] else 0.0
+        flag = " !" if delta > threshold else ""
+        regressed |= bool(flag)
+        print(
+            f"{name:<28}{old['p50']:>10.4f}{new['p50']:>10.4f}"
+            f"{old['p95']:>10.4f}{new['p95']:>10.4f}{delta:>8.1f}%{flag}"
+        )
+    print(
+        f"{'peak_rss_mb':<28}{baseline['peak_rss_mb']:>10.1f}{candidate['peak_rss_mb']:>10.1f}"
+    )
+    return 1 if regressed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Run the benchmark and write JSON results")
+    run_parser.add_argument("--audio", default="resources/audio/*")
+    run_parser.add_argument(
+        "--synthetic",
+        type=lambda s: [float(x) for x in s.split(",") if x],
+        default=[60.0, 180.0],
+        help="Comma-separated durations (s) of synthetic recordings",
+    )
+    run_parser.add_argument("--iterations", type=int, default=5)
+    run_parser.add_argument("--warmup", type=int, default=1)
+    run_parser.add_argument("--asr-latency", default="lognormal:1.5,0.3")
+    run_parser.add_argument("--llm-latency", default="lognormal:0.8,0.4")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument(
+        "--cassette", help="Replay recorded upstream calls instead of using fakes"
+    )
+    run_parser.add_argument(
+        "--cassette-latency", default="original", help="original | zero | <scale>"
+    )
+    run_parser.add_argument("--output", help="Defaults to benchmarks/results/<commit>.json")
+
+    compare_parser = sub.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=10.0, help="p95 regression threshold in %%"
+    )
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        sys.exit(compare(args.baseline, args.candidate, args.threshold))
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    result = asyncio.run(run(args))
+    output = args.output or os.path.join(RESULTS_DIR, f"{result['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    summary = result["summary"]
+    print(json.dumps({"end_to_end_s": summary["end_to_end_s"], "peak_rss_mb": summary["peak_rss_mb"]}, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Memory ceiling check for the word-stress pitch tracker.
+
+Runs `extract_pitch` on synthetic signals of increasing length under
+tracemalloc and reports the peak allocated on top of the input signal. The
+check fails if a peak exceeds the ceiling, or if block-streamed output differs
+from the whole-signal output on the shortest signal.
+
+    python -m benchmarks.pitch_memory                       # check the ceiling
+    python -m benchmarks.pitch_memory --block-frames 0      # whole-signal mode, for comparison
+"""
+
+import argparse
+import logging
+import sys
+import tracemalloc
+
+import numpy as np
+
+from config import settings
+from services.wordstress import extract_pitch
+from utils.audio import DecodedAudio
+
+SAMPLE_RATE = 44100
+
+
+def signal(duration: float) -> DecodedAudio:
+    """A gliding tone with pauses, long enough to exercise every block."""
+    t = np.arange(int(duration * SAMPLE_RATE), dtype=np.float32) / SAMPLE_RATE
+    f0 = 160 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    voiced = (np.sin(2 * np.pi * 0.5 * t) > -0.5).astype(np.float32)
+    samples = 0.3 * voiced * np.sin(2 * np.pi * np.cumsum(f0) / SAMPLE_RATE)
+    return DecodedAudio(samples=samples.astype(np.float32), sample_rate=SAMPLE_RATE)
+
+
+def peak_mb(audio: DecodedAudio, block_frames: int):
+    settings.PITCH_BLOCK_FRAMES = block_frames
+    tracemalloc.start()
+    try:
+        _, pitch_values = extract_pitch("", audio)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20, pitch_values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=[30, 120, 600])
+    parser.add_argument("--block-frames", type=int, default=settings.PITCH_BLOCK_FRAMES)
+    parser.add_argument(
+        "--ceiling-mb", type=float, default=64.0, help="Allowed peak beyond the input signal"
+    )
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    # Warm librosa's caches and lazy imports so they do not count as the first peak.
+    extract_pitch("", signal(1.0))
+
+    problems = []
+    print(f"{'signal':>8}{'input MB':>10}{'peak MB':>10}{'frames':>9}")
+    for duration in sorted(args.durations):
+        audio = signal(duration)
+        peak, pitch_values = peak_mb(audio, args.block_frames)
+        print(
+            f"{duration:>7.0f}s{audio.samples.nbytes / 2**20:>10.1f}{peak:>10.1f}"
+            f"{len(pitch_values):>9}"
+        )
+        if peak > args.ceiling_mb:
+            problems.append(f"{duration:.0f}s signal peaked at {peak:.1f} MB")
+
+    if args.block_frames:
+        audio = signal(min(args.durations))
+        _, streamed = peak_mb(audio, args.block_frames)
+        _, whole = peak_mb(audio, 0)
+        if not np.array_equal(streamed, whole):
+            problems.append("streamed pitch differs from whole-signal pitch")
+
+    for problem in problems:
+        print(f"FAIL  {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
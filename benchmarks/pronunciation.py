@@ -0,0 +1,86 @@
+"""Pronunciation stage latency by answer length: one call vs. sentence groups.
+
+Runs `pronunciation_assessment` on canned answers of increasing length with
+the benchmark fakes, whose latency grows with the words a call generates
+over, once for the whole transcript (PRONUNCIATION_GROUP_WORDS=0) and once
+split into sentence groups. It also checks that every merged error's
+transcript offsets point at the word it names.
+
+    python -m benchmarks.pronunciation --durations 15 60 120 240
+    python -m benchmarks.pronunciation --llm-latency lognormal:0.8,0.3 --word-latency 0.02
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from typing import List
+
+from benchmarks.fakes import install_fakes
+from config import settings
+from services.phoneme import PronunciationAnalysisResponse, PronunciationEvaluationService
+from utils.synthetic import script_words
+from utils.transcript import TranscriptIndex, normalize
+
+
+async def timed(text: str, group_words: int):
+    settings.PRONUNCIATION_GROUP_WORDS = group_words
+    start = time.perf_counter()
+    result = await PronunciationEvaluationService.pronunciation_assessment(text)
+    return time.perf_counter() - start, result
+
+
+def offset_problems(text: str, result: PronunciationAnalysisResponse) -> List[str]:
+    problems = []
+    for error in result.phonemeErrorDetails:
+        start, end = error.errorStartIndexTranscription, error.errorEndIndexTranscription
+        if normalize(text[start : end + 1]) != normalize(error.transcribedWord):
+            problems.append(f"{error.transcribedWord!r} mapped to {text[start:end + 1]!r}")
+    starts = [error.errorStartIndexTranscription for error in result.phonemeErrorDetails]
+    if len(set(starts)) != len(starts):
+        problems.append("two errors mapped to the same word")
+    return problems
+
+
+async def run(durations: List[float], group_words: int) -> bool:
+    failed = False
+    print(f"{'answer':>8}{'words':>7}{'groups':>8}{'one call':>10}{'grouped':>10}{'errors':>8}")
+    for duration in durations:
+        text, _ = script_words(duration)
+        groups = TranscriptIndex.build(text).sentence_groups(group_words)
+        whole_s, whole = await timed(text, 0)
+        grouped_s, grouped = await timed(text, group_words)
+        problems = offset_problems(text, grouped)
+        if len(grouped.phonemeErrorDetails) != len(whole.phonemeErrorDetails):
+            problems.append(
+                f"{len(grouped.phonemeErrorDetails)} errors vs. {len(whole.phonemeErrorDetails)}"
+            )
+        failed |= bool(problems)
+        print(
+            f"{duration:>7.0f}s{len(text.split()):>7}{len(groups):>8}"
+            f"{whole_s:>9.2f}s{grouped_s:>9.2f}s{len(grouped.phonemeErrorDetails):>8}"
+        )
+        for problem in problems:
+            print(f"FAIL  {problem}")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=[15, 60, 120, 240])
+    parser.add_argument("--group-words", type=int, default=settings.PRONUNCIATION_GROUP_WORDS)
+    parser.add_argument("--llm-latency", default="fixed:0.5", help="Per-call LLM latency")
+    parser.add_argument(
+        "--word-latency", type=float, default=0.015, help="Extra seconds per word generated over"
+    )
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    with install_fakes("zero", args.llm_latency, llm_word_latency=args.word_latency):
+        failed = asyncio.run(run(args.durations, args.group_words))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
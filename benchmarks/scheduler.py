@@ -0,0 +1,88 @@
+"""Queue wait under a bulk upload: one FIFO queue vs. the fair scheduler.
+
+Simulates one server process in-process: a teacher drops a batch of files at
+once, a second teacher a small batch shortly after, and students send live
+practice requests at a steady rate. Evaluations are sleeps drawn from a
+lognormal around `--service`. FIFO is the same scheduler with every request
+in one tenant and lane, which is what grpc.aio's shared queue amounts to.
+
+    python -m benchmarks.scheduler
+    python -m benchmarks.scheduler --bulk 500 --students 5 --student-qps 0.5 --time-scale 0.01
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+from typing import Dict, List
+
+from benchmarks.stats import summarize
+from utils.scheduler import BATCH, INTERACTIVE, FairScheduler
+
+
+async def simulate(args, fair: bool) -> Dict[str, List[float]]:
+    rng = random.Random(args.seed)
+    scheduler = FairScheduler(
+        capacity=args.capacity,
+        tenant_cap=args.tenant_cap if fair else args.capacity,
+        interactive_reserved=args.reserved if fair else 0,
+        max_queued_per_tenant=10**6,
+        weights={},
+    )
+    waits: Dict[str, List[float]] = {}
+    scale = args.time_scale
+
+    async def request(group: str, tenant: str, lane: str, delay: float):
+        await asyncio.sleep(delay * scale)
+        if not fair:
+            tenant, lane = "all", INTERACTIVE
+        service = rng.lognormvariate(0, 0.4) * args.service
+        async with scheduler.slot(tenant, lane, timeout=args.deadline) as wait:
+            await asyncio.sleep(service * scale)
+        waits.setdefault(group, []).append(wait / scale)
+
+    tasks = [request("bulk teacher", "teacher-a", BATCH, 0.0) for _ in range(args.bulk)]
+    tasks += [request("small teacher", "teacher-b", BATCH, 1.0) for _ in range(args.small_bulk)]
+    for student in range(args.students):
+        t = rng.uniform(0, 1 / args.student_qps)
+        while t < args.duration:
+            tasks.append(request("students", f"student-{student}", INTERACTIVE, t))
+            t += rng.expovariate(args.student_qps)
+    await asyncio.gather(*tasks)
+    return waits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--capacity", type=int, default=8)
+    parser.add_argument("--tenant-cap", type=int, default=4)
+    parser.add_argument("--reserved", type=int, default=2)
+    parser.add_argument("--bulk", type=int, default=500, help="Files in the big upload")
+    parser.add_argument("--small-bulk", type=int, default=20, help="Files in the small upload")
+    parser.add_argument("--students", type=int, default=5)
+    parser.add_argument("--student-qps", type=float, default=0.1, help="Requests/s per student")
+    parser.add_argument("--duration", type=float, default=300, help="Simulated seconds of practice")
+    parser.add_argument("--service", type=float, default=8.0, help="Median evaluation seconds")
+    parser.add_argument("--deadline", type=float, default=None)
+    parser.add_argument(
+        "--time-scale", type=float, default=0.002, help="Wall seconds per simulated second"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = {mode: asyncio.run(simulate(args, fair=mode == "fair")) for mode in ("fifo", "fair")}
+    print(f"{'queue wait (s)':<16}{'mode':<6}{'count':>7}{'p50':>9}{'p95':>9}{'max':>9}")
+    for group in ("students", "small teacher", "bulk teacher"):
+        for mode, waits in results.items():
+            stats = summarize(waits.get(group, []))
+            print(
+                f"{group:<16}{mode:<6}{stats['count']:>7}{stats['p50']:>9.1f}"
+                f"{stats['p95']:>9.1f}{stats['max']:>9.1f}"
+            )
+    fifo = summarize(results["fifo"].get("students", []))["p95"]
+    fair = summarize(results["fair"].get("students", []))["p95"]
+    sys.exit(0 if fair <= fifo else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Per-response cost of turning stage results into the gRPC response.
+
+Compares the old path (pydantic `model_dump` into nested dicts, pretty JSON
+for the log, `ParseDict`) with `AssessmentBuilder` writing straight into the
+proto. Both include the final `SerializeToString`.
+
+    python -m benchmarks.serialization --iterations 2000 --errors 20
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, Dict, List
+
+from google.protobuf.json_format import ParseDict
+
+from benchmarks.stats import summarize
+from grpc_service.speaking_pb2 import SpeakingAssessment
+from services.assessment import AssessmentBuilder
+from services.grading import Grading
+from services.phoneme import PhonemeErrorDetail, PronunciationAnalysisResponse
+from services.preflight import AudioStats
+from services.wordstress import StressError
+from utils.synthetic import script_words
+
+
+def stage_results(errors: int) -> Dict:
+    """Stage outputs shaped like a real two-minute answer."""
+    text, words = script_words(120)
+    return {
+        "stats": AudioStats(
+            durationSeconds=120.0,
+            speechSeconds=96.4,
+            speechRatio=0.803,
+            speechSegments=41,
+            leadingSilenceSeconds=0.42,
+            trailingSilenceSeconds=0.9,
+            clippingRatio=0.0,
+        ),
+        "text": text,
+        "pronunciation": PronunciationAnalysisResponse(
+            actualPhoneticTranscription=text,
+            expectedPhoneticTranscription=text,
+            phonemeErrorDetails=[
+                PhonemeErrorDetail(
+                    transcribedWord=word,
+                    expectedWord=word,
+                    expectedPronunciation="/ˈrɪli/",
+                    actualPronunciation="/ˈrɛrli/",
+                    errorType="substitution",
+                    errorStartIndexWord=1,
+                    errorEndIndexWord=2,
+                    errorStartIndexTranscription=i * 7,
+                    errorEndIndexTranscription=i * 7 + len(word),
+                    substituted="ɛr",
+                    errorDescription="The /ɪ/ sound was substituted with /ɛr/.",
+                    improvementAdvice="Relax the tongue and raise it slightly.",
+                )
+                for i, (word, _, _) in enumerate(words[:errors])
+            ],
+        ),
+        "stress": [
+            StressError(
+                word=word,
+                syllableBreakdown=["sum", "ma", "ry"],
+                errorType="Stress Misplacement",
+                actualStressedSyllableIndex=1,
+                expectedStressedSyllableIndex=0,
+                errorDescription="Chưa code em ơi, Gọi LLM lâu lắm",
+                improvementAdvice="Chưa code em ơi, Gọi LLM lâu lắm",
+                errorStartIndex=0,
+                errorEndIndex=len(word),
+            )
+            for word, _, _ in words[:errors]
+        ],
+        "intonation": {
+            "clauseText": text,
+            "actualIntonationType": "Falling",
+            "expectedIntonationType": "Falling",
+            "errorDescription": "The intonation is unclear.",
+            "improvementAdvice": "Lower your pitch on the final word.",
+            "errorStartIndex": 0,
+            "errorEndIndex": len(text),
+        },
+        "score": Grading(
+            overall=6.0,
+            fluencyCoherence=6.0,
+            lexicalResource=6.0,
+            grammaticalRangeAccuracy=5.5,
+            pronunciation=6.0,
+        ),
+        "advices": ["Work on /ɪ/.", "Stress 'library' on the first syllable.", "Fall at the end."],
+    }
+
+
+def legacy(results: Dict) -> bytes:
+    evaluation = {"audioStats": results["stats"].model_dump()}
+    evaluation["speechTranscription"] = results["text"]
+    evaluation["pronunciationAssessment"] = results["pronunciation"].model_dump()
+    evaluation["pronunciationAssessment"]["wordStressErrorDetails"] = [
+        error.model_dump() for error in results["stress"]
+    ]
+    evaluation["pronunciationAssessment"]["intonationErrorDetails"] = results["intonation"]
+    evaluation["overallAdvices"] = results["advices"]
+    evaluation["score"] = results["score"].model_dump()
+    json.dumps(evaluation, indent=4, ensure_ascii=False)
+    return ParseDict(evaluation, SpeakingAssessment()).SerializeToString()
+
+
+def builder(results: Dict) -> bytes:
+    result = AssessmentBuilder()
+    result.set_audio_stats(results["stats"])
+    result.set_transcription(results["text"])
+    result.set_pronunciation(results["pronunciation"])
+    result.set_word_stress(results["stress"])
+    result.set_intonation(results["intonation"])
+    result.set_score(results["score"])
+    result.set_advices(results["advices"])
+    return result.message.SerializeToString()
+
+
+def measure(fn: Callable[[Dict], bytes], results: Dict, iterations: int) -> List[float]:
+    fn(results)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(results)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--errors", type=int, default=20, help="Phoneme and stress errors per response")
+    args = parser.parse_args()
+
+    results = stage_results(args.errors)
+    assert SpeakingAssessment.FromString(legacy(results)) == SpeakingAssessment.FromString(
+        builder(results)
+    ), "builder and ParseDict disagree"
+
+    print(f"{'path':<10}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'bytes':>8}")
+    for name, fn in (("legacy", legacy), ("builder", builder)):
+        stats = summarize(measure(fn, results, args.iterations))
+        size = len(fn(results))
+        print(f"{name:<10}{stats['mean']:>10.1f}{stats['p50']:>10.1f}{stats['p99']:>10.1f}{size:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,46 @@
+import sys
 import grpc
 import json
 from google.protobuf.json_format import MessageToDict
-from grpc_service.speaking_pb2 import SpeakingAssessmentRequest
+from config import settings
+from grpc_service.speaking_pb2 import (
+    GetAssessmentRequest,
+    JobState,
+    SpeakingAssessmentRequest,
+)
 from grpc_service.speaking_pb2_grpc import SpeakingAssessmentServiceStub
 
 
-def run():
-    channel = grpc.insecure_channel("localhost:50051")
+def run(audio_path: str = "resources/audio/part2-1.mp3"):
+    channel = grpc.insecure_channel(f"{settings.GRPC_HOST}:{settings.GRPC_PORT}")
     stub = SpeakingAssessmentServiceStub(channel)
-    with open(
-        "/home/xuananle/Documents/Linglooma/Linglooma-core/resources/audio/part2-1.mp3",
-        "rb",
-    ) as f:
+    with open(audio_path, "rb") as f:
         audio_data = f.read()
     request = SpeakingAssessmentRequest(audio=audio_data)
-    response = stub.AssessSpeaking(request)
+    response, call = stub.AssessSpeaking.with_call(request)
+    print_assessment(response)
+    for key, value in call.trailing_metadata():
+        if key.startswith("usage-") or key == "queue-wait-seconds":
+            print(f"{key}: {value}")
+
+
+def submit_and_watch(audio_path: str = "resources/audio/part2-1.mp3"):
+    """Queue the assessment as a job and follow it until it finishes."""
+    channel = grpc.insecure_channel(f"{settings.GRPC_HOST}:{settings.GRPC_PORT}")
+    stub = SpeakingAssessmentServiceStub(channel)
+    with open(audio_path, "rb") as f:
+        audio_data = f.read()
+    job_id = stub.SubmitAssessment(SpeakingAssessmentRequest(audio=audio_data)).jobId
+    print(f"Submitted job {job_id}")
+    for job in stub.WatchAssessment(GetAssessmentRequest(jobId=job_id)):
+        print(f"Job {job_id}: {JobState.Name(job.state)}")
+    if job.error:
+        print(job.error)
+    else:
+        print_assessment(job.result)
+
+
+def print_assessment(response):
     print(
         json.dumps(
             MessageToDict(response, preserving_proto_field_name=True),
@@ -25,4 +51,6 @@ def run():
 
 
 if __name__ == "__main__":
-    run()
+    # python client.py [audio] [--watch]
+    args = [arg for arg in sys.argv[1:] if arg != "--watch"]
+    (submit_and_watch if "--watch" in sys.argv else run)(*args[:1])
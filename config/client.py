@@ -1,14 +1,84 @@
-from groq import AsyncGroq
-from openai import AsyncOpenAI
+"""Registry of upstream SDK clients.
+
+Clients are built on first attribute access (`config.client.groq_client`) so
+that importing the services does not pull in the openai/groq SDKs. Callers
+should go through the module (`from config import client as clients`) rather
+than `from config.client import groq_client`, which would build it eagerly.
+"""
+
+from functools import lru_cache
 from config import settings
 
 openai_api_key = settings.OPENAI_API_KEY
 
-# Trick lord as fuck
-# openai_client = AsyncOpenAI(
-#     base_url="https://api.fireworks.ai/inference/v1", api_key=settings.FIREWORKS_API_KEY
-# )
-openai_client = AsyncOpenAI(
-    base_url="https://api.fireworks.ai/inference/v1", api_key=settings.FIREWORKS_API_KEY
-)
-groq_client = AsyncGroq(api_key=settings.GROQ_API_KEY)
+
+@lru_cache(maxsize=None)
+def get_cassette():
+    from utils.cassette import Cassette
+
+    return Cassette(
+        settings.CASSETTE_PATH, settings.CASSETTE_MODE, settings.CASSETTE_LATENCY
+    )
+
+
+def _with_cassette(client, name: str):
+    if settings.CASSETTE_MODE == "off":
+        return client
+    return get_cassette().wrap(client, name)
+
+
+def _instrumented(client, name: str):
+    """Cassette (if any) first, so replayed calls are accounted too."""
+    from utils import usage
+
+    return usage.instrument(_with_cassette(client, name))
+
+
+@lru_cache(maxsize=None)
+def _build(name: str):
+    if name == "openai_client":
+        from openai import AsyncOpenAI
+
+        # Trick lord as fuck
+        return AsyncOpenAI(
+            base_url="https://api.fireworks.ai/inference/v1",
+            api_key=settings.FIREWORKS_API_KEY,
+        )
+    if name == "openai_api_client":
+        import openai
+
+        from utils import usage
+
+        # api.openai.com itself: whisper-1 transcription and gpt-4o-mini
+        return _instrumented(
+            openai.AsyncOpenAI(api_key=openai_api_key, http_client=usage.http_client(openai)),
+            "openai",
+        )
+    if name == "groq_client":
+        import groq
+
+        from utils import usage
+
+        return _instrumented(
+            groq.AsyncGroq(api_key=settings.GROQ_API_KEY, http_client=usage.http_client(groq)),
+            "groq",
+        )
+    if name == "fireworks_audio_client":
+        from fireworks.client.audio import AudioInference
+
+        # whisper-v3 with forced alignment for the word timings
+        return _instrumented(
+            AudioInference(
+                model="whisper-v3",
+                base_url="https://audio-prod.us-virginia-1.direct.fireworks.ai",
+                api_key=settings.FIREWORKS_API_KEY,
+                vad_model="whisperx-pyannet",
+                alignment_model="tdnn_ffn",
+            ),
+            "fireworks",
+        )
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __getattr__(name):
+    return _build(name)
@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 
@@ -5,6 +6,154 @@ load_dotenv()
 
 GRPC_HOST = os.getenv("GRPC_HOST", "localhost")
 GRPC_PORT = int(os.getenv("GRPC_PORT", 50051))
+# >1 pre-forks that many server processes sharing the port (SO_REUSEPORT)
+GRPC_WORKERS = int(os.getenv("GRPC_WORKERS", 1))
+# Recycle a worker whose unique memory exceeds this many MB (0 disables)
+WORKER_MAX_RSS_MB = int(os.getenv("WORKER_MAX_RSS_MB", 0))
+# Seconds in-flight RPCs get to finish after SIGTERM
+SHUTDOWN_GRACE_SECONDS = float(os.getenv("SHUTDOWN_GRACE_SECONDS", 30))
+# Open upstream TLS connections during startup warmup
+WARMUP_CONNECTIONS = os.getenv("WARMUP_CONNECTIONS", "true").lower() == "true"
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 FIREWORKS_API_KEY = os.getenv("FIREWORKS_API_KEY", "")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
+
+# Record/replay of upstream ASR and LLM calls: off | record | replay
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "off")
+CASSETTE_PATH = os.getenv("CASSETTE_PATH", "resources/cassettes/default.cassette")
+# Replay delay: original | zero | <scale factor, e.g. 0.5>
+CASSETTE_LATENCY = os.getenv("CASSETTE_LATENCY", "original")
+
+# Pre-flight gate: uploads shorter than this, or with less speech, skip ASR/LLMs
+PREFLIGHT_MIN_DURATION_SECONDS = float(os.getenv("PREFLIGHT_MIN_DURATION_SECONDS", 1.5))
+PREFLIGHT_MIN_SPEECH_SECONDS = float(os.getenv("PREFLIGHT_MIN_SPEECH_SECONDS", 1.0))
+# Silence kept around the detected speech when trimming for the DSP stages
+VAD_PADDING_SECONDS = float(os.getenv("VAD_PADDING_SECONDS", 0.2))
+
+# Re-encode uploads to 16 kHz mono before sending them to Whisper
+UPLOAD_TRANSCODE = os.getenv("UPLOAD_TRANSCODE", "true").lower() == "true"
+# opus | mp3
+UPLOAD_CODEC = os.getenv("UPLOAD_CODEC", "opus")
+# Files smaller than this are uploaded untouched
+UPLOAD_TRANSCODE_MIN_BYTES = int(os.getenv("UPLOAD_TRANSCODE_MIN_BYTES", 256 * 1024))
+
+# Recordings at least this long are split at pauses and transcribed in parallel (0 disables)
+LONG_AUDIO_MIN_SECONDS = float(os.getenv("LONG_AUDIO_MIN_SECONDS", 45))
+# Chunks are cut at the first pause after this many seconds
+ASR_CHUNK_TARGET_SECONDS = float(os.getenv("ASR_CHUNK_TARGET_SECONDS", 20))
+# Audio shared by neighbouring chunks (capped at half the pause)
+ASR_CHUNK_OVERLAP_SECONDS = float(os.getenv("ASR_CHUNK_OVERLAP_SECONDS", 0.3))
+# Concurrent Whisper requests per recording
+ASR_CHUNK_CONCURRENCY = int(os.getenv("ASR_CHUNK_CONCURRENCY", 4))
+
+# Comma-separated ASR backends in priority order: openai, fireworks, fake
+ASR_BACKENDS = os.getenv("ASR_BACKENDS", "openai,fireworks")
+# primary | failover | race
+ASR_ROUTING = os.getenv("ASR_ROUTING", "failover")
+# A backend slower than this hands the request to the next one (failover routing)
+ASR_FAILOVER_TIMEOUT_SECONDS = float(os.getenv("ASR_FAILOVER_TIMEOUT_SECONDS", 20))
+# Simulated latency of the local fake backend
+ASR_FAKE_LATENCY_SECONDS = float(os.getenv("ASR_FAKE_LATENCY_SECONDS", 0))
+
+# One structured LLM call for intended sentence + phoneme errors, and one for
+# band scores + advice, instead of two serial calls each
+LLM_FUSION = os.getenv("LLM_FUSION", "false").lower() == "true"
+
+# Pronunciation analysis splits long transcripts into groups of whole sentences
+# of about this many words (0: one call for the whole transcript) and analyses
+# up to PRONUNCIATION_CONCURRENCY groups at once
+PRONUNCIATION_GROUP_WORDS = int(os.getenv("PRONUNCIATION_GROUP_WORDS", 60))
+PRONUNCIATION_CONCURRENCY = int(os.getenv("PRONUNCIATION_CONCURRENCY", 6))
+
+# Grading/advice prompts get a digest of the assessment: the most frequent errors
+# per category, and at most this many (estimated) tokens per stage
+DIGEST_TOP_ERRORS = int(os.getenv("DIGEST_TOP_ERRORS", 5))
+DIGEST_GRADING_MAX_TOKENS = int(os.getenv("DIGEST_GRADING_MAX_TOKENS", 1500))
+DIGEST_ADVICE_MAX_TOKENS = int(os.getenv("DIGEST_ADVICE_MAX_TOKENS", 600))
+
+# Per-model USD prices merged over utils.usage.PRICES, as JSON:
+# {"gpt-4o-mini": {"prompt": 0.15, "completion": 0.6}, "whisper-1": {"audio_minute": 0.006}}
+USAGE_PRICES = json.loads(os.getenv("USAGE_PRICES", "{}"))
+
+# Word-stress pitch tracking analyses this many STFT frames at a time (~3 s at
+# 44.1 kHz), bounding memory on long recordings (0: whole signal at once)
+PITCH_BLOCK_FRAMES = int(os.getenv("PITCH_BLOCK_FRAMES", 256))
+
+# Pre-started ffmpeg workers for uploads soundfile cannot decode in-process
+# (webm, m4a, ...); also the cap on concurrent ffmpeg decodes
+DECODER_WORKERS = int(os.getenv("DECODER_WORKERS", 2))
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+
+# Pitch/intensity for word stress and intonation: librosa (piptrack + yin) |
+# praat (parselmouth, one pair of tracks per request)
+ACOUSTIC_BACKEND = os.getenv("ACOUSTIC_BACKEND", "librosa")
+# Weights of pitch, intensity and voiced duration in syllable prominence (praat)
+STRESS_PROMINENCE_WEIGHTS = tuple(
+    float(w) for w in os.getenv("STRESS_PROMINENCE_WEIGHTS", "0.4,0.4,0.2").split(",")
+)
+
+# Async job API: audio and the sqlite job table live here
+JOB_DIR = os.getenv("JOB_DIR", "/tmp/linglooma/jobs")
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join(JOB_DIR, "jobs.sqlite3"))
+# Concurrent job evaluations per server process
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+# Evaluation slots per process, shared fairly across tenants (x-tenant-id
+# metadata) in an interactive and a batch lane (x-priority); 0 disables
+SCHED_MAX_CONCURRENT = int(os.getenv("SCHED_MAX_CONCURRENT", 8))
+SCHED_TENANT_MAX_CONCURRENT = int(os.getenv("SCHED_TENANT_MAX_CONCURRENT", 4))
+# Slots batch work may never take, kept for interactive requests
+SCHED_INTERACTIVE_RESERVED = int(os.getenv("SCHED_INTERACTIVE_RESERVED", 2))
+SCHED_MAX_QUEUED_PER_TENANT = int(os.getenv("SCHED_MAX_QUEUED_PER_TENANT", 200))
+# "tenant=weight,..."; unlisted tenants weigh 1
+SCHED_TENANT_WEIGHTS = {
+    tenant.strip(): float(weight)
+    for tenant, _, weight in (
+        item.partition("=") for item in os.getenv("SCHED_TENANT_WEIGHTS", "").split(",") if item
+    )
+}
+
+# Admin service (profiling, metrics): callers send this in x-admin-token
+# metadata; unset, the service is not served
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/linglooma/profiles")
+# Fraction of requests CPU-profiled while no capture runs (e.g. 0.001)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0.0))
+PROFILE_MAX_SAMPLES = int(os.getenv("PROFILE_MAX_SAMPLES", 50))
+PROFILE_TOP_ALLOCATIONS = int(os.getenv("PROFILE_TOP_ALLOCATIONS", 10))
+PROFILE_TRACEMALLOC_FRAMES = int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", 1))
+
+# SubmitAssessment fails with RESOURCE_EXHAUSTED beyond this many queued jobs
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", 100))
+# Finished jobs stay retrievable for this long
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", 24 * 3600))
+JOB_PURGE_INTERVAL_SECONDS = float(os.getenv("JOB_PURGE_INTERVAL_SECONDS", 60))
+# How often idle workers and watchers re-check the store for other processes' changes
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", 1.0))
+# A claimed job is leased to its process for this long and renewed while it
+# runs; an expired lease means the process died and the job is claimed again
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 30.0))
+# Claims before a job that keeps losing its worker is failed
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+
+# A stage is skipped for the request deadline only when the time left is below
+# this quantile of its recorded durations (0.1: it would overrun 9 times in 10)
+DEADLINE_SKIP_QUANTILE = float(os.getenv("DEADLINE_SKIP_QUANTILE", 0.1))
+# Per-stage time budgets in seconds; a stage over budget is cancelled and the
+# response is marked partial. Override as "grading=10,advice=8" (0 = no limit).
+STAGE_BUDGETS = {
+    "preflight": 5.0,
+    "transcription": 30.0,
+    "pronunciation": 20.0,
+    "word_stress": 10.0,
+    "intonation": 15.0,
+    "grading": 15.0,
+    "advice": 15.0,
+    # grading + advice in one call (LLM_FUSION)
+    "feedback": 20.0,
+    **{
+        stage.strip(): float(seconds)
+        for stage, _, seconds in (
+            item.partition("=") for item in os.getenv("STAGE_BUDGETS", "").split(",") if item
+        )
+    },
+}
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: grpc_service/admin.proto
+# Protobuf Python Version: 5.29.0
+"""Generated protocol buffer code."""
+
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC, 5, 29, 0, "", "grpc_service/admin.proto"
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
+    b'\n\x18grpc_service/admin.proto\x12\x05\x61\x64min"W\n\x15StartProfilingRequest\x12\x10\n\x08requests\x18\x01 \x01(\x05\x12\x0f\n\x07seconds\x18\x02 \x01(\x02\x12\x0b\n\x03\x63pu\x18\x03 \x01(\x08\x12\x0e\n\x06memory\x18\x04 \x01(\x08"-\n\x14StopProfilingRequest\x12\x15\n\rincludePstats\x18\x01 \x01(\x08"\x18\n\x16ProfilingStatusRequest")\n\x19SetProfileSamplingRequest\x12\x0c\n\x04rate\x18\x01 \x01(\x02"\x97\x01\n\x0fProfilingStatus\x12\x0e\n\x06\x61\x63tive\x18\x01 \x01(\x08\x12\x11\n\tcaptureId\x18\x02 \x01(\t\x12\x18\n\x10requestsProfiled\x18\x03 \x01(\x05\x12\x19\n\x11requestsRemaining\x18\x04 \x01(\x05\x12\x18\n\x10secondsRemaining\x18\x05 \x01(\x02\x12\x12\n\nsampleRate\x18\x06 \x01(\x02"@\n\nAllocation\x12\x10\n\x08location\x18\x01 \x01(\t\x12\x11\n\tsizeBytes\x18\x02 \x01(\x03\x12\r\n\x05\x63ount\x18\x03 \x01(\x03"b\n\x10StageAllocations\x12\r\n\x05stage\x18\x01 \x01(\t\x12\r\n\x05\x63\x61lls\x18\x02 \x01(\x05\x12\x10\n\x08netBytes\x18\x03 \x01(\x03\x12\x1e\n\x03top\x18\x04 \x03(\x0b\x32\x11.admin.Allocation"\xaf\x01\n\rProfileResult\x12\x11\n\tcaptureId\x18\x01 \x01(\t\x12\x18\n\x10requestsProfiled\x18\x02 \x01(\x05\x12\x0f\n\x07seconds\x18\x03 \x01(\x02\x12\x13\n\x0b\x61rtifactDir\x18\x04 \x01(\t\x12\x12\n\ncpuSummary\x18\x05 \x01(\t\x12\x0e\n\x06pstats\x18\x06 \x01(\x0c\x12\'\n\x06stages\x18\x07 \x03(\x0b\x32\x17.admin.StageAllocations"\x10\n\x0eMetricsRequest"\x1f\n\x0fMetricsSnapshot\x12\x0c\n\x04json\x18\x01 \x01(\t2\xf4\x02\n\x0c\x41\x64minService\x12\x46\n\x0eStartProfiling\x12\x1c.admin.StartProfilingRequest\x1a\x16.admin.ProfilingStatus\x12\x42\n\rStopProfiling\x12\x1b.admin.StopProfilingRequest\x1a\x14.admin.ProfileResult\x12K\n\x12GetProfilingStatus\x12\x1d.admin.ProfilingStatusRequest\x1a\x16.admin.ProfilingStatus\x12N\n\x12SetProfileSampling\x12 .admin.SetProfileSamplingRequest\x1a\x16.admin.ProfilingStatus\x12;\n\nGetMetrics\x12\x15.admin.MetricsRequest\x1a\x16.admin.MetricsSnapshotb\x06proto3'
+)
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, "grpc_service.admin_pb2", _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+    DESCRIPTOR._loaded_options = None
+    _globals["_STARTPROFILINGREQUEST"]._serialized_start = 35
+    _globals["_STARTPROFILINGREQUEST"]._serialized_end = 122
+    _globals["_STOPPROFILINGREQUEST"]._serialized_start = 124
+    _globals["_STOPPROFILINGREQUEST"]._serialized_end = 169
+    _globals["_PROFILINGSTATUSREQUEST"]._serialized_start = 171
+    _globals["_PROFILINGSTATUSREQUEST"]._serialized_end = 195
+    _globals["_SETPROFILESAMPLINGREQUEST"]._serialized_start = 197
+    _globals["_SETPROFILESAMPLINGREQUEST"]._serialized_end = 238
+    _globals["_PROFILINGSTATUS"]._serialized_start = 241
+    _globals["_PROFILINGSTATUS"]._serialized_end = 392
+    _globals["_ALLOCATION"]._serialized_start = 394
+    _globals["_ALLOCATION"]._serialized_end = 458
+    _globals["_STAGEALLOCATIONS"]._serialized_start = 460
+    _globals["_STAGEALLOCATIONS"]._serialized_end = 558
+    _globals["_PROFILERESULT"]._serialized_start = 561
+    _globals["_PROFILERESULT"]._serialized_end = 736
+    _globals["_METRICSREQUEST"]._serialized_start = 738
+    _globals["_METRICSREQUEST"]._serialized_end = 754
+    _globals["_METRICSSNAPSHOT"]._serialized_start = 756
+    _globals["_METRICSSNAPSHOT"]._serialized_end = 787
+    _globals["_ADMINSERVICE"]._serialized_start = 790
+    _globals["_ADMINSERVICE"]._serialized_end = 1162
+# @@protoc_insertion_point(module_scope)
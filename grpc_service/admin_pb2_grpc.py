@@ -0,0 +1,293 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+
+import grpc
+
+from grpc_service import admin_pb2 as grpc__service_dot_admin__pb2
+
+GRPC_GENERATED_VERSION = "1.70.0"
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+
+    _version_not_supported = first_version_is_lower(
+        GRPC_VERSION, GRPC_GENERATED_VERSION
+    )
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f"The grpc package installed is at version {GRPC_VERSION},"
+        + " but the generated code in grpc_service/admin_pb2_grpc.py depends on"
+        + f" grpcio>={GRPC_GENERATED_VERSION}."
+        + f" Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}"
+        + f" or downgrade your generated code using grpcio-tools<={GRPC_VERSION}."
+    )
+
+
+class AdminServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.StartProfiling = channel.unary_unary(
+            "/admin.AdminService/StartProfiling",
+            request_serializer=grpc__service_dot_admin__pb2.StartProfilingRequest.SerializeToString,
+            response_deserializer=grpc__service_dot_admin__pb2.ProfilingStatus.FromString,
+            _registered_method=True,
+        )
+        self.StopProfiling = channel.unary_unary(
+            "/admin.AdminService/StopProfiling",
+            request_serializer=grpc__service_dot_admin__pb2.StopProfilingRequest.SerializeToString,
+            response_deserializer=grpc__service_dot_admin__pb2.ProfileResult.FromString,
+            _registered_method=True,
+        )
+        self.GetProfilingStatus = channel.unary_unary(
+            "/admin.AdminService/GetProfilingStatus",
+            request_serializer=grpc__service_dot_admin__pb2.ProfilingStatusRequest.SerializeToString,
+            response_deserializer=grpc__service_dot_admin__pb2.ProfilingStatus.FromString,
+            _registered_method=True,
+        )
+        self.SetProfileSampling = channel.unary_unary(
+            "/admin.AdminService/SetProfileSampling",
+            request_serializer=grpc__service_dot_admin__pb2.SetProfileSamplingRequest.SerializeToString,
+            response_deserializer=grpc__service_dot_admin__pb2.ProfilingStatus.FromString,
+            _registered_method=True,
+        )
+        self.GetMetrics = channel.unary_unary(
+            "/admin.AdminService/GetMetrics",
+            request_serializer=grpc__service_dot_admin__pb2.MetricsRequest.SerializeToString,
+            response_deserializer=grpc__service_dot_admin__pb2.MetricsSnapshot.FromString,
+            _registered_method=True,
+        )
+
+
+class AdminServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def StartProfiling(self, request, context):
+        """Fails with FAILED_PRECONDITION while another capture is running"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def StopProfiling(self, request, context):
+        """Stops the running capture, or returns the last finished one"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def GetProfilingStatus(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def SetProfileSampling(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def GetMetrics(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+
+def add_AdminServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+        "StartProfiling": grpc.unary_unary_rpc_method_handler(
+            servicer.StartProfiling,
+            request_deserializer=grpc__service_dot_admin__pb2.StartProfilingRequest.FromString,
+            response_serializer=grpc__service_dot_admin__pb2.ProfilingStatus.SerializeToString,
+        ),
+        "StopProfiling": grpc.unary_unary_rpc_method_handler(
+            servicer.StopProfiling,
+            request_deserializer=grpc__service_dot_admin__pb2.StopProfilingRequest.FromString,
+            response_serializer=grpc__service_dot_admin__pb2.ProfileResult.SerializeToString,
+        ),
+        "GetProfilingStatus": grpc.unary_unary_rpc_method_handler(
+            servicer.GetProfilingStatus,
+            request_deserializer=grpc__service_dot_admin__pb2.ProfilingStatusRequest.FromString,
+            response_serializer=grpc__service_dot_admin__pb2.ProfilingStatus.SerializeToString,
+        ),
+        "SetProfileSampling": grpc.unary_unary_rpc_method_handler(
+            servicer.SetProfileSampling,
+            request_deserializer=grpc__service_dot_admin__pb2.SetProfileSamplingRequest.FromString,
+            response_serializer=grpc__service_dot_admin__pb2.ProfilingStatus.SerializeToString,
+        ),
+        "GetMetrics": grpc.unary_unary_rpc_method_handler(
+            servicer.GetMetrics,
+            request_deserializer=grpc__service_dot_admin__pb2.MetricsRequest.FromString,
+            response_serializer=grpc__service_dot_admin__pb2.MetricsSnapshot.SerializeToString,
+        ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+        "admin.AdminService", rpc_method_handlers
+    )
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers("admin.AdminService", rpc_method_handlers)
+
+
+# This class is part of an EXPERIMENTAL API.
+class AdminService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def StartProfiling(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/admin.AdminService/StartProfiling",
+            grpc__service_dot_admin__pb2.StartProfilingRequest.SerializeToString,
+            grpc__service_dot_admin__pb2.ProfilingStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def StopProfiling(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/admin.AdminService/StopProfiling",
+            grpc__service_dot_admin__pb2.StopProfilingRequest.SerializeToString,
+            grpc__service_dot_admin__pb2.ProfileResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def GetProfilingStatus(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/admin.AdminService/GetProfilingStatus",
+            grpc__service_dot_admin__pb2.ProfilingStatusRequest.SerializeToString,
+            grpc__service_dot_admin__pb2.ProfilingStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def SetProfileSampling(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/admin.AdminService/SetProfileSampling",
+            grpc__service_dot_admin__pb2.SetProfileSamplingRequest.SerializeToString,
+            grpc__service_dot_admin__pb2.ProfilingStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def GetMetrics(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/admin.AdminService/GetMetrics",
+            grpc__service_dot_admin__pb2.MetricsRequest.SerializeToString,
+            grpc__service_dot_admin__pb2.MetricsSnapshot.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
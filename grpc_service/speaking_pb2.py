@@ -20,7 +20,7 @@ _sym_db = _symbol_database.Default()
 
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\x1bgrpc_service/speaking.proto\x12\x08speaking"*\n\x19SpeakingAssessmentRequest\x12\r\n\x05\x61udio\x18\x01 \x01(\x0c"\xad\x01\n\x12SpeakingAssessment\x12\x1b\n\x13speechTranscription\x18\x01 \x01(\t\x12\x42\n\x17pronunciationAssessment\x18\x02 \x01(\x0b\x32!.speaking.PronunciationAssessment\x12\x1e\n\x05score\x18\x03 \x01(\x0b\x32\x0f.speaking.Score\x12\x16\n\x0eoverallAdvices\x18\x04 \x03(\t"\xa2\x02\n\x17PronunciationAssessment\x12#\n\x1b\x61\x63tualPhoneticTranscription\x18\x01 \x01(\t\x12%\n\x1d\x65xpectedPhoneticTranscription\x18\x02 \x01(\t\x12\x39\n\x13phonemeErrorDetails\x18\x03 \x03(\x0b\x32\x1c.speaking.PhonemeErrorDetail\x12?\n\x16wordStressErrorDetails\x18\x04 \x03(\x0b\x32\x1f.speaking.WordStressErrorDetail\x12?\n\x16intonationErrorDetails\x18\x05 \x01(\x0b\x32\x1f.speaking.IntonationErrorDetail"\xde\x02\n\x12PhonemeErrorDetail\x12\x17\n\x0ftranscribedWord\x18\x01 \x01(\t\x12\x14\n\x0c\x65xpectedWord\x18\x02 \x01(\t\x12\x1d\n\x15\x65xpectedPronunciation\x18\x03 \x01(\t\x12\x1b\n\x13\x61\x63tualPronunciation\x18\x04 \x01(\t\x12\x11\n\terrorType\x18\x05 \x01(\t\x12\x1b\n\x13\x65rrorStartIndexWord\x18\x06 \x01(\x05\x12\x19\n\x11\x65rrorEndIndexWord\x18\x07 \x01(\x05\x12\x13\n\x0bsubstituted\x18\x08 \x01(\t\x12\x18\n\x10\x65rrorDescription\x18\t \x01(\t\x12\x19\n\x11improvementAdvice\x18\n \x01(\t\x12$\n\x1c\x65rrorStartIndexTranscription\x18\x0b \x01(\x05\x12"\n\x1a\x65rrorEndIndexTranscription\x18\x0c \x01(\x05"\x84\x02\n\x15WordStressErrorDetail\x12\x0c\n\x04word\x18\x01 \x01(\t\x12\x19\n\x11syllableBreakdown\x18\x02 \x03(\t\x12\x11\n\terrorType\x18\x03 \x01(\t\x12#\n\x1b\x61\x63tualStressedSyllableIndex\x18\x04 \x01(\x05\x12%\n\x1d\x65xpectedStressedSyllableIndex\x18\x05 \x01(\x05\x12\x18\n\x10\x65rrorDescription\x18\x06 \x01(\t\x12\x19\n\x11improvementAdvice\x18\x07 \x01(\t\x12\x17\n\x0f\x65rrorStartIndex\x18\x08 \x01(\x05\x12\x15\n\rerrorEndIndex\x18\t \x01(\x05"\xce\x01\n\x15IntonationErrorDetail\x12\x12\n\nclauseText\x18\x01 \x01(\t\x12\x1c\n\x14\x61\x63tualIntonationType\x18\x02 \x01(\t\x12\x1e\n\x16\x65xpectedIntonationType\x18\x03 \x01(\t\x12\x18\n\x10\x65rrorDescription\x18\x04 \x01(\t\x12\x19\n\x11improvementAdvice\x18\x05 \x01(\t\x12\x17\n\x0f\x65rrorStartIndex\x18\x06 \x01(\x05\x12\x15\n\rerrorEndIndex\x18\x07 \x01(\x05"\x84\x01\n\x05Score\x12\x0f\n\x07overall\x18\x01 \x01(\x02\x12\x18\n\x10\x66luencyCoherence\x18\x02 \x01(\x02\x12\x17\n\x0flexicalResource\x18\x03 \x01(\x02\x12 \n\x18grammaticalRangeAccuracy\x18\x04 \x01(\x02\x12\x15\n\rpronunciation\x18\x05 \x01(\x02\x32p\n\x19SpeakingAssessmentService\x12S\n\x0e\x41ssessSpeaking\x12#.speaking.SpeakingAssessmentRequest\x1a\x1c.speaking.SpeakingAssessmentb\x06proto3'
+    b'\n\x1bgrpc_service/speaking.proto\x12\x08speaking"*\n\x19SpeakingAssessmentRequest\x12\r\n\x05\x61udio\x18\x01 \x01(\x0c"\xaf\x02\n\x12SpeakingAssessment\x12\x1b\n\x13speechTranscription\x18\x01 \x01(\t\x12\x42\n\x17pronunciationAssessment\x18\x02 \x01(\x0b\x32!.speaking.PronunciationAssessment\x12\x1e\n\x05score\x18\x03 \x01(\x0b\x32\x0f.speaking.Score\x12\x16\n\x0eoverallAdvices\x18\x04 \x03(\t\x12(\n\naudioStats\x18\x05 \x01(\x0b\x32\x14.speaking.AudioStats\x12\x17\n\x0frejectionReason\x18\x06 \x01(\t\x12,\n\rstageStatuses\x18\x07 \x03(\x0b\x32\x15.speaking.StageStatus\x12\x0f\n\x07partial\x18\x08 \x01(\x08"f\n\x0bStageStatus\x12\r\n\x05stage\x18\x01 \x01(\t\x12\'\n\x07outcome\x18\x02 \x01(\x0e\x32\x16.speaking.StageOutcome\x12\x0f\n\x07seconds\x18\x03 \x01(\x02\x12\x0e\n\x06\x64\x65tail\x18\x04 \x01(\t"\xbf\x01\n\nAudioStats\x12\x17\n\x0f\x64urationSeconds\x18\x01 \x01(\x02\x12\x15\n\rspeechSeconds\x18\x02 \x01(\x02\x12\x13\n\x0bspeechRatio\x18\x03 \x01(\x02\x12\x16\n\x0espeechSegments\x18\x04 \x01(\x05\x12\x1d\n\x15leadingSilenceSeconds\x18\x05 \x01(\x02\x12\x1e\n\x16trailingSilenceSeconds\x18\x06 \x01(\x02\x12\x15\n\rclippingRatio\x18\x07 \x01(\x02"\xa2\x02\n\x17PronunciationAssessment\x12#\n\x1b\x61\x63tualPhoneticTranscription\x18\x01 \x01(\t\x12%\n\x1d\x65xpectedPhoneticTranscription\x18\x02 \x01(\t\x12\x39\n\x13phonemeErrorDetails\x18\x03 \x03(\x0b\x32\x1c.speaking.PhonemeErrorDetail\x12?\n\x16wordStressErrorDetails\x18\x04 \x03(\x0b\x32\x1f.speaking.WordStressErrorDetail\x12?\n\x16intonationErrorDetails\x18\x05 \x01(\x0b\x32\x1f.speaking.IntonationErrorDetail"\xde\x02\n\x12PhonemeErrorDetail\x12\x17\n\x0ftranscribedWord\x18\x01 \x01(\t\x12\x14\n\x0c\x65xpectedWord\x18\x02 \x01(\t\x12\x1d\n\x15\x65xpectedPronunciation\x18\x03 \x01(\t\x12\x1b\n\x13\x61\x63tualPronunciation\x18\x04 \x01(\t\x12\x11\n\terrorType\x18\x05 \x01(\t\x12\x1b\n\x13\x65rrorStartIndexWord\x18\x06 \x01(\x05\x12\x19\n\x11\x65rrorEndIndexWord\x18\x07 \x01(\x05\x12\x13\n\x0bsubstituted\x18\x08 \x01(\t\x12\x18\n\x10\x65rrorDescription\x18\t \x01(\t\x12\x19\n\x11improvementAdvice\x18\n \x01(\t\x12$\n\x1c\x65rrorStartIndexTranscription\x18\x0b \x01(\x05\x12"\n\x1a\x65rrorEndIndexTranscription\x18\x0c \x01(\x05"\x84\x02\n\x15WordStressErrorDetail\x12\x0c\n\x04word\x18\x01 \x01(\t\x12\x19\n\x11syllableBreakdown\x18\x02 \x03(\t\x12\x11\n\terrorType\x18\x03 \x01(\t\x12#\n\x1b\x61\x63tualStressedSyllableIndex\x18\x04 \x01(\x05\x12%\n\x1d\x65xpectedStressedSyllableIndex\x18\x05 \x01(\x05\x12\x18\n\x10\x65rrorDescription\x18\x06 \x01(\t\x12\x19\n\x11improvementAdvice\x18\x07 \x01(\t\x12\x17\n\x0f\x65rrorStartIndex\x18\x08 \x01(\x05\x12\x15\n\rerrorEndIndex\x18\t \x01(\x05"\xce\x01\n\x15IntonationErrorDetail\x12\x12\n\nclauseText\x18\x01 \x01(\t\x12\x1c\n\x14\x61\x63tualIntonationType\x18\x02 \x01(\t\x12\x1e\n\x16\x65xpectedIntonationType\x18\x03 \x01(\t\x12\x18\n\x10\x65rrorDescription\x18\x04 \x01(\t\x12\x19\n\x11improvementAdvice\x18\x05 \x01(\t\x12\x17\n\x0f\x65rrorStartIndex\x18\x06 \x01(\x05\x12\x15\n\rerrorEndIndex\x18\x07 \x01(\x05"\x84\x01\n\x05Score\x12\x0f\n\x07overall\x18\x01 \x01(\x02\x12\x18\n\x10\x66luencyCoherence\x18\x02 \x01(\x02\x12\x17\n\x0flexicalResource\x18\x03 \x01(\x02\x12 \n\x18grammaticalRangeAccuracy\x18\x04 \x01(\x02\x12\x15\n\rpronunciation\x18\x05 \x01(\x02")\n\x18SubmitAssessmentResponse\x12\r\n\x05jobId\x18\x01 \x01(\t"%\n\x14GetAssessmentRequest\x12\r\n\x05jobId\x18\x01 \x01(\t"\xb8\x01\n\rAssessmentJob\x12\r\n\x05jobId\x18\x01 \x01(\t\x12!\n\x05state\x18\x02 \x01(\x0e\x32\x12.speaking.JobState\x12,\n\x06result\x18\x03 \x01(\x0b\x32\x1c.speaking.SpeakingAssessment\x12\r\n\x05\x65rror\x18\x04 \x01(\t\x12\x11\n\tcreatedAt\x18\x05 \x01(\x01\x12\x11\n\tstartedAt\x18\x06 \x01(\x01\x12\x12\n\nfinishedAt\x18\x07 \x01(\x01*|\n\x0cStageOutcome\x12\x1d\n\x19STAGE_OUTCOME_UNSPECIFIED\x10\x00\x12\x13\n\x0fSTAGE_COMPLETED\x10\x01\x12\x13\n\x0fSTAGE_TIMED_OUT\x10\x02\x12\x10\n\x0cSTAGE_FAILED\x10\x03\x12\x11\n\rSTAGE_SKIPPED\x10\x04*i\n\x08JobState\x12\x19\n\x15JOB_STATE_UNSPECIFIED\x10\x00\x12\x0e\n\nJOB_QUEUED\x10\x01\x12\x0f\n\x0bJOB_RUNNING\x10\x02\x12\x11\n\rJOB_SUCCEEDED\x10\x03\x12\x0e\n\nJOB_FAILED\x10\x04\x32\xe5\x02\n\x19SpeakingAssessmentService\x12S\n\x0e\x41ssessSpeaking\x12#.speaking.SpeakingAssessmentRequest\x1a\x1c.speaking.SpeakingAssessment\x12[\n\x10SubmitAssessment\x12#.speaking.SpeakingAssessmentRequest\x1a".speaking.SubmitAssessmentResponse\x12H\n\rGetAssessment\x12\x1e.speaking.GetAssessmentRequest\x1a\x17.speaking.AssessmentJob\x12L\n\x0fWatchAssessment\x12\x1e.speaking.GetAssessmentRequest\x1a\x17.speaking.AssessmentJob0\x01\x62\x06proto3'
 )
 
 _globals = globals()
@@ -30,20 +30,34 @@ _builder.BuildTopDescriptorsAndMessages(
 )
 if not _descriptor._USE_C_DESCRIPTORS:
     DESCRIPTOR._loaded_options = None
+    _globals["_STAGEOUTCOME"]._serialized_start = 2211
+    _globals["_STAGEOUTCOME"]._serialized_end = 2335
+    _globals["_JOBSTATE"]._serialized_start = 2337
+    _globals["_JOBSTATE"]._serialized_end = 2442
     _globals["_SPEAKINGASSESSMENTREQUEST"]._serialized_start = 41
     _globals["_SPEAKINGASSESSMENTREQUEST"]._serialized_end = 83
     _globals["_SPEAKINGASSESSMENT"]._serialized_start = 86
-    _globals["_SPEAKINGASSESSMENT"]._serialized_end = 259
-    _globals["_PRONUNCIATIONASSESSMENT"]._serialized_start = 262
-    _globals["_PRONUNCIATIONASSESSMENT"]._serialized_end = 552
-    _globals["_PHONEMEERRORDETAIL"]._serialized_start = 555
-    _globals["_PHONEMEERRORDETAIL"]._serialized_end = 905
-    _globals["_WORDSTRESSERRORDETAIL"]._serialized_start = 908
-    _globals["_WORDSTRESSERRORDETAIL"]._serialized_end = 1168
-    _globals["_INTONATIONERRORDETAIL"]._serialized_start = 1171
-    _globals["_INTONATIONERRORDETAIL"]._serialized_end = 1377
-    _globals["_SCORE"]._serialized_start = 1380
-    _globals["_SCORE"]._serialized_end = 1512
-    _globals["_SPEAKINGASSESSMENTSERVICE"]._serialized_start = 1514
-    _globals["_SPEAKINGASSESSMENTSERVICE"]._serialized_end = 1626
+    _globals["_SPEAKINGASSESSMENT"]._serialized_end = 389
+    _globals["_STAGESTATUS"]._serialized_start = 391
+    _globals["_STAGESTATUS"]._serialized_end = 493
+    _globals["_AUDIOSTATS"]._serialized_start = 496
+    _globals["_AUDIOSTATS"]._serialized_end = 687
+    _globals["_PRONUNCIATIONASSESSMENT"]._serialized_start = 690
+    _globals["_PRONUNCIATIONASSESSMENT"]._serialized_end = 980
+    _globals["_PHONEMEERRORDETAIL"]._serialized_start = 983
+    _globals["_PHONEMEERRORDETAIL"]._serialized_end = 1333
+    _globals["_WORDSTRESSERRORDETAIL"]._serialized_start = 1336
+    _globals["_WORDSTRESSERRORDETAIL"]._serialized_end = 1596
+    _globals["_INTONATIONERRORDETAIL"]._serialized_start = 1599
+    _globals["_INTONATIONERRORDETAIL"]._serialized_end = 1805
+    _globals["_SCORE"]._serialized_start = 1808
+    _globals["_SCORE"]._serialized_end = 1940
+    _globals["_SUBMITASSESSMENTRESPONSE"]._serialized_start = 1942
+    _globals["_SUBMITASSESSMENTRESPONSE"]._serialized_end = 1983
+    _globals["_GETASSESSMENTREQUEST"]._serialized_start = 1985
+    _globals["_GETASSESSMENTREQUEST"]._serialized_end = 2022
+    _globals["_ASSESSMENTJOB"]._serialized_start = 2025
+    _globals["_ASSESSMENTJOB"]._serialized_end = 2209
+    _globals["_SPEAKINGASSESSMENTSERVICE"]._serialized_start = 2445
+    _globals["_SPEAKINGASSESSMENTSERVICE"]._serialized_end = 2802
 # @@protoc_insertion_point(module_scope)
@@ -43,6 +43,24 @@ class SpeakingAssessmentServiceStub(object):
             response_deserializer=grpc__service_dot_speaking__pb2.SpeakingAssessment.FromString,
             _registered_method=True,
         )
+        self.SubmitAssessment = channel.unary_unary(
+            "/speaking.SpeakingAssessmentService/SubmitAssessment",
+            request_serializer=grpc__service_dot_speaking__pb2.SpeakingAssessmentRequest.SerializeToString,
+            response_deserializer=grpc__service_dot_speaking__pb2.SubmitAssessmentResponse.FromString,
+            _registered_method=True,
+        )
+        self.GetAssessment = channel.unary_unary(
+            "/speaking.SpeakingAssessmentService/GetAssessment",
+            request_serializer=grpc__service_dot_speaking__pb2.GetAssessmentRequest.SerializeToString,
+            response_deserializer=grpc__service_dot_speaking__pb2.AssessmentJob.FromString,
+            _registered_method=True,
+        )
+        self.WatchAssessment = channel.unary_stream(
+            "/speaking.SpeakingAssessmentService/WatchAssessment",
+            request_serializer=grpc__service_dot_speaking__pb2.GetAssessmentRequest.SerializeToString,
+            response_deserializer=grpc__service_dot_speaking__pb2.AssessmentJob.FromString,
+            _registered_method=True,
+        )
 
 
 class SpeakingAssessmentServiceServicer(object):
@@ -54,6 +72,24 @@ class SpeakingAssessmentServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def SubmitAssessment(self, request, context):
+        """Queue an assessment and return its job id straight away"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def GetAssessment(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def WatchAssessment(self, request, context):
+        """Streams the job on every state change until it succeeds or fails"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_SpeakingAssessmentServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -62,6 +98,21 @@ def add_SpeakingAssessmentServiceServicer_to_server(servicer, server):
             request_deserializer=grpc__service_dot_speaking__pb2.SpeakingAssessmentRequest.FromString,
             response_serializer=grpc__service_dot_speaking__pb2.SpeakingAssessment.SerializeToString,
         ),
+        "SubmitAssessment": grpc.unary_unary_rpc_method_handler(
+            servicer.SubmitAssessment,
+            request_deserializer=grpc__service_dot_speaking__pb2.SpeakingAssessmentRequest.FromString,
+            response_serializer=grpc__service_dot_speaking__pb2.SubmitAssessmentResponse.SerializeToString,
+        ),
+        "GetAssessment": grpc.unary_unary_rpc_method_handler(
+            servicer.GetAssessment,
+            request_deserializer=grpc__service_dot_speaking__pb2.GetAssessmentRequest.FromString,
+            response_serializer=grpc__service_dot_speaking__pb2.AssessmentJob.SerializeToString,
+        ),
+        "WatchAssessment": grpc.unary_stream_rpc_method_handler(
+            servicer.WatchAssessment,
+            request_deserializer=grpc__service_dot_speaking__pb2.GetAssessmentRequest.FromString,
+            response_serializer=grpc__service_dot_speaking__pb2.AssessmentJob.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "speaking.SpeakingAssessmentService", rpc_method_handlers
@@ -105,3 +156,93 @@ class SpeakingAssessmentService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def SubmitAssessment(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/speaking.SpeakingAssessmentService/SubmitAssessment",
+            grpc__service_dot_speaking__pb2.SpeakingAssessmentRequest.SerializeToString,
+            grpc__service_dot_speaking__pb2.SubmitAssessmentResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def GetAssessment(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/speaking.SpeakingAssessmentService/GetAssessment",
+            grpc__service_dot_speaking__pb2.GetAssessmentRequest.SerializeToString,
+            grpc__service_dot_speaking__pb2.AssessmentJob.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def WatchAssessment(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/speaking.SpeakingAssessmentService/WatchAssessment",
+            grpc__service_dot_speaking__pb2.GetAssessmentRequest.SerializeToString,
+            grpc__service_dot_speaking__pb2.AssessmentJob.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
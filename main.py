@@ -1,43 +1,249 @@
 import asyncio
+import hmac
+import json
+from pathlib import Path
+import signal
 from concurrent import futures
 import grpc
-from google.protobuf.json_format import ParseDict
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
 import uuid
-from grpc_service.speaking_pb2 import SpeakingAssessment, SpeakingAssessmentRequest
+from config import settings
+from grpc_service.speaking_pb2 import (
+    GetAssessmentRequest,
+    SpeakingAssessmentRequest,
+    SubmitAssessmentResponse,
+)
 from grpc_service.speaking_pb2_grpc import (
     SpeakingAssessmentServiceServicer,
     add_SpeakingAssessmentServiceServicer_to_server,
 )
+from grpc_service import admin_pb2
+from grpc_service.admin_pb2_grpc import AdminServiceServicer, add_AdminServiceServicer_to_server
 import logging
+from services.jobs import JobQueueFull, JobRunner, JobStore, JobsUnavailable
 from services.speaking import SpeakingEvaluationService
+from services.warmup import WarmupService
+from utils import metrics
+from utils.deadline import DeadlineExceeded, deadline_scope
+from utils.profiling import ProfilingBusy, ProfilingExecutor, profiler, top_allocations
+from utils.scheduler import FairScheduler, SchedulerFull, request_identity
+from utils.usage import usage_scope
 
 logging.basicConfig(
     level=logging.INFO,  # Log level (INFO, DEBUG, WARNING, ERROR, CRITICAL)
-    format="%(asctime)s - %(levelname)s - %(message)s",
+    format="%(asctime)s - %(process)d - %(levelname)s - %(message)s",
     handlers=[logging.FileHandler("/tmp/linglooma/app.log"), logging.StreamHandler()],
 )
 
 
 class SpeakingAssessmentServiceImpl(SpeakingAssessmentServiceServicer):
+    def __init__(self, jobs: JobRunner, scheduler: FairScheduler):
+        self.jobs = jobs
+        self.scheduler = scheduler
+
     async def AssessSpeaking(self, request: SpeakingAssessmentRequest, context):
         audio_path = f"/tmp/{str(uuid.uuid4())}.mp3"
         with open(audio_path, "wb") as f:
             f.write(request.audio)
-        evaluation_result = await SpeakingEvaluationService.evaluate(audio_path)
-        evaluation_result = ParseDict(evaluation_result, SpeakingAssessment())
-        return evaluation_result
+        # grpc.aio cancels this coroutine when the client disconnects or its
+        # deadline passes; the cancellation reaches every stage task and
+        # in-flight HTTP request, and the deadline scope lets stages skip work
+        # they could not finish anyway. Time spent waiting for a scheduler
+        # slot comes out of the same deadline.
+        tenant, lane = request_identity(context.invocation_metadata())
+        try:
+            async with self.scheduler.slot(tenant, lane, context.time_remaining()) as wait:
+                with deadline_scope(context.time_remaining()), usage_scope() as usage:
+                    with profiler.request_scope():
+                        result = await SpeakingEvaluationService.evaluate(audio_path)
+            context.set_trailing_metadata(
+                [("queue-wait-seconds", f"{wait:.3f}"), *usage.metadata()]
+            )
+            return result
+        except SchedulerFull as e:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        except asyncio.CancelledError:
+            metrics.increment("rpc.cancelled")
+            logging.info("AssessSpeaking cancelled by the client or its deadline")
+            raise
+        except DeadlineExceeded as e:
+            await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, str(e))
+
+    async def SubmitAssessment(self, request: SpeakingAssessmentRequest, context):
+        try:
+            tenant, _ = request_identity(context.invocation_metadata())
+            job_id = await self.jobs.submit(request.audio, tenant)
+        except JobQueueFull as e:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        except JobsUnavailable as e:
+            await context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
+        return SubmitAssessmentResponse(jobId=job_id)
+
+    async def GetAssessment(self, request: GetAssessmentRequest, context):
+        job = await self.jobs.get(request.jobId)
+        if job is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f"Unknown job {request.jobId}")
+        return job
+
+    async def WatchAssessment(self, request: GetAssessmentRequest, context):
+        found = False
+        async for job in self.jobs.watch(request.jobId):
+            found = True
+            yield job
+        if not found:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f"Unknown job {request.jobId}")
+
+
+class AdminServiceImpl(AdminServiceServicer):
+    """Profiling and metrics of this worker process, for operators holding
+    ADMIN_TOKEN."""
+
+    @staticmethod
+    async def authorize(context) -> None:
+        token = dict(context.invocation_metadata()).get("x-admin-token", "")
+        if not hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode()):
+            metrics.increment("admin.denied")
+            await context.abort(grpc.StatusCode.PERMISSION_DENIED, "Admin token required")
+
+    @staticmethod
+    def status() -> admin_pb2.ProfilingStatus:
+        message = admin_pb2.ProfilingStatus(sampleRate=profiler.sample_rate)
+        capture = profiler.active
+        if capture is not None and not capture.sample:
+            message.active = True
+            message.captureId = capture.id
+            message.requestsProfiled = capture.requests_started
+            if capture.request_limit:
+                message.requestsRemaining = capture.request_limit - capture.requests_started
+            if capture.until is not None:
+                message.secondsRemaining = capture.seconds_left
+        return message
+
+    async def StartProfiling(self, request: admin_pb2.StartProfilingRequest, context):
+        await self.authorize(context)
+        if not (request.cpu or request.memory):
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Enable cpu and/or memory")
+        if request.requests <= 0 and request.seconds <= 0:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Set requests and/or seconds")
+        try:
+            profiler.start(request.requests, request.seconds, request.cpu, request.memory)
+        except ProfilingBusy as e:
+            await context.abort(grpc.StatusCode.FAILED_PRECONDITION, str(e))
+        return self.status()
+
+    async def StopProfiling(self, request: admin_pb2.StopProfilingRequest, context):
+        await self.authorize(context)
+        capture = await profiler.stop()
+        if capture is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "No profile captured yet")
+        result = admin_pb2.ProfileResult(
+            captureId=capture.id,
+            requestsProfiled=capture.requests_started,
+            seconds=capture.seconds,
+            artifactDir=capture.artifact_dir,
+            cpuSummary=capture.cpu_summary,
+        )
+        for stage, entry in sorted(capture.stages.items()):
+            result.stages.add(
+                stage=stage,
+                calls=entry.calls,
+                netBytes=entry.net_bytes,
+                top=[
+                    admin_pb2.Allocation(location=location, sizeBytes=size, count=count)
+                    for location, size, count in top_allocations(entry)
+                ],
+            )
+        if request.includePstats and capture.cpu_summary:
+            path = Path(capture.artifact_dir, "cpu.pstats")
+            result.pstats = await asyncio.to_thread(path.read_bytes)
+        return result
+
+    async def GetProfilingStatus(self, request, context):
+        await self.authorize(context)
+        return self.status()
+
+    async def SetProfileSampling(self, request: admin_pb2.SetProfileSamplingRequest, context):
+        await self.authorize(context)
+        if not 0.0 <= request.rate <= 1.0:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "rate must be within [0, 1]")
+        profiler.sample_rate = request.rate
+        logging.info(f"Profile sampling rate set to {request.rate}")
+        return self.status()
+
+    async def GetMetrics(self, request, context):
+        await self.authorize(context)
+        return admin_pb2.MetricsSnapshot(json=json.dumps(metrics.snapshot(), default=str))
+
+
+SERVICE_NAME = "speaking.SpeakingAssessmentService"
 
 
 async def serve():
-    server = grpc.aio.server(futures.ThreadPoolExecutor(max_workers=10))
+    server = grpc.aio.server(
+        futures.ThreadPoolExecutor(max_workers=10),
+        # Lets every pre-forked worker bind the same port.
+        options=[("grpc.so_reuseport", 1)],
+    )
+    scheduler = FairScheduler()
+    jobs = JobRunner(
+        JobStore(settings.JOB_DB_PATH), SpeakingEvaluationService.evaluate, scheduler
+    )
     add_SpeakingAssessmentServiceServicer_to_server(
-        SpeakingAssessmentServiceImpl(), server
+        SpeakingAssessmentServiceImpl(jobs, scheduler), server
     )
-    server.add_insecure_port("[::]:50051")
-    print("gRPC Server running on port 50051")
+    if settings.ADMIN_TOKEN:
+        add_AdminServiceServicer_to_server(AdminServiceImpl(), server)
+    health_servicer = health.aio.HealthServicer()
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    for service in ("", SERVICE_NAME):
+        await health_servicer.set(
+            service, health_pb2.HealthCheckResponse.NOT_SERVING
+        )
+
+    async def drain():
+        logging.info(
+            f"Draining: waiting up to {settings.SHUTDOWN_GRACE_SECONDS}s for in-flight RPCs"
+        )
+        await health_servicer.enter_graceful_shutdown()
+        await asyncio.gather(
+            jobs.stop(settings.SHUTDOWN_GRACE_SECONDS),
+            server.stop(settings.SHUTDOWN_GRACE_SECONDS),
+        )
+
+    draining = []
+    loop = asyncio.get_running_loop()
+    # Lets a profiling capture follow requests into asyncio.to_thread.
+    loop.set_default_executor(ProfilingExecutor())
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(
+            signum, lambda: draining.append(asyncio.ensure_future(drain()))
+        )
+
+    server.add_insecure_port(f"[::]:{settings.GRPC_PORT}")
     await server.start()
+    await WarmupService.run()
+    await jobs.start()
+    for service in ("", SERVICE_NAME):
+        await health_servicer.set(service, health_pb2.HealthCheckResponse.SERVING)
+    print(f"gRPC Server running on port {settings.GRPC_PORT}")
     await server.wait_for_termination()
+    # Let the job runner finish requeueing before the loop shuts down.
+    await asyncio.gather(*draining)
+    if settings.CASSETTE_MODE == "record":
+        from config import client as clients
+
+        await clients.get_cassette().flush()
 
 
 if __name__ == "__main__":
-    asyncio.run(serve())
+    if settings.GRPC_WORKERS > 1:
+        from supervisor import Supervisor, preload
+
+        preload()
+        Supervisor(
+            lambda: asyncio.run(serve()),
+            workers=settings.GRPC_WORKERS,
+            max_rss_mb=settings.WORKER_MAX_RSS_MB,
+        ).run()
+    else:
+        asyncio.run(serve())
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List
-from config.client import groq_client
-import json
+from config import client as clients
 from pydantic import BaseModel, Field
 
 from utils.logging import log_execution_time
@@ -22,9 +21,9 @@ class AdviceSummarizerList(BaseModel):
 class AdviceSummarizerService:
     @staticmethod
     @log_execution_time
-    async def summarize(text: dict) -> List[str]:
+    async def summarize(digest: str) -> List[str]:
         prompt = """
-            You are given a JSON object with pronunciation assessment details.
+            You are given a summary of a pronunciation assessment.
             Your task is to generate a CONCISE LIST OF UP TO 3 PIECES OF ADVICE
             to help the speaker improve their pronunciation.
             Focus on phoneme errors, word stress issues, and intonation mistakes.
@@ -39,12 +38,12 @@ class AdviceSummarizerService:
         """
         import instructor
 
-        client = instructor.from_groq(groq_client, mode=instructor.Mode.JSON)
+        client = instructor.from_groq(clients.groq_client, mode=instructor.Mode.JSON)
         response = await client.chat.completions.create(
             model="llama-3.2-1b-preview",
             messages=[
                 {"role": "system", "content": prompt},
-                {"role": "user", "content": json.dumps(text)},
+                {"role": "user", "content": digest},
             ],
             temperature=0.5,
             response_model=AdviceSummarizerList,
@@ -204,7 +203,9 @@ async def main():
             "pronunciation": 3.0,
         },
     }
-    result = await AdviceSummarizerService.summarize(text)
+    from services.grading import sample_digest
+
+    result = await AdviceSummarizerService.summarize(sample_digest(text))
     print(result)
 
 
@@ -0,0 +1,207 @@
+"""Speech-to-text backends and the router that picks between them.
+
+Backends take an encoded upload and return text plus word timings relative to
+the start of that upload; `AudioProcessor` maps them onto `AudioTranscription`.
+ASR_BACKENDS orders the backends and ASR_ROUTING decides how they are used:
+
+- primary:  only the first backend.
+- failover: the next backend gets the request when the previous one errors
+            or takes longer than ASR_FAILOVER_TIMEOUT_SECONDS.
+- race:     all backends at once; the first success wins, the rest are cancelled.
+
+A CassetteMiss (replay mode, no recording for the request) is never failed
+over or raced past: another backend would answer the request live.
+"""
+
+import asyncio
+import io
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from config import client as clients
+from config import settings
+from utils import metrics, usage
+from utils.cassette import CassetteMiss
+
+PROMPT = "The Language in the conversation is in English"
+
+
+@dataclass
+class RawTranscript:
+    text: str
+    # (word, start, end) relative to the uploaded audio
+    words: List[Tuple[str, float, float]]
+    backend: str = ""
+    # Billed audio length of the upload
+    duration: float = 0.0
+
+
+def _words(response) -> List[Tuple[str, float, float]]:
+    words = []
+    for word_info in response.words or []:
+        info = word_info.model_dump()
+        words.append((info.get("word", ""), info.get("start", 0.0), info.get("end", 0.0)))
+    return words
+
+
+def _duration(response, words: List[Tuple[str, float, float]]) -> float:
+    return float(getattr(response, "duration", 0) or (words[-1][2] if words else 0.0))
+
+
+class ASRBackend:
+    name = ""
+    model = ""
+
+    async def transcribe(self, filename: str, payload: bytes) -> RawTranscript:
+        raise NotImplementedError
+
+
+class OpenAIWhisperBackend(ASRBackend):
+    name = "openai"
+    model = "whisper-1"
+
+    async def transcribe(self, filename: str, payload: bytes) -> RawTranscript:
+        response = await clients.openai_api_client.audio.transcriptions.create(
+            model=self.model,
+            file=(filename, payload),
+            timestamp_granularities=["word"],
+            response_format="verbose_json",
+            prompt=PROMPT,
+        )
+        words = _words(response)
+        return RawTranscript(text=response.text, words=words, duration=_duration(response, words))
+
+
+class FireworksWhisperBackend(ASRBackend):
+    """Fireworks whisper-v3 with forced alignment for the word timings."""
+
+    name = "fireworks"
+    model = "whisper-v3"
+
+    async def transcribe(self, filename: str, payload: bytes) -> RawTranscript:
+        response = await clients.fireworks_audio_client.transcribe_async(
+            audio=payload,
+            response_format="verbose_json",
+            timestamp_granularities=["word"],
+            language="en",
+            prompt=PROMPT,
+        )
+        words = _words(response)
+        return RawTranscript(text=response.text, words=words, duration=_duration(response, words))
+
+
+class FakeBackend(ASRBackend):
+    """Local stand-in: a canned script spread over the upload's duration."""
+
+    name = "fake"
+    model = "fake"
+
+    async def transcribe(self, filename: str, payload: bytes) -> RawTranscript:
+        import soundfile as sf
+
+        from utils.synthetic import script_words
+
+        duration = sf.info(io.BytesIO(payload)).duration
+        if settings.ASR_FAKE_LATENCY_SECONDS > 0:
+            await asyncio.sleep(settings.ASR_FAKE_LATENCY_SECONDS)
+        text, words = script_words(duration)
+        return RawTranscript(text=text, words=words, duration=duration)
+
+
+BACKENDS: Dict[str, ASRBackend] = {}
+
+
+def register_backend(backend: ASRBackend) -> None:
+    BACKENDS[backend.name] = backend
+
+
+for _backend in (OpenAIWhisperBackend(), FireworksWhisperBackend(), FakeBackend()):
+    register_backend(_backend)
+
+
+def configured_backends() -> List[ASRBackend]:
+    names = [name.strip() for name in settings.ASR_BACKENDS.split(",") if name.strip()]
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown or not names:
+        raise ValueError(f"Unknown ASR backends {unknown}; available: {sorted(BACKENDS)}")
+    return [BACKENDS[name] for name in names]
+
+
+async def _call(backend: ASRBackend, filename: str, payload: bytes, timeout=None) -> RawTranscript:
+    """Run one backend, recording its latency, failures and usage."""
+    prefix = f"asr.backend.{backend.name}"
+    metrics.increment(f"{prefix}.requests")
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(backend.transcribe(filename, payload), timeout)
+    except asyncio.TimeoutError:
+        metrics.increment(f"{prefix}.timeouts")
+        usage.record(backend.model, time.perf_counter() - start, error=True)
+        raise
+    except asyncio.CancelledError:
+        metrics.increment(f"{prefix}.cancelled")
+        usage.record(backend.model, time.perf_counter() - start, error=True)
+        raise
+    except Exception:
+        metrics.increment(f"{prefix}.errors")
+        usage.record(backend.model, time.perf_counter() - start, error=True)
+        raise
+    finally:
+        metrics.observe(f"{prefix}.seconds", time.perf_counter() - start)
+    usage.record(backend.model, time.perf_counter() - start, audio_seconds=result.duration)
+    result.backend = backend.name
+    return result
+
+
+class ASRRouter:
+    @staticmethod
+    async def transcribe(filename: str, payload: bytes) -> RawTranscript:
+        backends = configured_backends()
+        routing = settings.ASR_ROUTING
+        if routing == "primary" or len(backends) == 1:
+            return await _call(backends[0], filename, payload)
+        if routing == "failover":
+            return await ASRRouter.failover(backends, filename, payload)
+        if routing == "race":
+            return await ASRRouter.race(backends, filename, payload)
+        raise ValueError(f"Unknown ASR_ROUTING: {routing}")
+
+    @staticmethod
+    async def failover(backends: List[ASRBackend], filename: str, payload: bytes) -> RawTranscript:
+        # The last backend has no one to hand over to, so it gets no timeout.
+        for backend in backends[:-1]:
+            try:
+                return await _call(
+                    backend, filename, payload, settings.ASR_FAILOVER_TIMEOUT_SECONDS
+                )
+            except CassetteMiss:
+                raise
+            except Exception as e:
+                metrics.increment("asr.failovers")
+                logging.warning(f"ASR backend {backend.name} failed ({e!r}), failing over")
+        return await _call(backends[-1], filename, payload)
+
+    @staticmethod
+    async def race(backends: List[ASRBackend], filename: str, payload: bytes) -> RawTranscript:
+        tasks = {
+            asyncio.create_task(_call(backend, filename, payload)): backend
+            for backend in backends
+        }
+        pending, error = set(tasks), None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        metrics.increment(f"asr.backend.{tasks[task].name}.wins")
+                        return task.result()
+                    error = task.exception()
+                    if isinstance(error, CassetteMiss):
+                        raise error
+                    logging.warning(f"ASR backend {tasks[task].name} lost the race: {error!r}")
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
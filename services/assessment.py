@@ -0,0 +1,96 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.json_format import MessageToJson
+
+from grpc_service.speaking_pb2 import (
+    IntonationErrorDetail,
+    STAGE_COMPLETED,
+    PhonemeErrorDetail,
+    SpeakingAssessment,
+    StageStatus,
+    WordStressErrorDetail,
+)
+
+
+@lru_cache(maxsize=None)
+def _scalar_fields(descriptor) -> Tuple[Tuple[str, bool], ...]:
+    return tuple(
+        (field.name, field.label == FieldDescriptor.LABEL_REPEATED)
+        for field in descriptor.fields
+        if field.type != FieldDescriptor.TYPE_MESSAGE
+    )
+
+
+def _copy_fields(message, source) -> None:
+    """Copy same-named scalar (and repeated scalar) fields from a pydantic
+    model or a dict into `message`; None values leave the proto default."""
+    values = source if isinstance(source, Mapping) else source.__dict__
+    for name, repeated in _scalar_fields(message.DESCRIPTOR):
+        value = values.get(name)
+        if value is None:
+            continue
+        if repeated:
+            getattr(message, name).extend(value)
+        else:
+            setattr(message, name, value)
+
+
+class AssessmentBuilder:
+    """Writes stage results straight into a `SpeakingAssessment` message.
+
+    Each stage fills its own part as soon as it finishes, so the response is
+    ready to send without a dict -> JSON -> ParseDict round trip.
+    """
+
+    def __init__(self):
+        self.message = SpeakingAssessment()
+
+    def set_audio_stats(self, stats) -> None:
+        _copy_fields(self.message.audioStats, stats)
+
+    def set_rejection(self, reason: str) -> None:
+        self.message.rejectionReason = reason
+
+    def set_transcription(self, text: str) -> None:
+        self.message.speechTranscription = text
+
+    def set_pronunciation(self, pronunciation) -> None:
+        target = self.message.pronunciationAssessment
+        _copy_fields(target, pronunciation)
+        for error in pronunciation.phonemeErrorDetails:
+            detail = PhonemeErrorDetail()
+            _copy_fields(detail, error)
+            target.phonemeErrorDetails.append(detail)
+
+    def set_word_stress(self, errors: Iterable) -> None:
+        target = self.message.pronunciationAssessment.wordStressErrorDetails
+        for error in errors:
+            detail = WordStressErrorDetail()
+            _copy_fields(detail, error)
+            target.append(detail)
+
+    def set_intonation(self, intonation: Optional[Dict[str, Any]]) -> None:
+        # process_audio reports failures as {"error": ..., "errorType": ...}.
+        if not intonation or "error" in intonation:
+            raise ValueError((intonation or {}).get("error", "no intonation result"))
+        detail = IntonationErrorDetail()
+        _copy_fields(detail, intonation)
+        self.message.pronunciationAssessment.intonationErrorDetails.CopyFrom(detail)
+
+    def set_score(self, score) -> None:
+        _copy_fields(self.message.score, score)
+
+    def set_advices(self, advices: List[str]) -> None:
+        self.message.overallAdvices.extend(advices)
+
+    def set_stage_status(self, stage: str, outcome: int, seconds: float, detail: str = "") -> None:
+        self.message.stageStatuses.append(
+            StageStatus(stage=stage, outcome=outcome, seconds=seconds, detail=detail)
+        )
+        if outcome != STAGE_COMPLETED:
+            self.message.partial = True
+
+    def debug_json(self) -> str:
+        return MessageToJson(self.message, indent=4, ensure_ascii=False)
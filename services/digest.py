@@ -0,0 +1,158 @@
+"""Compact text summary of an assessment, used as the grading and advice prompt.
+
+The full assessment JSON carries one verbose entry per word for word stress,
+so the prompt grew with the answer length. The digest keeps the transcript,
+fluency numbers, error counts per category and only the most frequent errors,
+and fits the whole thing into a per-stage token cap by shortening the
+transcript first and the error lists second.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from config import settings
+from grpc_service import speaking_pb2
+from grpc_service.speaking_pb2 import SpeakingAssessment
+
+# No tokenizer is bundled; English prose averages about four characters per token.
+CHARS_PER_TOKEN = 4
+# A transcript cut shorter than this tells the grader too little; drop errors first.
+MIN_TRANSCRIPT_TOKENS = 120
+# Longest free-text description kept from the intonation stage.
+MAX_DESCRIPTION_CHARS = 200
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def _breakdown(counter: Counter) -> str:
+    return ", ".join(f"{kind} {count}" for kind, count in counter.most_common())
+
+
+@dataclass
+class AssessmentDigest:
+    """Digest parts computed once per request; `render` applies a token cap."""
+
+    transcript: str
+    fluency: str = ""
+    # (header, ranked lines) per error category
+    categories: List[tuple] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_message(cls, message: SpeakingAssessment) -> "AssessmentDigest":
+        digest = cls(transcript=" ".join(message.speechTranscription.split()))
+        words = len(digest.transcript.split())
+
+        if message.HasField("audioStats"):
+            stats = message.audioStats
+            rate = words / stats.speechSeconds * 60 if stats.speechSeconds else 0.0
+            digest.fluency = (
+                f"Fluency: {stats.durationSeconds:.1f}s audio, {stats.speechSeconds:.1f}s speech "
+                f"({stats.speechRatio:.0%}), {stats.speechSegments} speech segments, "
+                f"{rate:.0f} words/min"
+            )
+
+        pronunciation = message.pronunciationAssessment
+        phonemes = pronunciation.phonemeErrorDetails
+        if phonemes:
+            ranked = Counter(
+                (
+                    e.transcribedWord.lower(),
+                    e.expectedWord.lower(),
+                    e.actualPronunciation,
+                    e.expectedPronunciation,
+                )
+                for e in phonemes
+            )
+            digest.categories.append(
+                (
+                    f"Phoneme errors: {len(phonemes)} in {len({k[0] for k in ranked})} words "
+                    f"({_breakdown(Counter(e.errorType for e in phonemes))})",
+                    [
+                        f"- {said}→{meant} {actual} for {expected}" + (f" ×{n}" if n > 1 else "")
+                        for (said, meant, actual, expected), n in ranked.most_common()
+                    ],
+                )
+            )
+
+        # Word stress lists every word; errorType "None" entries are not errors.
+        stress = [e for e in pronunciation.wordStressErrorDetails if e.errorType not in ("", "None")]
+        if stress:
+            ranked = Counter(
+                (
+                    e.word.lower(),
+                    "-".join(e.syllableBreakdown),
+                    e.actualStressedSyllableIndex,
+                    e.expectedStressedSyllableIndex,
+                )
+                for e in stress
+            )
+            digest.categories.append(
+                (
+                    f"Word stress errors: {len(stress)} of "
+                    f"{len(pronunciation.wordStressErrorDetails)} words "
+                    f"({_breakdown(Counter(e.errorType for e in stress))})",
+                    [
+                        f"- {word} ({syllables}): stress on syllable {actual + 1}, "
+                        f"expected {expected + 1}" + (f" ×{n}" if n > 1 else "")
+                        for (word, syllables, actual, expected), n in ranked.most_common()
+                    ],
+                )
+            )
+
+        if pronunciation.HasField("intonationErrorDetails"):
+            intonation = pronunciation.intonationErrorDetails
+            digest.notes.append(
+                f"Intonation: {intonation.actualIntonationType}, expected "
+                f"{intonation.expectedIntonationType}. "
+                + _clip(intonation.errorDescription, MAX_DESCRIPTION_CHARS)
+            )
+
+        missing = [
+            f"{status.stage} ({speaking_pb2.StageOutcome.Name(status.outcome).removeprefix('STAGE_').lower()})"
+            for status in message.stageStatuses
+            if status.outcome != speaking_pb2.STAGE_COMPLETED
+        ]
+        if missing:
+            digest.notes.append(f"Not assessed: {', '.join(missing)}")
+        return digest
+
+    def _summary(self, top: int) -> List[str]:
+        lines = [self.fluency] if self.fluency else []
+        for header, ranked in self.categories:
+            shown = ranked[:top]
+            lines.append(header + (". Most frequent:" if shown else ""))
+            lines.extend(shown)
+        return lines + self.notes
+
+    def _transcript_line(self, max_chars: Optional[int]) -> str:
+        words = self.transcript.split()
+        head = f"Transcript ({len(words)} words): "
+        if max_chars is None or len(head) + len(self.transcript) <= max_chars:
+            return head + self.transcript
+        kept, used = [], len(head) + 20
+        for word in words:
+            used += len(word) + 1
+            if used > max_chars:
+                break
+            kept.append(word)
+        return head + " ".join(kept) + f" … (+{len(words) - len(kept)} words)"
+
+    def render(self, max_tokens: Optional[int] = None) -> str:
+        """The digest as prompt text, at most about `max_tokens` tokens."""
+        top = settings.DIGEST_TOP_ERRORS
+        while True:
+            summary = "\n".join(self._summary(top))
+            if max_tokens is None:
+                return self._transcript_line(None) + "\n" + summary
+            left = max_tokens - estimate_tokens(summary) - 1
+            if left >= MIN_TRANSCRIPT_TOKENS or top == 0:
+                return self._transcript_line(max(left, 0) * CHARS_PER_TOKEN) + "\n" + summary
+            top -= 1
@@ -0,0 +1,58 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from config import client as clients
+from services.grading import Grading, IELTSGradingService
+from utils.logging import log_execution_time
+
+
+class Feedback(BaseModel):
+    score: Grading
+    advice: List[str] = Field(..., min_items=3, max_items=3)  # Exactly 3 items required
+
+
+class FeedbackService:
+    """Band scores and the three advices from one LLM call (LLM_FUSION).
+
+    Grading and advice read the same assessment digest, so asking once saves a
+    round trip and sends the prompt tokens only once.
+    """
+
+    FEEDBACK_PROMPT = (
+        IELTSGradingService.IELTS_GRADING_PROMPT
+        + """
+            In the same answer, also give EXACTLY 3 short pieces of advice to help the
+            speaker improve their pronunciation. Focus on phoneme errors, word stress
+            issues and intonation mistakes, in natural and encouraging language.
+
+            Required Output Schema:
+            {
+                "score": {
+                    "overall": number,
+                    "fluencyCoherence": number,
+                    "lexicalResource": number,
+                    "grammaticalRangeAccuracy": number,
+                    "pronunciation": number
+                },
+                "advice": [string, string, string]
+            }
+            """
+    )
+
+    @staticmethod
+    @log_execution_time
+    async def grade_and_advise(digest: str) -> Feedback:
+        import instructor
+
+        client = instructor.from_groq(clients.groq_client, mode=instructor.Mode.JSON)
+        feedback = await client.chat.completions.create(
+            model="llama-3.3-70b-versatile",
+            messages=[
+                {"role": "system", "content": FeedbackService.FEEDBACK_PROMPT},
+                {"role": "user", "content": digest},
+            ],
+            temperature=0.5,
+            response_model=Feedback,
+        )
+        return feedback
@@ -1,12 +1,8 @@
 import asyncio
-import json
 import base64
-import instructor
-from pydantic import Json
+from pydantic import BaseModel
 import logging
-from openai import AsyncOpenAI, BaseModel, OpenAI
-from config.client import groq_client
-from pydantic import Json
+from config import client as clients
 from utils.logging import log_execution_time
 
 logging.basicConfig(
@@ -26,8 +22,8 @@ class IELTSGradingService:
     IELTS_GRADING_PROMPT = """
             You are an expert IELTS examiner specializing in evaluating IELTS speaking responses. 
             Your task is to assess a given IELTS speaking response based on key criteria and provide a band score. 
-            You will be given a JSON object containing the transcribed response, 
-            pronunciation assessment details, and other error-related information. 
+            You will be given a summary of the assessment: the transcribed response, fluency
+            statistics, and counts and the most frequent examples of each kind of pronunciation error. 
             Your response should follow the IELTS Speaking band score descriptors, providing an accurate and justified band score for each criterion.
             Scoring Criteria
 
@@ -46,13 +42,15 @@ class IELTSGradingService:
 
     @staticmethod
     @log_execution_time
-    async def grading(assessment: Json) -> Grading:
-        client = instructor.from_groq(groq_client, mode=instructor.Mode.JSON)
+    async def grading(digest: str) -> Grading:
+        import instructor
+
+        client = instructor.from_groq(clients.groq_client, mode=instructor.Mode.JSON)
         grading = await client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": IELTSGradingService.IELTS_GRADING_PROMPT},
-                {"role": "user", "content": json.dumps(assessment)},
+                {"role": "user", "content": digest},
             ],
             temperature=0.5,
             response_model=Grading,
@@ -60,6 +58,16 @@ class IELTSGradingService:
         return grading
 
 
+def sample_digest(assessment: dict) -> str:
+    from google.protobuf.json_format import ParseDict
+
+    from grpc_service.speaking_pb2 import SpeakingAssessment
+    from services.digest import AssessmentDigest
+
+    message = ParseDict(assessment, SpeakingAssessment(), ignore_unknown_fields=True)
+    return AssessmentDigest.from_message(message).render()
+
+
 async def main():
     assessment = {
         "speechTranscription": "I rarely like reading English. I find it youthful.",
@@ -216,7 +224,7 @@ async def main():
             "Try to lower your pitch at the end of sentences like 'I rarely like reading English' to convey certainty.",
         ],
     }
-    grading = await IELTSGradingService.grading(assessment)
+    grading = await IELTSGradingService.grading(sample_digest(assessment))
     print(grading.model_dump())
 
 
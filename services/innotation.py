@@ -1,22 +1,23 @@
+from __future__ import annotations
+
 import asyncio
 import logging
 import time
-import instructor
-import librosa
-import numpy as np
 import json
 import time
 import logging
-from config.client import groq_client
+from config import client as clients
+from config import settings
 import re
-from typing import Dict, Literal, Tuple
+from typing import TYPE_CHECKING, Dict, Literal, Optional, Tuple
 from dataclasses import dataclass
 from pydantic import BaseModel, Field
-from scipy.signal import savgol_filter
-from sklearn.preprocessing import StandardScaler
-from config.client import openai_client
+from utils.audio import DecodedAudio, decode_audio
 from utils.logging import log_execution_time
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 @dataclass
 class IntonationAnalysis:
@@ -42,6 +43,9 @@ class IntonationFeedback(BaseModel):
 
 def extract_pitch_faster(y: np.ndarray, sr: int) -> np.ndarray:
     """Trích xuất pitch nhanh hơn bằng `librosa.yin`"""
+    import numpy as np
+    import librosa
+
     # Chia nhỏ tín hiệu âm thanh thành cửa sổ nhỏ hơn
     f0 = librosa.yin(
         y,
@@ -84,6 +88,8 @@ class EnhancedIntonationRules:
     @staticmethod
     def preprocess_pitch(pitch_array: np.ndarray) -> np.ndarray:
         """Tiền xử lý dữ liệu pitch"""
+        import numpy as np
+
         if len(pitch_array) < 3:
             return pitch_array
 
@@ -91,16 +97,21 @@ class EnhancedIntonationRules:
         if len(pitch_cleaned) == 0:
             return np.zeros(1)
 
-        scaler = StandardScaler()
-        pitch_normalized = scaler.fit_transform(pitch_cleaned.reshape(-1, 1)).flatten()
+        # z-score, as sklearn's StandardScaler does (unit scale for zero variance)
+        std = pitch_cleaned.std()
+        pitch_normalized = (pitch_cleaned - pitch_cleaned.mean()) / (std if std > 0 else 1.0)
 
         if len(pitch_normalized) > 5:
+            from scipy.signal import savgol_filter
+
             return savgol_filter(pitch_normalized, 5, 2)
         return pitch_normalized
 
     @staticmethod
     def extract_acoustic_features(pitch_array: np.ndarray) -> Dict[str, float]:
         """Trích xuất đặc trưng âm học"""
+        import numpy as np
+
         pitch_processed = EnhancedIntonationRules.preprocess_pitch(pitch_array)
 
         if len(pitch_processed) < 3:
@@ -272,7 +283,9 @@ class InnotationEvaluationService:
         """
 
         try:
-            client = instructor.from_groq(groq_client, mode = instructor.Mode.JSON)
+            import instructor
+
+            client = instructor.from_groq(clients.groq_client, mode = instructor.Mode.JSON)
             response = await client.chat.completions.create(
                 model="llama-3.2-1b-preview",
                 messages=[{"role": "user", "content": prompt}],
@@ -293,21 +306,37 @@ class InnotationEvaluationService:
 
     @staticmethod
     @log_execution_time
-    async def process_audio(actual_text: str, audio_path: str) -> dict:
+    async def process_audio(
+        actual_text: str, audio_path: str, audio: Optional[DecodedAudio] = None
+    ) -> dict:
         """Xử lý âm thanh, phân tích trọng âm, và đo thời gian từng bước"""
         try:
             logging.info("🔄 Bắt đầu xử lý audio...")
             start_total = time.perf_counter()
 
-            start = time.perf_counter()
-            y, sr = librosa.load(audio_path, sr=None)
-            end = time.perf_counter()
-            logging.info(f"✅ Load audio hoàn thành (⏱️ {end - start:.4f}s)")
+            if settings.ACOUSTIC_BACKEND == "praat":
+                from utils.acoustics import acoustic_tracks
 
-            start = time.perf_counter()
-            f0_cleaned = extract_pitch_faster(y, sr)
-            end = time.perf_counter()
-            logging.info(f"✅ Trích xuất pitch (YIN) hoàn thành (⏱️ {end - start:.4f}s)")
+                # Shared with the word stress stage; unvoiced frames are NaN.
+                start = time.perf_counter()
+                tracks = await asyncio.to_thread(acoustic_tracks, audio_path, audio)
+                f0_cleaned = tracks.voiced_pitch()
+                end = time.perf_counter()
+                logging.info(f"✅ Trích xuất pitch (Praat) hoàn thành (⏱️ {end - start:.4f}s)")
+            else:
+                start = time.perf_counter()
+                if audio is None:
+                    decoded = await asyncio.to_thread(decode_audio, audio_path)
+                    y, sr = decoded.samples, decoded.sample_rate
+                else:
+                    y, sr = audio.samples, audio.sample_rate
+                end = time.perf_counter()
+                logging.info(f"✅ Load audio hoàn thành (⏱️ {end - start:.4f}s)")
+
+                start = time.perf_counter()
+                f0_cleaned = await asyncio.to_thread(extract_pitch_faster, y, sr)
+                end = time.perf_counter()
+                logging.info(f"✅ Trích xuất pitch (YIN) hoàn thành (⏱️ {end - start:.4f}s)")
 
             start = time.perf_counter()
             if not actual_text:
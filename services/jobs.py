@@ -0,0 +1,391 @@
+"""Asynchronous assessment jobs.
+
+Submitted audio is written to JOB_DIR and recorded in a sqlite job table, so
+queued jobs survive a restart and every pre-forked worker sees the same jobs.
+Each server process runs JOB_WORKERS evaluations at a time; workers claim the
+oldest queued job with a single write transaction, so two processes never run
+the same job. A claimed job then waits for a batch-lane slot of the process's
+scheduler under the submitting tenant, behind live requests.
+
+A claim is a lease: the job records its owner (a token unique to the claiming
+process, not a reusable pid) and an expiry that the owner renews every
+JOB_LEASE_SECONDS / 3. Jobs whose lease ran out belong to a process that died;
+they are queued again, or failed once they have been claimed JOB_MAX_ATTEMPTS
+times, so a job that kills its worker is not retried forever.
+
+Store calls block on sqlite's write lock, which another worker process may
+hold, so the runner makes them in a thread, off the event loop.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+from config import settings
+from grpc_service import speaking_pb2
+from grpc_service.speaking_pb2 import AssessmentJob, SpeakingAssessment
+from utils import metrics
+from utils.profiling import profiler
+from utils.scheduler import BATCH, DEFAULT_TENANT, FairScheduler
+from utils.usage import usage_scope
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+TERMINAL = (SUCCEEDED, FAILED)
+
+JOB_STATES = {
+    QUEUED: speaking_pb2.JOB_QUEUED,
+    RUNNING: speaking_pb2.JOB_RUNNING,
+    SUCCEEDED: speaking_pb2.JOB_SUCCEEDED,
+    FAILED: speaking_pb2.JOB_FAILED,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    audio_path TEXT NOT NULL,
+    result BLOB,
+    error TEXT,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    tenant TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_state_created ON jobs (state, created_at);
+"""
+
+# Columns added after the first release: name -> definition
+MIGRATIONS = {
+    "tenant": "TEXT",
+    "lease_until": "REAL",
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+}
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class JobsUnavailable(Exception):
+    pass
+
+
+def owner_token() -> str:
+    """Identifies this process's claims; pids are reused across restarts."""
+    return f"{uuid.uuid4().hex[:12]}-{os.getpid()}"
+
+
+class JobStore:
+    """sqlite-backed job table.
+
+    Methods block (up to the connection timeout while another process holds
+    the write lock); async callers run them with `asyncio.to_thread`.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(
+            path, timeout=10, isolation_level=None, check_same_thread=False
+        )
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        for name, definition in MIGRATIONS.items():
+            if name not in columns:
+                self.conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+        self.lock = threading.Lock()
+
+    def create(self, job_id: str, audio_path: str, tenant: str = DEFAULT_TENANT) -> None:
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO jobs (id, state, audio_path, created_at, tenant)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, audio_path, time.time(), tenant),
+            )
+
+    def get(self, job_id: str) -> Optional[sqlite3.Row]:
+        with self.lock:
+            return self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    def count(self, state: str) -> int:
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = ?", (state,)
+            ).fetchone()[0]
+
+    def claim_next(
+        self, owner: str, lease: float = settings.JOB_LEASE_SECONDS
+    ) -> Optional[sqlite3.Row]:
+        """Lease the oldest queued job to `owner` for `lease` seconds."""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT * FROM jobs WHERE state = ? ORDER BY created_at LIMIT 1",
+                    (QUEUED,),
+                ).fetchone()
+                if row is not None:
+                    now = time.time()
+                    self.conn.execute(
+                        "UPDATE jobs SET state = ?, owner = ?, started_at = ?, lease_until = ?,"
+                        " attempts = attempts + 1 WHERE id = ?",
+                        (RUNNING, owner, now, now + lease, row["id"]),
+                    )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return row
+
+    def renew(self, owner: str, lease: float = settings.JOB_LEASE_SECONDS) -> int:
+        """Extend the leases of `owner`'s running jobs; returns how many."""
+        with self.lock:
+            return self.conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE state = ? AND owner = ?",
+                (time.time() + lease, RUNNING, owner),
+            ).rowcount
+
+    def finish(self, job_id: str, result: Optional[bytes], error: Optional[str]) -> None:
+        with self.lock:
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, result = ?, error = ?, finished_at = ?,"
+                " lease_until = NULL WHERE id = ?",
+                (FAILED if error else SUCCEEDED, result, error, time.time(), job_id),
+            )
+
+    def requeue(self, owner: str) -> int:
+        """Hand `owner`'s running jobs back to the queue (graceful shutdown);
+        the interrupted attempt does not count."""
+        with self.lock:
+            return self.conn.execute(
+                "UPDATE jobs SET state = ?, owner = NULL, started_at = NULL,"
+                " lease_until = NULL, attempts = MAX(attempts - 1, 0)"
+                " WHERE state = ? AND owner = ?",
+                (QUEUED, RUNNING, owner),
+            ).rowcount
+
+    def reclaim_expired(self, max_attempts: int = settings.JOB_MAX_ATTEMPTS) -> Tuple[int, int]:
+        """Requeue running jobs whose lease expired, or fail those already
+        claimed `max_attempts` times. Returns (requeued, failed)."""
+        now = time.time()
+        # Running rows from before leases have none and count as expired.
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                failed = self.conn.execute(
+                    "UPDATE jobs SET state = ?, error = ?, finished_at = ?, lease_until = NULL"
+                    " WHERE state = ? AND COALESCE(lease_until, 0) < ? AND attempts >= ?",
+                    (
+                        FAILED,
+                        f"Worker stopped responding on each of {max_attempts} attempts",
+                        now,
+                        RUNNING,
+                        now,
+                        max_attempts,
+                    ),
+                ).rowcount
+                requeued = self.conn.execute(
+                    "UPDATE jobs SET state = ?, owner = NULL, started_at = NULL,"
+                    " lease_until = NULL WHERE state = ? AND COALESCE(lease_until, 0) < ?",
+                    (QUEUED, RUNNING, now),
+                ).rowcount
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return requeued, failed
+
+    def purge(self, finished_before: float) -> List[str]:
+        """Delete finished jobs older than the cutoff; returns their audio paths."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT audio_path FROM jobs WHERE state IN (?, ?) AND finished_at < ?",
+                (*TERMINAL, finished_before),
+            ).fetchall()
+            self.conn.execute(
+                "DELETE FROM jobs WHERE state IN (?, ?) AND finished_at < ?",
+                (*TERMINAL, finished_before),
+            )
+        return [row["audio_path"] for row in rows]
+
+
+def to_message(row: sqlite3.Row) -> AssessmentJob:
+    job = AssessmentJob(
+        jobId=row["id"],
+        state=JOB_STATES[row["state"]],
+        error=row["error"] or "",
+        createdAt=row["created_at"] or 0.0,
+        startedAt=row["started_at"] or 0.0,
+        finishedAt=row["finished_at"] or 0.0,
+    )
+    if row["result"] is not None:
+        job.result.ParseFromString(row["result"])
+    return job
+
+
+class JobRunner:
+    """Bounded pool of evaluation workers fed from the job store."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        evaluate: Callable[[str], Awaitable[SpeakingAssessment]],
+        scheduler: Optional[FairScheduler] = None,
+        workers: int = settings.JOB_WORKERS,
+        max_queued: int = settings.JOB_MAX_QUEUED,
+        audio_dir: str = settings.JOB_DIR,
+    ):
+        self.store = store
+        self.evaluate = evaluate
+        self.scheduler = scheduler or FairScheduler()
+        self.workers = workers
+        self.max_queued = max_queued
+        self.audio_dir = audio_dir
+        self.accepting = False
+        self.tasks: List[asyncio.Task] = []
+        self.running: set = set()
+        self.owner = owner_token()
+
+    async def start(self) -> None:
+        os.makedirs(self.audio_dir, exist_ok=True)
+        self.wakeup = asyncio.Event()
+        self.changed = asyncio.Condition()
+        await self._reclaim_expired()
+        self.accepting = True
+        self.tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self.tasks.append(asyncio.create_task(self._renew_leases()))
+        self.tasks.append(asyncio.create_task(self._purge_expired()))
+
+    async def _reclaim_expired(self) -> None:
+        requeued, failed = await asyncio.to_thread(self.store.reclaim_expired)
+        if requeued or failed:
+            logging.info(
+                f"Jobs left running by a dead process: {requeued} requeued, {failed} failed"
+            )
+            metrics.increment("jobs.requeued", requeued)
+            metrics.increment(f"jobs.{FAILED}", failed)
+
+    async def _renew_leases(self) -> None:
+        while True:
+            await asyncio.sleep(settings.JOB_LEASE_SECONDS / 3)
+            if self.running:
+                await asyncio.to_thread(self.store.renew, self.owner)
+
+    async def submit(self, audio: bytes, tenant: str = DEFAULT_TENANT) -> str:
+        if not self.accepting:
+            raise JobsUnavailable("Server is not accepting jobs")
+        if await asyncio.to_thread(self.store.count, QUEUED) >= self.max_queued:
+            raise JobQueueFull(f"{self.max_queued} jobs already queued")
+        job_id = uuid.uuid4().hex
+        audio_path = os.path.join(self.audio_dir, f"{job_id}.audio")
+        with open(audio_path, "wb") as f:
+            f.write(audio)
+        await asyncio.to_thread(self.store.create, job_id, audio_path, tenant)
+        self.wakeup.set()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[AssessmentJob]:
+        row = await asyncio.to_thread(self.store.get, job_id)
+        return to_message(row) if row is not None else None
+
+    async def watch(self, job_id: str) -> AsyncIterator[AssessmentJob]:
+        """Yield the job now and on every state change until it is finished.
+
+        Changes made in this process wake watchers at once; jobs run by another
+        worker process are picked up by polling every JOB_POLL_SECONDS.
+        """
+        last_state = None
+        while True:
+            row = await asyncio.to_thread(self.store.get, job_id)
+            if row is None:
+                return
+            if row["state"] != last_state:
+                last_state = row["state"]
+                yield to_message(row)
+            if last_state in TERMINAL:
+                return
+            async with self.changed:
+                try:
+                    await asyncio.wait_for(self.changed.wait(), settings.JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _notify(self) -> None:
+        async with self.changed:
+            self.changed.notify_all()
+
+    async def _work(self) -> None:
+        while self.accepting:
+            row = await asyncio.to_thread(self.store.claim_next, self.owner)
+            if row is None:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), settings.JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            metrics.observe("jobs.queue_wait_seconds", time.time() - row["created_at"])
+            await self._notify()
+            await self._run(row)
+
+    async def _run(self, row: sqlite3.Row) -> None:
+        job_id = row["id"]
+        self.running.add(job_id)
+        result, error = None, None
+        try:
+            async with self.scheduler.slot(row["tenant"] or DEFAULT_TENANT, BATCH):
+                with usage_scope(), profiler.request_scope():
+                    assessment = await self.evaluate(row["audio_path"])
+            result = assessment.SerializeToString()
+        except asyncio.CancelledError:
+            # Shutdown: stop() puts the job back in the queue.
+            raise
+        except Exception as e:
+            logging.exception(f"Job {job_id} failed")
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            self.running.discard(job_id)
+        await asyncio.to_thread(self.store.finish, job_id, result, error)
+        metrics.increment(f"jobs.{FAILED if error else SUCCEEDED}")
+        try:
+            os.remove(row["audio_path"])
+        except OSError:
+            pass
+        await self._notify()
+
+    async def _purge_expired(self) -> None:
+        while True:
+            await self._reclaim_expired()
+            cutoff = time.time() - settings.JOB_RETENTION_SECONDS
+            for path in await asyncio.to_thread(self.store.purge, cutoff):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            await asyncio.sleep(settings.JOB_PURGE_INTERVAL_SECONDS)
+
+    async def stop(self, grace: float) -> None:
+        """Stop claiming jobs, give running ones `grace` seconds, then requeue."""
+        self.accepting = False
+        if not self.tasks:
+            return
+        self.wakeup.set()
+        deadline = time.monotonic() + grace
+        while self.running and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        requeued = await asyncio.to_thread(self.store.requeue, self.owner)
+        if requeued:
+            logging.info(f"Requeued {requeued} unfinished jobs for the next start")
@@ -1,12 +1,13 @@
-from typing import Iterable, Literal, Optional
+import asyncio
+from functools import lru_cache
+from typing import Iterable, Literal, Optional, Tuple
 from utils.logging import log_execution_time as an_yeu_lananh
-import instructor
-from openai import AsyncOpenAI
 from pydantic import BaseModel, Field
 import json
-import eng_to_ipa as ipa
-from config.settings import OPENAI_API_KEY
+from config import client as clients
+from config import settings
 from utils.phoneme import update_transcription_error_indices
+from utils.transcript import TranscriptIndex
 
 class PhonemeErrorDetail(BaseModel):
     transcribedWord: str
@@ -27,9 +28,20 @@ class PronunciationAnalysisResponse(BaseModel):
     expectedPhoneticTranscription: str
     phonemeErrorDetails: list[PhonemeErrorDetail]
 
+class FusedPronunciationResponse(BaseModel):
+    expectedText: str
+    phonemeErrorDetails: list[PhonemeErrorDetail]
+
 class PronunciationEvaluationService:
-    client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-    instructor_client = instructor.from_openai(client, mode=instructor.Mode.JSON)
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def instructor_client():
+        import instructor
+
+        return instructor.from_openai(
+            clients.openai_api_client, mode=instructor.Mode.JSON
+        )
+
     def __init__(self):
         pass    
     PREDICTION_PROMPT = (
@@ -136,7 +148,7 @@ class PronunciationEvaluationService:
     @staticmethod
     async def predict_intended_word(actual_text: str, actual_ipa: str) -> str:
         """Predicts the intended words based on phonetic transcription and logical context."""
-        response = await PronunciationEvaluationService.instructor_client.chat.completions.create(
+        response = await PronunciationEvaluationService.instructor_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {
@@ -183,7 +195,7 @@ class PronunciationEvaluationService:
         result["actualPhoneticTranscription"] = actual_ipa
         result["expectedPhoneticTranscription"] = expected_ipa
         
-        response = await PronunciationEvaluationService.instructor_client.chat.completions.create(
+        response = await PronunciationEvaluationService.instructor_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {
@@ -198,23 +210,152 @@ class PronunciationEvaluationService:
         return response
 
 
+    FUSED_PROMPT = """
+        You are a phonetic analysis expert. You are given what a learner actually said (text and IPA).
+        In ONE answer:
+        1. Predict the sentence the speaker intended, accounting for mispronunciations and the logical
+           context of the sentence (e.g. /ˈrɛrli/ 'rarely' -> 'really', /ˈjuθfəl/ 'youthful' -> 'useful').
+           Keep it grammatically and contextually meaningful.
+        2. Compare the actual pronunciation with the expected pronunciation of that sentence and list
+           every pronunciation error, following the schema exactly.
+
+        Required Output Schema:
+        {
+            "expectedText": string,
+            "phonemeErrorDetails": [{
+                "transcribedWord": string,
+                "expectedWord": string,
+                "expectedPronunciation": string,
+                "actualPronunciation": string,
+                "errorType": "substitution" | "omission",
+                "errorStartIndexWord": number,
+                "errorEndIndexWord": number,
+                "errorStartIndexTranscription": null,
+                "errorEndIndexTranscription": null,
+                "substituted": string,
+                "errorDescription": string,
+                "improvementAdvice": string
+            }]
+        }
+
+        Guidelines:
+        1. errorStartIndexWord and errorEndIndexWord are phoneme positions inside the word
+        2. **Provide only ONE sentence for improvementAdvice**
+        3. Description should use IPA notation with forward slashes
+        4. Return an empty phonemeErrorDetails list when the speaker said what they meant
+
+        EXAMPLE:
+        Input:
+        Actual Text: I rarely like reading English. I find it youthful.
+        Actual IPA: aɪ ˈrɛrli laɪk ˈrɛdɪŋ ˈɪŋlɪʃ. aɪ faɪnd ɪt ˈjuθfəl.
+        Output:
+        {
+            "expectedText": "I really like reading English. I find it useful.",
+            "phonemeErrorDetails": [{
+                "transcribedWord": "rarely",
+                "expectedWord": "really",
+                "expectedPronunciation": "/ˈrɪli/",
+                "actualPronunciation": "/ˈrɛrli/",
+                "errorType": "substitution",
+                "errorStartIndexWord": 1,
+                "errorEndIndexWord": 2,
+                "errorStartIndexTranscription": null,
+                "errorEndIndexTranscription": null,
+                "substituted": "ɛr",
+                "errorDescription": "The /ɪ/ sound was substituted with /ɛr/.",
+                "improvementAdvice": "Relax the tongue and raise it slightly towards the front of the mouth."
+            }]
+        }
+    """
+
     @an_yeu_lananh
     @staticmethod
-    async def pronunciation_assessment(actual_text: str) -> PronunciationAnalysisResponse:
-        """Analyzes pronunciation by detecting errors in phonetic transcription."""
+    async def analyze_pronunciation(actual_text: str, actual_ipa: str) -> FusedPronunciationResponse:
+        """predict_intended_word and compare_phonemes in a single round trip (LLM_FUSION)."""
+        response = await PronunciationEvaluationService.instructor_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": PronunciationEvaluationService.FUSED_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Actual Text: {actual_text}\nActual IPA: {actual_ipa}",
+                },
+            ],
+            response_model=FusedPronunciationResponse,
+            temperature=0,
+        )
+        return response
+
+    @staticmethod
+    async def analyze_group(
+        actual_text: str, index: TranscriptIndex
+    ) -> Tuple[str, str, list[PhonemeErrorDetail]]:
+        """(actual IPA, expected IPA, errors) of one stretch of the transcript;
+        error offsets are relative to `actual_text`."""
+        import eng_to_ipa as ipa
+
         actualPhoneticTranscription = ipa.convert(actual_text)
-        expected_text = await PronunciationEvaluationService.predict_intended_word(actual_text, actualPhoneticTranscription)
-        expectedPhoneticTranscription = ipa.convert(expected_text)
+        if settings.LLM_FUSION:
+            fused = await PronunciationEvaluationService.analyze_pronunciation(
+                actual_text, actualPhoneticTranscription
+            )
+            expected_text, phoneme_errors = fused.expectedText, fused.phonemeErrorDetails
+            expectedPhoneticTranscription = ipa.convert(expected_text)
+        else:
+            expected_text = await PronunciationEvaluationService.predict_intended_word(actual_text, actualPhoneticTranscription)
+            expectedPhoneticTranscription = ipa.convert(expected_text)
 
-        phoneme_errors = await PronunciationEvaluationService.compare_phonemes(
-            actual_text, expected_text, actualPhoneticTranscription, expectedPhoneticTranscription
-        )
-        phoneme_errors = update_transcription_error_indices(actual_text, phoneme_errors)
+            phoneme_errors = await PronunciationEvaluationService.compare_phonemes(
+                actual_text, expected_text, actualPhoneticTranscription, expectedPhoneticTranscription
+            )
+        phoneme_errors = update_transcription_error_indices(index, phoneme_errors)
+        return actualPhoneticTranscription, expectedPhoneticTranscription, phoneme_errors
+
+    @an_yeu_lananh
+    @staticmethod
+    async def pronunciation_assessment(
+        actual_text: str, index: Optional[TranscriptIndex] = None
+    ) -> PronunciationAnalysisResponse:
+        """Analyzes pronunciation by detecting errors in phonetic transcription.
+
+        Long transcripts are split into groups of whole sentences of about
+        PRONUNCIATION_GROUP_WORDS words, analysed concurrently (at most
+        PRONUNCIATION_CONCURRENCY at once) so latency stays close to that of
+        a short answer; error offsets are mapped back onto the full transcript.
+        """
+        index = index or TranscriptIndex.build(actual_text)
+        groups = index.sentence_groups(settings.PRONUNCIATION_GROUP_WORDS)
+        if len(groups) == 1:
+            actual_ipa, expected_ipa, phoneme_errors = (
+                await PronunciationEvaluationService.analyze_group(actual_text, index)
+            )
+            return PronunciationAnalysisResponse(
+                actualPhoneticTranscription=actual_ipa,
+                expectedPhoneticTranscription=expected_ipa,
+                phonemeErrorDetails=phoneme_errors,
+            )
+
+        semaphore = asyncio.Semaphore(max(settings.PRONUNCIATION_CONCURRENCY, 1))
+
+        async def analyze(start: int, end: int):
+            segment = actual_text[start:end]
+            text = segment.strip()
+            offset = start + len(segment) - len(segment.lstrip())
+            async with semaphore:
+                result = await PronunciationEvaluationService.analyze_group(
+                    text, TranscriptIndex.build(text)
+                )
+            for error in result[2]:
+                if error.errorStartIndexTranscription >= 0:
+                    error.errorStartIndexTranscription += offset
+                    error.errorEndIndexTranscription += offset
+            return result
 
+        results = await asyncio.gather(*(analyze(start, end) for start, end in groups))
         return PronunciationAnalysisResponse(
-            actualPhoneticTranscription=actualPhoneticTranscription,
-            expectedPhoneticTranscription=expectedPhoneticTranscription,
-            phonemeErrorDetails=phoneme_errors
+            actualPhoneticTranscription=" ".join(actual for actual, _, _ in results),
+            expectedPhoneticTranscription=" ".join(expected for _, expected, _ in results),
+            phonemeErrorDetails=[error for _, _, errors in results for error in errors],
         )
 
 
@@ -223,5 +364,4 @@ if __name__ == "__main__":
     async def main():
         result = await PronunciationEvaluationService.pronunciation_assessment(actual_text)
         print(json.dumps(result.model_dump(), indent = 4, ensure_ascii= True))
-    import asyncio
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import List, Literal, Optional, Tuple
+
+from pydantic import BaseModel
+
+from config import settings
+from utils.audio import DecodedAudio, decode_audio
+from utils.logging import log_execution_time
+
+RejectionReason = Literal["undecodable", "too_short", "no_speech", "too_little_speech"]
+
+# Samples at or above this magnitude count as clipped.
+CLIP_LEVEL = 0.99
+
+
+class AudioStats(BaseModel):
+    durationSeconds: float
+    speechSeconds: float
+    speechRatio: float
+    speechSegments: int
+    leadingSilenceSeconds: float
+    trailingSilenceSeconds: float
+    clippingRatio: float
+
+
+@dataclass
+class PreflightResult:
+    stats: Optional[AudioStats] = None
+    rejectionReason: Optional[RejectionReason] = None
+    # Leading/trailing silence removed; `offset` maps back to Whisper times.
+    audio: Optional[DecodedAudio] = None
+    segments: List[Tuple[float, float]] = field(default_factory=list)
+
+
+class PreflightService:
+    """Cheap local gate that runs right after decode, before any upstream call."""
+
+    @staticmethod
+    @log_execution_time
+    async def check(audio_path: str) -> PreflightResult:
+        # Decode and VAD run off the event loop so a cancelled request can
+        # walk away from them.
+        return await asyncio.to_thread(PreflightService.analyze, audio_path)
+
+    @staticmethod
+    def analyze(audio_path: str) -> PreflightResult:
+        import numpy as np
+
+        from utils.vad import detect_speech
+
+        try:
+            decoded = decode_audio(audio_path)
+        except Exception as e:
+            logging.error(f"Could not decode {audio_path}: {e}")
+            return PreflightResult(rejectionReason="undecodable")
+
+        duration = decoded.duration
+        segments = detect_speech(decoded.samples, decoded.sample_rate) if duration else []
+        speech = sum(end - start for start, end in segments)
+        stats = AudioStats(
+            durationSeconds=round(duration, 3),
+            speechSeconds=round(speech, 3),
+            speechRatio=round(speech / duration, 3) if duration else 0.0,
+            speechSegments=len(segments),
+            leadingSilenceSeconds=segments[0][0] if segments else round(duration, 3),
+            trailingSilenceSeconds=round(duration - segments[-1][1], 3) if segments else 0.0,
+            clippingRatio=round(
+                float(np.mean(np.abs(decoded.samples) >= CLIP_LEVEL)) if duration else 0.0, 4
+            ),
+        )
+        result = PreflightResult(stats=stats, segments=segments)
+
+        if duration < settings.PREFLIGHT_MIN_DURATION_SECONDS:
+            result.rejectionReason = "too_short"
+        elif not segments:
+            result.rejectionReason = "no_speech"
+        elif speech < settings.PREFLIGHT_MIN_SPEECH_SECONDS:
+            result.rejectionReason = "too_little_speech"
+        else:
+            pad = settings.VAD_PADDING_SECONDS
+            result.audio = decoded.slice(segments[0][0] - pad, segments[-1][1] + pad)
+
+        logging.info(f"Preflight: {stats.model_dump()} rejection={result.rejectionReason}")
+        return result
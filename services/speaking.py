@@ -1,17 +1,85 @@
 import asyncio
 import logging
-import json
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from config import settings
+from grpc_service import speaking_pb2
+from grpc_service.speaking_pb2 import SpeakingAssessment
 from services.advice import AdviceSummarizerService
+from services.assessment import AssessmentBuilder
+from services.digest import AssessmentDigest
+from services.feedback import Feedback, FeedbackService
 from services.phoneme import PronunciationEvaluationService
-from services.transcribe import AudioProcessor
+from services.preflight import PreflightResult, PreflightService
+from services.transcribe import AudioProcessor, Transcript
 from services.grading import IELTSGradingService
 from services.wordstress import (
     WordstressEvaluationService,
 )
 from services.innotation import InnotationEvaluationService
-from typing import Any, Dict
+from utils import metrics
+from utils.deadline import DeadlineExceeded, remaining
+from utils.transcript import TranscriptIndex
 from utils.logging import log_execution_time
 
+ANALYSIS_STAGES = ("pronunciation", "word_stress", "intonation")
+
+
+def feedback_stages() -> tuple:
+    return ("feedback",) if settings.LLM_FUSION else ("grading", "advice")
+
+
+def stage_budget(stage: str) -> Optional[float]:
+    """Seconds `stage` may run: its STAGE_BUDGETS entry, cut to what is left
+    of the request deadline. None means no limit."""
+    budget = settings.STAGE_BUDGETS.get(stage) or None
+    left = remaining()
+    if left is not None:
+        budget = max(min(budget or left, left), 0.0)
+    return budget
+
+
+async def run_stage(
+    result: AssessmentBuilder,
+    stage: str,
+    work: Awaitable,
+    setter: Callable[[Any], None],
+) -> Any:
+    """Run one stage under its budget and record how it ended.
+
+    A stage that times out, fails, or whose result the setter rejects leaves
+    its section of the response empty and returns None; the others go on.
+    """
+    budget = stage_budget(stage)
+    start = time.monotonic()
+    detail = ""
+    try:
+        value = await asyncio.wait_for(work, budget)
+        setter(value)
+        outcome = speaking_pb2.STAGE_COMPLETED
+    except asyncio.TimeoutError:
+        value, outcome = None, speaking_pb2.STAGE_TIMED_OUT
+        # Without a budget the timeout came from inside the stage.
+        detail = f"over its {budget:.3g}s budget" if budget is not None else "timed out"
+    except DeadlineExceeded as e:
+        value, outcome, detail = None, speaking_pb2.STAGE_SKIPPED, str(e)
+    except Exception as e:
+        value, outcome, detail = None, speaking_pb2.STAGE_FAILED, f"{type(e).__name__}: {e}"
+    seconds = time.monotonic() - start
+    result.set_stage_status(stage, outcome, round(seconds, 3), detail)
+    name = speaking_pb2.StageOutcome.Name(outcome).removeprefix("STAGE_").lower()
+    metrics.increment(f"stage.{stage}.{name}")
+    if outcome != speaking_pb2.STAGE_COMPLETED:
+        logging.warning(f"Stage {stage} {name} after {seconds:.2f}s: {detail}")
+    return value
+
+
+def skip_stages(result: AssessmentBuilder, stages, reason: str) -> None:
+    for stage in stages:
+        result.set_stage_status(stage, speaking_pb2.STAGE_SKIPPED, 0.0, reason)
+        metrics.increment(f"stage.{stage}.skipped")
+
 
 class SpeakingEvaluationService:
     def __init__(self):
@@ -19,63 +87,110 @@ class SpeakingEvaluationService:
 
     @staticmethod
     @log_execution_time
-    async def evaluate(audio_path: str) -> Dict[str, Any]:
+    async def evaluate(audio_path: str) -> SpeakingAssessment:
         logging.basicConfig(level=logging.INFO)
         logging.info("Starting speech evaluation")
 
-        speaking_evaluation = {}
+        result = AssessmentBuilder()
 
-        try:
-            audio_transcription = await AudioProcessor.transcribe(audio_path)
-            logging.info("Transcription completed successfully")
-            logging.info(audio_transcription.transcription)
-            speaking_evaluation["speechTranscription"] = (
-                audio_transcription.transcription
-            )
-            (
-                pronunciationAssessment,
-                wordstressAssessment,
-                intonationAssessment,
-            ) = await asyncio.gather(
+        # Without preflight the later stages decode the file themselves.
+        preflight = await run_stage(
+            result, "preflight", PreflightService.check(audio_path), lambda _: None
+        ) or PreflightResult()
+        if preflight.stats is not None:
+            result.set_audio_stats(preflight.stats)
+        if preflight.rejectionReason:
+            logging.info(f"Skipping evaluation: {preflight.rejectionReason}")
+            result.set_rejection(preflight.rejectionReason)
+            return result.message
+
+        def set_transcription(transcript: Transcript) -> None:
+            if not transcript.transcription:
+                raise ValueError("ASR returned no text")
+            result.set_transcription(transcript.transcription)
+
+        audio_transcription = await run_stage(
+            result,
+            "transcription",
+            AudioProcessor.transcribe(audio_path, preflight.audio, preflight.segments),
+            set_transcription,
+        )
+        if audio_transcription is None:
+            skip_stages(result, ANALYSIS_STAGES + feedback_stages(), "no transcription")
+            return result.message
+        logging.info("Transcription completed successfully")
+        logging.info(audio_transcription.transcription)
+        index = TranscriptIndex.build(
+            audio_transcription.transcription, audio_transcription.words
+        )
+        await asyncio.gather(
+            run_stage(
+                result,
+                "pronunciation",
                 PronunciationEvaluationService.pronunciation_assessment(
-                    audio_transcription.transcription
+                    audio_transcription.transcription, index
                 ),
+                result.set_pronunciation,
+            ),
+            run_stage(
+                result,
+                "word_stress",
                 WordstressEvaluationService.evaluate_stress(
-                    audio_transcription, audio_path
+                    audio_transcription, audio_path, preflight.audio, index
                 ),
+                result.set_word_stress,
+            ),
+            run_stage(
+                result,
+                "intonation",
                 InnotationEvaluationService.process_audio(
-                    audio_transcription.transcription, audio_path
+                    audio_transcription.transcription, audio_path, preflight.audio
                 ),
-            )
-            speaking_evaluation["pronunciationAssessment"] = pronunciationAssessment.model_dump()
-            speaking_evaluation["pronunciationAssessment"]["wordStressErrorDetails"] = (
-                wordstressAssessment
-            )
-            speaking_evaluation["pronunciationAssessment"]["intonationErrorDetails"] = (
-                intonationAssessment
-            )
-            (score, overallAdvices) = await asyncio.gather(
-                IELTSGradingService.grading(speaking_evaluation.copy()),
-                AdviceSummarizerService.summarize(speaking_evaluation.copy()),
-            )
+                result.set_intonation,
+            ),
+        )
+        # Grading and advice see a digest of the sections that made it in.
+        digest = AssessmentDigest.from_message(result.message)
+        if settings.LLM_FUSION:
 
-            speaking_evaluation["overallAdvices"] = overallAdvices
-            speaking_evaluation["score"] = score.model_dump()
+            def set_feedback(feedback: Feedback) -> None:
+                result.set_score(feedback.score)
+                result.set_advices(feedback.advice)
 
-            logging.info("Evaluation completed successfully")
-            print(json.dumps(speaking_evaluation, indent=4, ensure_ascii=False))
-            return speaking_evaluation
+            await run_stage(
+                result, "feedback", FeedbackService.grade_and_advise(
+                    digest.render(settings.DIGEST_GRADING_MAX_TOKENS)
+                ), set_feedback
+            )
+        else:
+            await asyncio.gather(
+                run_stage(
+                    result, "grading", IELTSGradingService.grading(
+                        digest.render(settings.DIGEST_GRADING_MAX_TOKENS)
+                    ), result.set_score
+                ),
+                run_stage(
+                    result, "advice", AdviceSummarizerService.summarize(
+                        digest.render(settings.DIGEST_ADVICE_MAX_TOKENS)
+                    ), result.set_advices
+                ),
+            )
 
-        except Exception as e:
-            logging.error(f"Error in speech evaluation: {e}")
-            return speaking_evaluation
+        logging.info(
+            "Evaluation completed" + (" with partial results" if result.message.partial else "")
+        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(result.debug_json())
+        return result.message
 
 
 if __name__ == "__main__":
     audio_path = "/home/xuananle/Documents/Linglooma/Linglooma-core/resources/audio/recorded_audio.mp3"
 
     async def main():
+        from google.protobuf.json_format import MessageToJson
+
         result = await SpeakingEvaluationService.evaluate(audio_path)
-        print(json.dumps(result, indent=4, ensure_ascii=False))
+        print(MessageToJson(result, indent=4, ensure_ascii=False))
 
     asyncio.run(main())
@@ -1,11 +1,18 @@
-from nltk.corpus import cmudict
-import pyphen
+from functools import lru_cache
 
-cmu_dict = cmudict.dict()
-dic = pyphen.Pyphen(lang="en")
+from utils.stress import get_cmu_dict
+
+
+@lru_cache(maxsize=None)
+def get_pyphen():
+    import pyphen
+
+    return pyphen.Pyphen(lang="en")
 
 
 def get_stress_index(word: str):
+    cmu_dict = get_cmu_dict()
+    dic = get_pyphen()
     if word.lower() not in cmu_dict:
         return f"'{word}' không có trong từ điển CMU."
 
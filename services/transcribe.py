@@ -1,11 +1,17 @@
 import asyncio
 import os
-from fireworks.client.audio import AudioInference
-from openai import AsyncOpenAI, BaseModel
+import time
+from pydantic import BaseModel
 import logging
-from config.settings import FIREWORKS_API_KEY, OPENAI_API_KEY
+from config import settings
+from services.asr import ASRRouter
+from utils import metrics
+from utils.audio import DecodedAudio
+from utils.chunking import Chunk, plan_chunks, stitch
 from utils.logging import log_execution_time
-from typing import List
+from utils.transcript import WordTimings
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
 
 
 class WordTimeStamp(BaseModel):
@@ -23,59 +29,187 @@ class AudioTranscription(BaseModel):
     word_timestamps: WordTimeStampList
 
 
+@dataclass
+class Transcript:
+    """What the pipeline passes around after ASR; `AudioTranscription` is the
+    pydantic form, kept for JSON output only."""
+
+    transcription: str
+    words: WordTimings = field(default_factory=WordTimings)
+
+    def to_model(self) -> AudioTranscription:
+        return AudioTranscription(
+            transcription=self.transcription,
+            word_timestamps=WordTimeStampList(
+                words=[
+                    WordTimeStamp(word=word, start=start, end=end)
+                    for word, start, end in self.words
+                ]
+            ),
+        )
+
+    @classmethod
+    def from_model(cls, model: AudioTranscription) -> "Transcript":
+        return cls(
+            transcription=model.transcription,
+            words=WordTimings.from_rows(
+                (w.word, w.start, w.end) for w in model.word_timestamps.words
+            ),
+        )
+
+
 class AudioProcessor:
-    client = AudioInference(
-        model="whisper-v3",
-        base_url="https://audio-prod.us-virginia-1.direct.fireworks.ai",
-        api_key=FIREWORKS_API_KEY,
-        vad_model="whisperx-pyannet",
-        alignment_model="tdnn_ffn",
-    )
+    @staticmethod
+    def prepare_upload(
+        file_path: str, audio: Optional[DecodedAudio]
+    ) -> Tuple[Union[Tuple[str, bytes], None], float]:
+        """Re-encode decoded PCM to a compact codec when it is worth it.
+
+        Returns ((filename, payload), time offset of the payload) or
+        (None, 0.0) to upload the original file as-is.
+        """
+        original_size = os.path.getsize(file_path)
+        if (
+            audio is None
+            or not settings.UPLOAD_TRANSCODE
+            or original_size < settings.UPLOAD_TRANSCODE_MIN_BYTES
+        ):
+            return None, 0.0
+
+        from utils.transcode import encode_for_upload
+
+        try:
+            payload, filename, encode_seconds = encode_for_upload(
+                audio, settings.UPLOAD_CODEC
+            )
+        except Exception as e:
+            logging.warning(f"Upload transcoding failed, sending original: {e}")
+            return None, 0.0
+        if len(payload) >= original_size:
+            return None, 0.0
+
+        saved = original_size - len(payload)
+        metrics.increment("asr.transcoded_uploads")
+        metrics.increment("asr.bytes_saved", saved)
+        metrics.observe("asr.transcode_seconds", encode_seconds)
+        logging.info(
+            f"Transcoded upload {original_size} -> {len(payload)} bytes "
+            f"({saved / original_size:.0%} saved) in {encode_seconds:.3f}s"
+        )
+        return (filename, payload), audio.offset
 
     @staticmethod
-    @log_execution_time
-    async def transcribe(file_path: str) -> AudioTranscription:
-        openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    async def request_words(
+        upload: Tuple[str, bytes], kind: str, offset: float = 0.0
+    ) -> Tuple[str, WordTimings]:
+        """One routed ASR call; word times are shifted by `offset`."""
+        start = time.perf_counter()
+        result = await ASRRouter.transcribe(*upload)
+        # Compare these to see the upload-time delta.
+        metrics.observe(f"asr.request_seconds.{kind}", time.perf_counter() - start)
 
-        if not os.path.isfile(file_path):
-            raise FileNotFoundError(f"Audio file not found: {file_path}")
+        return result.text, WordTimings.from_rows(result.words, offset)
 
-        try:
-            with open(file_path, "rb") as audio_file:
-                response = await openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    timestamp_granularities=["word"],
-                    response_format="verbose_json",
-                    prompt="The Language in the conversation is in English",
-                )
+    @staticmethod
+    def plan_long_audio(
+        audio: Optional[DecodedAudio], segments: List[Tuple[float, float]]
+    ) -> List[Chunk]:
+        """Chunks for the concurrent long-audio mode, or [] to send one request."""
+        if (
+            audio is None
+            or not segments
+            or settings.LONG_AUDIO_MIN_SECONDS <= 0
+            or audio.duration < settings.LONG_AUDIO_MIN_SECONDS
+        ):
+            return []
+        chunks = plan_chunks(
+            segments,
+            audio.offset,
+            audio.offset + audio.duration,
+            settings.ASR_CHUNK_TARGET_SECONDS,
+            settings.ASR_CHUNK_OVERLAP_SECONDS,
+        )
+        return chunks if len(chunks) > 1 else []
 
-            transcript_text = response.text
-            word_timestamps = [
-                WordTimeStamp(
-                    word=word_info.model_dump().get("word", ""),
-                    start=round(word_info.model_dump().get("start", 0.0), 3),
-                    end=round(word_info.model_dump().get("end", 0.0), 3),
+    @staticmethod
+    async def transcribe_chunks(
+        audio: DecodedAudio, chunks: List[Chunk]
+    ) -> Transcript:
+        """Transcribe chunks concurrently and stitch them on the original timeline."""
+        from utils.transcode import encode_for_upload
+
+        semaphore = asyncio.Semaphore(max(1, settings.ASR_CHUNK_CONCURRENCY))
+
+        async def transcribe_chunk(chunk: Chunk):
+            piece = audio.slice(chunk.start - audio.offset, chunk.end - audio.offset)
+            payload, filename, encode_seconds = await asyncio.to_thread(
+                encode_for_upload, piece, settings.UPLOAD_CODEC
+            )
+            metrics.observe("asr.transcode_seconds", encode_seconds)
+            metrics.increment("asr.upload_bytes", len(payload))
+            async with semaphore:
+                text, words = await AudioProcessor.request_words(
+                    (filename, payload), "chunked", piece.offset
                 )
-                for word_info in response.words
-            ]
+            return chunk, text, words
+
+        results = await asyncio.gather(*(transcribe_chunk(c) for c in chunks))
+        metrics.increment("asr.chunked_requests")
+        metrics.increment("asr.chunks", len(chunks))
+        transcript_text, words = stitch(results)
+        logging.info(
+            f"Transcribed {audio.duration:.1f}s in {len(chunks)} chunks "
+            f"cut at {[round(float(c.keep_until), 2) for c in chunks[:-1]]}"
+        )
+        return Transcript(transcription=transcript_text, words=words)
 
-            return AudioTranscription(
-                transcription=transcript_text,
-                word_timestamps=WordTimeStampList(words=word_timestamps),
+    @staticmethod
+    @log_execution_time
+    async def transcribe(
+        file_path: str,
+        audio: Optional[DecodedAudio] = None,
+        segments: Optional[List[Tuple[float, float]]] = None,
+    ) -> Transcript:
+        """Transcribe with word timestamps on the original recording's timeline.
+
+        `audio` is the decoded (possibly trimmed) PCM from preflight; when
+        given, the upload may be re-encoded from it instead of sending the file.
+        With the preflight speech `segments` as well, recordings longer than
+        LONG_AUDIO_MIN_SECONDS are split at pauses and sent as parallel requests.
+        """
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"Audio file not found: {file_path}")
+
+        chunks = AudioProcessor.plan_long_audio(audio, segments or [])
+        if chunks:
+            try:
+                return await AudioProcessor.transcribe_chunks(audio, chunks)
+            except Exception as e:
+                logging.warning(f"Chunked transcription failed, sending one request: {e}")
+
+        try:
+            upload, offset = await asyncio.to_thread(
+                AudioProcessor.prepare_upload, file_path, audio
+            )
+            kind = "transcoded" if upload else "original"
+            if upload is None:
+                with open(file_path, "rb") as audio_file:
+                    upload = (os.path.basename(file_path), audio_file.read())
+            metrics.increment("asr.upload_bytes", len(upload[1]))
+            transcript_text, words = await AudioProcessor.request_words(
+                upload, kind, offset
             )
+            return Transcript(transcription=transcript_text, words=words)
         except Exception as e:
             logging.error(f"Error in transcribing audio: {e}")
-            return AudioTranscription(
-                transcription="", word_timestamps=WordTimeStampList(words=[])
-            )
+            return Transcript(transcription="")
 
 
 async def main():
     result = await AudioProcessor.transcribe(
         "/home/xuananle/Documents/Linglooma/Linglooma-core/resources/audio/recorded_audio.mp3"
     )
-    print(result.model_dump_json(indent=4))
+    print(result.to_model().model_dump_json(indent=4))
 
 
 if __name__ == "__main__":
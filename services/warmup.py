@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import os
+import tempfile
+
+from config import client as clients
+from config import settings
+from services.innotation import InnotationEvaluationService, extract_pitch_faster
+from services.preflight import PreflightService
+from services.transcribe import Transcript
+from services.wordstress import WordstressEvaluationService
+from utils.logging import log_execution_time
+from utils.stress import get_cmu_dict
+from utils.transcript import WordTimings
+
+WARMUP_TEXT = "I really like reading English because I find it useful."
+
+
+class WarmupService:
+    """Pays first-request costs before the server reports SERVING.
+
+    Numba JIT in librosa's `yin`/`piptrack`, the cmudict lexicon, the
+    eng_to_ipa database, the SDK clients and the ffmpeg decoder workers are
+    all loaded lazily on first use; the upstream clients open their TLS connections on first request.
+    """
+
+    @staticmethod
+    @log_execution_time
+    async def warmup_local_stages() -> None:
+        import eng_to_ipa as ipa
+        import instructor  # noqa: F401
+
+        from services.phoneme import PronunciationEvaluationService
+        from utils.synthetic import synthesize_speech_like
+
+        PronunciationEvaluationService.instructor_client()
+        clients.groq_client
+        if "fireworks" in settings.ASR_BACKENDS:
+            clients.fireworks_audio_client
+        words = WARMUP_TEXT.rstrip(".").split()
+        step = 2.5 / len(words)
+        transcription = Transcript(
+            transcription=WARMUP_TEXT,
+            words=WordTimings.from_rows(
+                (w, i * step + 0.3, (i + 1) * step + 0.3) for i, w in enumerate(words)
+            ),
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = synthesize_speech_like(os.path.join(tmpdir, "warmup.wav"), 3.0)
+            preflight = await PreflightService.check(path)
+            await WordstressEvaluationService.evaluate_stress(
+                transcription, path, preflight.audio
+            )
+            f0 = extract_pitch_faster(preflight.audio.samples, preflight.audio.sample_rate)
+            InnotationEvaluationService.analyze_intonation(WARMUP_TEXT, f0)
+        ipa.convert(WARMUP_TEXT)
+        logging.info(f"Warmed up local stages ({len(get_cmu_dict())} cmudict entries)")
+
+    @staticmethod
+    @log_execution_time
+    async def warmup_connections() -> None:
+        """Open the upstream TLS connections with cheap model-list calls."""
+        results = await asyncio.gather(
+            asyncio.wait_for(clients.openai_api_client.models.list(), timeout=5),
+            asyncio.wait_for(clients.groq_client.models.list(), timeout=5),
+            return_exceptions=True,
+        )
+        for name, result in zip(("openai", "groq"), results):
+            if isinstance(result, BaseException):
+                logging.warning(f"Could not warm up {name} connection: {result!r}")
+
+    @staticmethod
+    async def run() -> None:
+        from utils.decoder import ffmpeg_pool
+
+        await WarmupService.warmup_local_stages()
+        # Per worker, not in the supervisor's preload: forked workers must not
+        # share ffmpeg processes (and their pipes) started before the fork.
+        ffmpeg_pool().warm()
+        # Replayed cassettes never touch the network.
+        if settings.WARMUP_CONNECTIONS and settings.CASSETTE_MODE != "replay":
+            await WarmupService.warmup_connections()
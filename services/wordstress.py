@@ -1,14 +1,15 @@
+import asyncio
 import json
 import time
 import logging
-from typing import List, Literal, Dict, Any
-import numpy as np
-import librosa
-import librosa.display
+from typing import List, Literal, Dict, Any, Optional
 from pydantic import BaseModel
-from services.transcribe import AudioProcessor, AudioTranscription
+from config import settings
+from services.transcribe import AudioProcessor, Transcript
+from utils.audio import DecodedAudio, decode_audio
 from utils.logging import log_execution_time
-from utils.stress import WORD_DATABASE
+from utils.stress import lookup_stress
+from utils.transcript import TranscriptIndex, WordTimings
 
 logging.basicConfig(level=logging.INFO)
 
@@ -36,21 +37,97 @@ class StressErrorList(BaseModel):
     errors: List[StressError]
 
 
-def extract_pitch(audio_path):
-    """ Extract pitch from the audio file. """
-    start_time = time.time()
+# piptrack framing (librosa defaults)
+PITCH_N_FFT = 2048
+PITCH_HOP = 512
+
+
+def _file_reader(audio_path):
+    """(read(start, stop) -> mono float32, total samples, sample rate) for a
+    file soundfile can seek in, or None."""
+    import soundfile as sf
+
+    try:
+        f = sf.SoundFile(audio_path)
+    except Exception:
+        return None
+
+    def read(start, stop):
+        import numpy as np
+
+        f.seek(start)
+        samples = f.read(stop - start, dtype="float32", always_2d=True).mean(axis=1)
+        # Compressed formats can report a few more frames than they decode.
+        return np.pad(samples, (0, stop - start - len(samples)))
+
+    return read, f.frames, f.samplerate, f.close
+
+
+def _block_pitches(read, total, sr, block_frames):
+    """Per-frame max piptrack pitch, `block_frames` frames at a time.
+
+    Frames are laid out exactly as piptrack's centred STFT lays them out and
+    piptrack thresholds each frame on its own, so the result is the same as
+    one call over the whole signal; only one block's spectrogram is alive
+    at a time.
+    """
+    import numpy as np
+    import librosa
+
+    half = PITCH_N_FFT // 2
+    n_frames = 1 + total // PITCH_HOP
+    pitch_values = np.zeros(n_frames, dtype=np.float32)
+    for first in range(0, n_frames, block_frames):
+        last = min(first + block_frames, n_frames)
+        # Samples under frames [first, last), zero-padded past either end.
+        start = first * PITCH_HOP - half
+        stop = (last - 1) * PITCH_HOP + half
+        segment = np.zeros(stop - start, dtype=np.float32)
+        lo, hi = max(start, 0), min(stop, total)
+        if hi > lo:
+            segment[lo - start : hi - start] = read(lo, hi)
+        pitches, _ = librosa.piptrack(
+            y=segment, sr=sr, n_fft=PITCH_N_FFT, hop_length=PITCH_HOP, center=False
+        )
+        pitch_values[first:last] = pitches.max(axis=0)
+    return pitch_values
 
-    y, sr = librosa.load(audio_path, sr=None)
-    times = np.linspace(0, len(y) / sr, len(y))
-    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
 
-    pitch_values = np.array(
-        [
-            np.max(pitches[:, i]) if np.any(pitches[:, i]) else 0
-            for i in range(pitches.shape[1])
-        ]
-    )
-    pitch_times = librosa.frames_to_time(np.arange(len(pitch_values)), sr=sr)
+def extract_pitch(audio_path, audio: Optional[DecodedAudio] = None):
+    """ Extract pitch from the audio file.
+
+    With preloaded (possibly trimmed) `audio`, the file is not decoded again and
+    the returned times are shifted by `audio.offset` onto the original timeline.
+    The signal is analysed in blocks of PITCH_BLOCK_FRAMES frames, so memory
+    beyond the signal itself does not grow with the recording's length; without
+    `audio`, a file soundfile can read is streamed from disk as well.
+    """
+    import numpy as np
+    import librosa
+
+    start_time = time.time()
+
+    block_frames = settings.PITCH_BLOCK_FRAMES
+    reader = _file_reader(audio_path) if audio is None and block_frames else None
+    if reader is not None:
+        read, total, sr, close = reader
+        offset = 0.0
+        try:
+            pitch_values = _block_pitches(read, total, sr, block_frames)
+        finally:
+            close()
+    else:
+        if audio is None:
+            audio = decode_audio(audio_path)
+            y, sr, offset = audio.samples, audio.sample_rate, 0.0
+        else:
+            y, sr, offset = audio.samples, audio.sample_rate, audio.offset
+        pitch_values = _block_pitches(
+            lambda lo, hi: y[lo:hi], len(y), sr, block_frames or 1 + len(y) // PITCH_HOP
+        )
+    pitch_times = librosa.frames_to_time(
+        np.arange(len(pitch_values)), sr=sr, hop_length=PITCH_HOP
+    ) + offset
 
     end_time = time.time()
     logging.info(f"⏳ Pitch extraction took {end_time - start_time:.4f} seconds")
@@ -58,53 +135,86 @@ def extract_pitch(audio_path):
     return pitch_times, pitch_values
 
 
-def analyze_stress(transcription_data, pitch_times, pitch_values):
-    """ Analyze word stress using pitch analysis. """
-    start_time = time.time()
-    words = transcription_data["word_timestamps"]["words"]
-    results = []
+def _zscore(values):
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.float64)
+    std = values.std()
+    return (values - values.mean()) / std if std > 0 else np.zeros_like(values)
+
+
+def prominence(pitch_peaks, intensities, voiced_seconds):
+    """Syllable prominence: weighted z-scores of peak pitch, mean intensity and
+    voiced duration within one word (STRESS_PROMINENCE_WEIGHTS)."""
+    w_pitch, w_intensity, w_duration = settings.STRESS_PROMINENCE_WEIGHTS
+    return (
+        w_pitch * _zscore(pitch_peaks)
+        + w_intensity * _zscore(intensities)
+        + w_duration * _zscore(voiced_seconds)
+    )
 
-    for word_entry in words:
-        word = word_entry["word"].lower()
-        start_time_word, end_time_word = word_entry["start"], word_entry["end"]
 
-        word_mask = (pitch_times >= start_time_word) & (pitch_times <= end_time_word)
-        word_pitches = pitch_values[word_mask]
+def analyze_stress(words: WordTimings, pitch_times, pitch_values, intensity=None):
+    """ Analyze word stress using pitch analysis.
 
-        if len(word_pitches) == 0:
+    With an `intensity` track (dB on the pitch frames) the stressed syllable
+    is the most prominent one by pitch, intensity and voiced duration;
+    otherwise it is the one with the highest pitch.
+    """
+    import numpy as np
+
+    start_time = time.time()
+    results = []
+    # pitch_times is sorted, so each word/syllable is a contiguous frame range.
+    lo, hi = words.frame_ranges(pitch_times)
+
+    for word, start_time_word, end_time_word, first, last in zip(
+        words.words, words.starts.tolist(), words.ends.tolist(), lo.tolist(), hi.tolist()
+    ):
+        word = word.lower()
+        if last <= first:
             results.append((word, None, []))  # ✅ Ensure it always returns 3 values
             continue
 
-        word_info = WORD_DATABASE.get(
-            word, {"Syllables": [], "Total syllables": 1, "Stress Indices": 0}
-        )
+        word_info = lookup_stress(word) or {
+            "Syllables": [], "Total syllables": 1, "Stress Indices": 0
+        }
         syllables = word_info["Syllables"]
         num_syllables = word_info["Total syllables"]
-        stress_index = word_info["Stress Indices"]
 
         syllable_duration = (end_time_word - start_time_word) / num_syllables
+        edges = np.searchsorted(
+            pitch_times,
+            start_time_word + np.arange(num_syllables + 1) * syllable_duration,
+            side="left",
+        )
         syllable_pitches = []
+        syllable_intensities = []
+        syllable_voiced = []
 
         for i in range(num_syllables):
-            period_start = start_time_word + (i * syllable_duration)
-            period_end = period_start + syllable_duration
-            period_indices = np.where(
-                (pitch_times >= period_start) & (pitch_times < period_end)
-            )[0]
-
-            if len(period_indices) > 0:
-                period_pitches = word_pitches[
-                    period_indices[0]: period_indices[-1] + 1
-                ]
-            else:
+            period_pitches = pitch_values[edges[i]: edges[i + 1]]
+            if len(period_pitches) == 0:
                 logging.warning(f"No data for syllable {i + 1} of '{word}'")
-                period_pitches = np.array([])
-
             syllable_pitches.append(
                 np.max(period_pitches) if len(period_pitches) > 0 else 0
             )
-
-        predicted_stress = int(np.argmax(syllable_pitches)) if num_syllables > 1 else 0
+            if intensity is not None:
+                period_intensity = intensity[edges[i]: edges[i + 1]]
+                syllable_intensities.append(
+                    np.mean(period_intensity) if len(period_intensity) > 0 else 0
+                )
+                voiced = pitch_times[edges[i]: edges[i + 1]][period_pitches > 0]
+                syllable_voiced.append(voiced[-1] - voiced[0] if len(voiced) > 1 else 0)
+
+        if num_syllables <= 1:
+            predicted_stress = 0
+        elif intensity is not None:
+            predicted_stress = int(
+                np.argmax(prominence(syllable_pitches, syllable_intensities, syllable_voiced))
+            )
+        else:
+            predicted_stress = int(np.argmax(syllable_pitches))
         results.append((word, predicted_stress, syllables))
 
     end_time = time.time()
@@ -118,21 +228,44 @@ class WordstressEvaluationService:
     @staticmethod
     @log_execution_time
     async def evaluate_stress(
-        audio_transcription: AudioTranscription, audio_path: str
+        audio_transcription: Transcript,
+        audio_path: str,
+        audio: Optional[DecodedAudio] = None,
+        index: Optional[TranscriptIndex] = None,
     ) -> List[StressError]:
-        """ Evaluate word stress in speech. """
+        """ Evaluate word stress in speech.
+
+        Error positions are character spans in the transcript, resolved through
+        `index` (built here if the caller does not share one).
+        """
         start = time.time()
-        pitch_times, pitch_values = extract_pitch(audio_path)
-        transcription_data = audio_transcription.model_dump()
-        stress_analysis = analyze_stress(transcription_data, pitch_times, pitch_values)
+        if index is None:
+            index = TranscriptIndex.build(
+                audio_transcription.transcription, audio_transcription.words
+            )
+        if settings.ACOUSTIC_BACKEND == "praat":
+            from utils.acoustics import acoustic_tracks
+
+            tracks = await asyncio.to_thread(acoustic_tracks, audio_path, audio)
+            pitch_times, pitch_values, intensity = tracks.times, tracks.pitch, tracks.intensity
+        else:
+            pitch_times, pitch_values = await asyncio.to_thread(
+                extract_pitch, audio_path, audio
+            )
+            intensity = None
+        stress_analysis = analyze_stress(
+            audio_transcription.words, pitch_times, pitch_values, intensity
+        )
         errors = []
 
-        for word, predicted_stress, syllables in stress_analysis:
+        # analyze_stress yields one entry per ASR word, in order.
+        for position, (word, predicted_stress, syllables) in enumerate(stress_analysis):
             if syllables:
-                expected_stress = WORD_DATABASE.get(word, {"Stress Indices": 0})[
+                expected_stress = (lookup_stress(word) or {"Stress Indices": 0})[
                     "Stress Indices"
                 ]
                 if predicted_stress != expected_stress:
+                    char_start, char_end = index.char_span(index.token_for_word(position))
                     error = StressError(
                         word=word,
                         syllableBreakdown=syllables,
@@ -141,10 +274,10 @@ class WordstressEvaluationService:
                         expectedStressedSyllableIndex=expected_stress,
                         errorDescription="Chưa code em ơi, Gọi LLM lâu lắm",
                         improvementAdvice="Chưa code em ơi, Gọi LLM lâu lắm",
-                        errorStartIndex=0,
-                        errorEndIndex=len(word),
+                        errorStartIndex=char_start,
+                        errorEndIndex=char_end,
                     )
-                    errors.append(error.model_dump())
+                    errors.append(error)
 
         end = time.time()
         logging.info(f"Wordstress evaluation took {end - start:.4f} seconds")
@@ -164,5 +297,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -0,0 +1,123 @@
+import asyncio
+import gc
+import logging
+import os
+import signal
+import time
+from typing import Callable, Dict
+
+import psutil
+
+
+def preload():
+    """Load the read-only state every worker needs, once, before forking.
+
+    Workers inherit it copy-on-write: the stress lexicon built from cmudict,
+    the DSP imports, and the numba kernels librosa JIT-compiles on first call.
+    """
+    from services.warmup import WarmupService
+
+    asyncio.run(WarmupService.warmup_local_stages())
+
+
+class Supervisor:
+    """Pre-forks `workers` copies of `target` and keeps them alive.
+
+    Each worker binds the same port with SO_REUSEPORT so the kernel spreads
+    connections across them. A worker that exits is restarted; one whose
+    unique (non-shared) memory grows past `max_rss_mb` is asked to stop and
+    then restarted.
+    """
+
+    CRASH_BACKOFF_SECONDS = 1.0
+
+    def __init__(
+        self,
+        target: Callable[[], None],
+        workers: int,
+        max_rss_mb: int = 0,
+        check_interval: float = 5.0,
+    ):
+        self.target = target
+        self.workers = workers
+        self.max_rss_mb = max_rss_mb
+        self.check_interval = check_interval
+        self.children: Dict[int, float] = {}  # pid -> start time
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 0
+            try:
+                self.target()
+            except BaseException:
+                logging.exception(f"Worker {os.getpid()} crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+        logging.info(f"Started worker {pid}")
+
+    def stop(self, signum, frame) -> None:
+        self.stopping = True
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def reap(self) -> None:
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            if pid not in self.children:
+                # Not a worker (e.g. a helper process started before forking).
+                continue
+            started = self.children.pop(pid)
+            logging.warning(
+                f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}"
+            )
+            if not self.stopping:
+                if time.monotonic() - started < self.CRASH_BACKOFF_SECONDS:
+                    time.sleep(self.CRASH_BACKOFF_SECONDS)
+                self.spawn()
+
+    def check_memory(self) -> None:
+        if not self.max_rss_mb:
+            return
+        for pid in list(self.children):
+            try:
+                uss_mb = psutil.Process(pid).memory_full_info().uss / (1024 * 1024)
+            except psutil.Error:
+                continue
+            if uss_mb > self.max_rss_mb:
+                logging.warning(
+                    f"Worker {pid} uses {uss_mb:.0f} MB (> {self.max_rss_mb} MB), recycling"
+                )
+                os.kill(pid, signal.SIGTERM)
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        # Keep preloaded objects out of the GC's generations so collections in
+        # the workers do not touch (and un-share) their pages.
+        gc.freeze()
+        for _ in range(self.workers):
+            self.spawn()
+
+        last_check = time.monotonic()
+        while self.children:
+            time.sleep(0.5)
+            self.reap()
+            if not self.stopping and time.monotonic() - last_check > self.check_interval:
+                self.check_memory()
+                last_check = time.monotonic()
+        logging.info("All workers stopped")
@@ -0,0 +1,65 @@
+import asyncio
+import os
+
+from pydantic import BaseModel
+
+from utils.cassette import Cassette
+
+
+class Reply(BaseModel):
+    text: str
+
+
+def recorder(cassette, endpoint):
+    async def create(**kwargs):
+        await asyncio.sleep(0)
+        return Reply(text=f"{endpoint}:{kwargs['prompt']}")
+
+    return cassette._intercept(endpoint, create)
+
+
+def test_recordings_are_written_off_the_call_path(tmp_path):
+    path = str(tmp_path / "calls.cassette")
+
+    async def scenario():
+        cassette = Cassette(path, "record")
+        save = cassette._save
+
+        def counted_save(recorded):
+            writes.append(sum(len(items) for items in recorded.values()))
+            save(recorded)
+
+        cassette._save = counted_save
+        create = recorder(cassette, "llm")
+        await asyncio.gather(*(create(prompt=str(i)) for i in range(20)))
+        await cassette.flush()
+
+    writes = []
+    asyncio.run(scenario())
+    # Batched while a write is in flight, not one rewrite per call
+    assert sum(writes) == 20 and len(writes) < 20
+    replay = Cassette(path, "replay", latency="zero")
+    assert sum(len(items) for items in replay.entries.values()) == 20
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_workers_keep_each_others_recordings(tmp_path):
+    path = str(tmp_path / "calls.cassette")
+
+    async def scenario():
+        # Two workers that loaded the (empty) cassette before either wrote.
+        first, second = Cassette(path, "record"), Cassette(path, "record")
+        await recorder(first, "llm")(prompt="a")
+        await recorder(second, "llm")(prompt="b")
+        await asyncio.gather(first.flush(), second.flush())
+        await recorder(first, "llm")(prompt="c")
+        await first.flush()
+
+    asyncio.run(scenario())
+
+    async def replay():
+        cassette = Cassette(path, "replay", latency="zero")
+        create = recorder(cassette, "llm")
+        return [(await create(prompt=p)).text for p in "abc"]
+
+    assert asyncio.run(replay()) == ["llm:a", "llm:b", "llm:c"]
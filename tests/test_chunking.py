@@ -0,0 +1,61 @@
+import math
+
+from utils.chunking import Chunk, plan_chunks, stitch
+from utils.transcript import WordTimings
+
+# Speech in 4 s runs separated by 1 s pauses: (0, 4), (5, 9), (10, 14), ...
+SEGMENTS = [(5.0 * i, 5.0 * i + 4.0) for i in range(12)]
+
+
+def test_short_recording_is_one_chunk():
+    chunks = plan_chunks(SEGMENTS[:2], 0.0, 9.0, target_seconds=30, overlap_seconds=1)
+    assert chunks == [Chunk(0.0, 9.0, -math.inf, math.inf)]
+
+
+def test_cuts_in_the_middle_of_the_first_pause_after_the_target():
+    chunks = plan_chunks(SEGMENTS, 0.0, 59.0, target_seconds=20, overlap_seconds=2)
+    assert [chunk.keep_until for chunk in chunks] == [24.5, 44.5, math.inf]
+    assert [chunk.keep_from for chunk in chunks] == [-math.inf, 24.5, 44.5]
+    # Overlaps are capped at half the pause, so they hold only silence.
+    assert [(chunk.start, chunk.end) for chunk in chunks] == [
+        (0.0, 25.0),
+        (24.0, 45.0),
+        (44.0, 59.0),
+    ]
+
+
+def test_short_tail_is_folded_into_the_last_chunk():
+    chunks = plan_chunks(SEGMENTS[:9], 0.0, 44.0, target_seconds=20, overlap_seconds=0.5)
+    # A cut at 44.5 would come after the end; the one at 24.5 leaves a 19.5 s tail.
+    assert len(chunks) == 2
+    chunks = plan_chunks(SEGMENTS[:6], 0.0, 29.0, target_seconds=20, overlap_seconds=0.5)
+    # The tail after 24.5 is shorter than a third of the target.
+    assert len(chunks) == 1 and chunks[0].end == 29.0
+
+
+def timings(rows):
+    return WordTimings.from_rows(rows)
+
+
+def test_stitch_keeps_each_seam_word_once():
+    first = Chunk(0.0, 10.5, -math.inf, 10.0)
+    second = Chunk(9.5, 20.0, 10.0, math.inf)
+    # Both chunks heard "seam" (midpoint 9.9), owned by the first.
+    results = [
+        (first, "one two seam", timings([("one", 1, 2), ("two", 3, 4), ("seam", 9.6, 10.2)])),
+        (
+            second,
+            "seam three four",
+            timings([("seam", 9.6, 10.2), ("three", 12, 13), ("four", 15, 16)]),
+        ),
+    ]
+    text, words = stitch(results)
+    assert text == "one two seam three four"
+    assert words.words == ["one", "two", "seam", "three", "four"]
+    assert words.starts.tolist() == [1, 3, 9.6, 12, 15]
+
+
+def test_stitch_drops_the_text_of_a_chunk_with_no_kept_words():
+    only_overlap = Chunk(9.0, 11.0, 10.5, 10.6)
+    text, words = stitch([(only_overlap, "uh", timings([("uh", 9.2, 9.4)]))])
+    assert text == "" and len(words) == 0
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from utils import metrics
+from utils.deadline import DeadlineExceeded, deadline_scope, ensure_time_for
+from utils.logging import log_execution_time
+
+
+def record(stage: str, *durations: float) -> None:
+    for seconds in durations:
+        metrics.histogram(f"stage_seconds.{stage}", seconds)
+
+
+def test_quantile_interpolates_inside_the_bucket():
+    # Buckets (.., 5, 10, ..): ten values in (5, 10]
+    record("quantile_probe", *[7.0] * 10)
+    assert metrics.quantile("stage_seconds.quantile_probe", 0.1) == pytest.approx(5.5)
+    assert metrics.quantile("stage_seconds.quantile_probe", 1.0) == pytest.approx(10.0)
+    assert metrics.quantile("stage_seconds.unknown", 0.5, default=-1) == -1
+
+
+def test_skips_only_when_even_a_fast_run_would_overrun():
+    # Mostly ~1 s, a few 20 s outliers: the mean (~4.8 s) would skip at 3 s left.
+    record("gate_probe", *[0.9] * 8, 20.0, 20.0)
+    with deadline_scope(3.0):
+        ensure_time_for("gate_probe")
+    with deadline_scope(0.5):
+        with pytest.raises(DeadlineExceeded):
+            ensure_time_for("gate_probe")
+
+
+def test_unobserved_stage_runs_until_the_deadline_has_passed():
+    with deadline_scope(0.01):
+        ensure_time_for("never_observed")
+    with deadline_scope(-1):
+        with pytest.raises(DeadlineExceeded):
+            ensure_time_for("never_observed")
+
+
+def test_composite_stage_is_not_gated_but_its_leaves_are():
+    calls = []
+
+    @log_execution_time
+    async def composite_probe():
+        calls.append("composite")
+        await leaf_probe()
+
+    @log_execution_time
+    async def leaf_probe():
+        calls.append("leaf")
+
+    asyncio.run(composite_probe())
+    record("composite_probe", *[30.0] * 10)
+    record("leaf_probe", *[30.0] * 10)
+
+    async def under_deadline():
+        with deadline_scope(1.0):
+            await composite_probe()
+
+    with pytest.raises(DeadlineExceeded, match="leaf_probe"):
+        asyncio.run(under_deadline())
+    assert calls == ["composite", "leaf", "composite"]
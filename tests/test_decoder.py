@@ -0,0 +1,83 @@
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from config import settings
+from utils import decoder
+from utils.decoder import decode_file, ffmpeg_pool, sniff
+
+needs_ffmpeg = pytest.mark.skipif(
+    shutil.which(settings.FFMPEG_BINARY) is None, reason="ffmpeg not installed"
+)
+
+
+@pytest.mark.parametrize(
+    "head, container",
+    [
+        (b"RIFF\0\0\0\0WAVEfmt ", "wav"),
+        (b"fLaC\0\0\0\x22", "flac"),
+        (b"OggS\0\x02", "ogg"),
+        (b"ID3\x04\0\0", "mp3"),
+        (b"\xff\xfb\x90\x64", "mp3"),
+        (b"\x1a\x45\xdf\xa3\x9f", "webm"),
+        (b"\0\0\0\x20ftypM4A ", "mp4"),
+        (b"hello", "unknown"),
+    ],
+)
+def test_sniff(head, container):
+    assert sniff(head) == container
+
+
+@pytest.fixture
+def stereo_wav(tmp_path):
+    t = np.arange(8000, dtype=np.float32) / 8000
+    left, right = 0.5 * np.sin(2 * np.pi * 220 * t), 0.1 * np.ones_like(t)
+    path = str(tmp_path / "stereo.wav")
+    sf.write(path, np.stack([left, right], axis=1), 8000, subtype="FLOAT")
+    return path, left, right
+
+
+def test_native_decode_is_mono_unless_asked_for_channels(stereo_wav):
+    path, left, right = stereo_wav
+    mono = decode_file(path)
+    np.testing.assert_allclose(mono.samples, (left + right) / 2, atol=1e-6)
+    both = decode_file(path, mono=False)
+    assert both.samples.shape == (len(left), 2)
+    assert both.duration == mono.duration == 1.0
+
+
+@needs_ffmpeg
+def test_ffmpeg_decode_matches_native(stereo_wav, tmp_path):
+    path, left, right = stereo_wav
+    webm = str(tmp_path / "stereo.webm")
+    subprocess.run(
+        [settings.FFMPEG_BINARY, "-loglevel", "error", "-i", path, "-c:a", "libopus", webm],
+        check=True,
+    )
+    decoded = decode_file(webm, mono=False)
+    assert decoded.samples.shape[1] == 2
+    mono = decode_file(webm)
+    assert mono.samples.ndim == 1 and abs(mono.duration - 1.0) < 0.05
+
+
+@needs_ffmpeg
+def test_pool_inherited_across_fork_is_replaced(monkeypatch):
+    monkeypatch.setattr(decoder, "_pool", None)
+    parent = ffmpeg_pool()
+    parent.warm()
+    started = list(parent._idle)
+    try:
+        monkeypatch.setattr(os, "getpid", lambda: parent.pid + 1)
+        child = ffmpeg_pool()
+        assert child is not parent and child.pid == parent.pid + 1
+        assert not child._idle
+    finally:
+        monkeypatch.undo()
+        child.close()
+        for worker in started:
+            worker.kill()
+            worker.wait()
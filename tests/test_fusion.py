@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fakes import install_fakes
+from config import settings
+from services.phoneme import PronunciationEvaluationService
+from utils.logging import collect_stage_timings
+
+TEXT = "I rarely read at night. My sister rarely does either, so we talk instead."
+
+
+@pytest.fixture(autouse=True)
+def fakes():
+    with install_fakes("zero", "zero"):
+        yield
+
+
+def assess(monkeypatch, fused: bool):
+    monkeypatch.setattr(settings, "LLM_FUSION", fused)
+
+    async def run():
+        with collect_stage_timings() as timings:
+            result = await PronunciationEvaluationService.pronunciation_assessment(TEXT)
+        return result, timings
+
+    return asyncio.run(run())
+
+
+def spans(result):
+    return [
+        (e.errorStartIndexTranscription, e.errorEndIndexTranscription)
+        for e in result.phonemeErrorDetails
+    ]
+
+
+def test_fused_mode_makes_one_call_per_group(monkeypatch):
+    monkeypatch.setattr(settings, "PRONUNCIATION_GROUP_WORDS", 0)
+    _, timings = assess(monkeypatch, fused=True)
+    assert len(timings["analyze_pronunciation"]) == 1
+    assert "predict_intended_word" not in timings
+    assert "compare_phonemes" not in timings
+
+
+def test_fused_and_unfused_map_errors_to_the_same_words(monkeypatch):
+    fused, _ = assess(monkeypatch, fused=True)
+    unfused, _ = assess(monkeypatch, fused=False)
+    assert spans(fused) == spans(unfused) == [(2, 7), (34, 39)]
+    assert fused.expectedPhoneticTranscription == unfused.expectedPhoneticTranscription
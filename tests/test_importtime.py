@@ -0,0 +1,18 @@
+import pytest
+
+from benchmarks.importtime import BUDGETS, import_profile
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_stays_within_budget(module):
+    budget_ms, forbidden = BUDGETS[module]
+    rows = import_profile(module)
+    loaded = {name.split(".")[0] for name, _, _ in rows}
+    assert not loaded & set(forbidden), f"{module} imports {sorted(loaded & set(forbidden))}"
+    total_ms = next(cum for name, _, cum in rows if name == module) / 1000
+    assert total_ms <= budget_ms
+
+
+def test_main_defers_numerics_and_sdks():
+    loaded = {name.split(".")[0] for name, _, _ in import_profile("main")}
+    assert not loaded & {"numpy", "librosa", "openai"}
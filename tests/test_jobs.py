@@ -0,0 +1,94 @@
+import sqlite3
+import time
+
+import pytest
+
+from services.jobs import FAILED, QUEUED, RUNNING, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def add_jobs(store, *ids):
+    for job_id in ids:
+        store.create(job_id, f"/tmp/{job_id}.audio")
+        time.sleep(0.001)  # distinct created_at
+
+
+def expire(store, job_id):
+    store.conn.execute("UPDATE jobs SET lease_until = ? WHERE id = ?", (time.time() - 1, job_id))
+
+
+def test_claims_oldest_first_and_never_twice(store):
+    add_jobs(store, "a", "b")
+    assert store.claim_next("w1")["id"] == "a"
+    assert store.claim_next("w2")["id"] == "b"
+    assert store.claim_next("w1") is None
+    row = store.get("a")
+    assert (row["state"], row["owner"], row["attempts"]) == (RUNNING, "w1", 1)
+    assert row["lease_until"] > time.time()
+
+
+def test_requeue_returns_only_own_jobs_without_spending_an_attempt(store):
+    add_jobs(store, "a", "b")
+    store.claim_next("w1")
+    store.claim_next("w2")
+    assert store.requeue("w1") == 1
+    assert (store.get("a")["state"], store.get("a")["attempts"]) == (QUEUED, 0)
+    assert store.get("b")["state"] == RUNNING
+
+
+def test_live_leases_are_not_reclaimed(store):
+    add_jobs(store, "a")
+    store.claim_next("w1", lease=60)
+    assert store.reclaim_expired() == (0, 0)
+    assert store.get("a")["state"] == RUNNING
+
+
+def test_expired_lease_is_requeued_then_failed_after_max_attempts(store):
+    add_jobs(store, "a")
+    for attempt in range(1, 3):
+        assert store.claim_next(f"w{attempt}")["id"] == "a"
+        expire(store, "a")
+        assert store.reclaim_expired(max_attempts=3) == (1, 0)
+        assert store.get("a")["state"] == QUEUED
+    store.claim_next("w3")
+    expire(store, "a")
+    assert store.reclaim_expired(max_attempts=3) == (0, 1)
+    row = store.get("a")
+    assert row["state"] == FAILED and row["attempts"] == 3 and row["error"]
+
+
+def test_renew_extends_only_the_owner_leases(store):
+    add_jobs(store, "a", "b")
+    store.claim_next("w1")
+    store.claim_next("w2")
+    expire(store, "a")
+    expire(store, "b")
+    assert store.renew("w1", lease=60) == 1
+    assert store.reclaim_expired() == (1, 0)
+    assert store.get("a")["state"] == RUNNING
+    assert store.get("b")["state"] == QUEUED
+
+
+def test_migrates_a_table_from_before_leases(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, state TEXT NOT NULL, audio_path TEXT NOT NULL,"
+        " result BLOB, error TEXT, owner INTEGER, created_at REAL NOT NULL, started_at REAL,"
+        " finished_at REAL)"
+    )
+    conn.execute(
+        "INSERT INTO jobs (id, state, audio_path, owner, created_at) VALUES ('a', ?, '', 1, 0)",
+        (RUNNING,),
+    )
+    conn.commit()
+    conn.close()
+
+    store = JobStore(path)
+    # Its pid may belong to a live process now; without a lease it is reclaimed.
+    assert store.reclaim_expired() == (1, 0)
+    assert store.claim_next("w1")["tenant"] is None
@@ -0,0 +1,46 @@
+from services.phoneme import PhonemeErrorDetail
+from utils.phoneme import update_transcription_error_indices
+from utils.transcript import TranscriptIndex
+
+
+def error(word: str) -> PhonemeErrorDetail:
+    return PhonemeErrorDetail(
+        transcribedWord=word,
+        expectedWord=word,
+        expectedPronunciation="",
+        actualPronunciation="",
+        errorType="substitution",
+        errorStartIndexWord=0,
+        errorStartIndexTranscription=None,
+        errorEndIndexTranscription=None,
+        errorEndIndexWord=0,
+        substituted="",
+        errorDescription="",
+        improvementAdvice="",
+    )
+
+
+def spans(text: str, words):
+    errors = update_transcription_error_indices(
+        TranscriptIndex.build(text), [error(word) for word in words]
+    )
+    return [(e.errorStartIndexTranscription, e.errorEndIndexTranscription) for e in errors]
+
+
+def test_phrase_spans_its_tokens():
+    text = "I used to walk, and I used to run."
+    assert spans(text, ["used to", "used to"]) == [(2, 8), (22, 28)]
+    assert text[2:9] == "used to"
+
+
+def test_phrase_must_be_consecutive():
+    assert spans("I used it to run.", ["used to"]) == [(-1, -1)]
+
+
+def test_repeated_word_takes_next_occurrence():
+    text = "The cat saw the other cat."
+    assert spans(text, ["cat", "cat", "cat"]) == [(4, 6), (22, 24), (-1, -1)]
+
+
+def test_punctuation_and_case_are_ignored():
+    assert spans("Well, it's Fine.", ["fine", "It's"]) == [(11, 14), (6, 9)]
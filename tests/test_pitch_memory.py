@@ -0,0 +1,48 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from services.wordstress import PITCH_HOP, PITCH_N_FFT, _block_pitches
+
+SAMPLE_RATE = 16000
+BLOCK_FRAMES = 256
+# Allowed peak on top of the input signal, whatever its length
+CEILING_MB = 32
+
+
+def signal(duration: float) -> np.ndarray:
+    """A gliding tone with pauses."""
+    t = np.arange(int(duration * SAMPLE_RATE), dtype=np.float32) / SAMPLE_RATE
+    f0 = 160 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    voiced = (np.sin(2 * np.pi * 0.5 * t) > -0.5).astype(np.float32)
+    return (0.3 * voiced * np.sin(2 * np.pi * np.cumsum(f0) / SAMPLE_RATE)).astype(np.float32)
+
+
+def block_pitches(y: np.ndarray) -> np.ndarray:
+    return _block_pitches(lambda lo, hi: y[lo:hi], len(y), SAMPLE_RATE, BLOCK_FRAMES)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def warm_librosa():
+    # Lazy imports and librosa's caches must not count towards the first peak.
+    block_pitches(signal(1.0))
+
+
+def test_peak_memory_stays_under_the_ceiling_for_a_long_signal():
+    y = signal(600.0)
+    tracemalloc.start()
+    try:
+        block_pitches(y)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak / 2**20 < CEILING_MB
+
+
+def test_blocks_match_single_shot_piptrack():
+    import librosa
+
+    y = signal(20.0)
+    pitches, _ = librosa.piptrack(y=y, sr=SAMPLE_RATE, n_fft=PITCH_N_FFT, hop_length=PITCH_HOP)
+    np.testing.assert_allclose(block_pitches(y), pitches.max(axis=0), rtol=1e-5, atol=1e-3)
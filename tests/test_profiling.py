@@ -0,0 +1,79 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from config import settings
+from utils import profiling
+from utils.profiling import Profiler
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def busy():
+    return sum(i * i for i in range(20_000))
+
+
+def test_capture_writes_artifacts_off_the_loop(monkeypatch):
+    writers = []
+    write = profiling.write_artifacts
+
+    def recording_write(capture):
+        writers.append(threading.get_ident())
+        write(capture)
+
+    monkeypatch.setattr(profiling, "write_artifacts", recording_write)
+
+    async def scenario():
+        profiler = Profiler()
+        profiler.sample_rate = 0.0
+        capture = profiler.start(requests=1)
+        with profiler.request_scope():
+            busy()
+        # The last request ended the capture; its artifacts are still being written.
+        assert capture.finished and profiler.active is None
+        assert capture.written is not None
+        assert await profiler.stop() is capture
+        return capture
+
+    capture = asyncio.run(scenario())
+    assert writers and writers[0] != threading.get_ident()
+    assert "busy" in capture.cpu_summary
+    assert sorted(os.listdir(capture.artifact_dir)) == ["cpu.pstats", "cpu.txt"]
+
+
+def test_stop_waits_for_a_running_capture():
+    async def scenario():
+        profiler = Profiler()
+        profiler.sample_rate = 0.0
+        capture = profiler.start(seconds=60.0)
+        with profiler.request_scope():
+            busy()
+        assert not capture.finished
+        assert await profiler.stop() is capture
+        assert capture.written.done() and profiler._timer is None
+        return capture
+
+    capture = asyncio.run(scenario())
+    assert os.path.exists(os.path.join(capture.artifact_dir, "cpu.pstats"))
+
+
+def test_samples_are_pruned(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_MAX_SAMPLES", 2)
+
+    async def scenario():
+        profiler = Profiler()
+        profiler.sample_rate = 1.0
+        for _ in range(4):
+            with profiler.request_scope() as capture:
+                busy()
+            await capture.written
+        assert not profiler._writes
+
+    asyncio.run(scenario())
+    assert len(os.listdir(os.path.join(settings.PROFILE_DIR, "samples"))) == 2
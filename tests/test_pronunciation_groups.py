@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fakes import install_fakes
+from config import settings
+from services.phoneme import PronunciationEvaluationService
+from utils.logging import collect_stage_timings
+
+TEXT = (
+    "I rarely cook. We rarely eat out either. "
+    "So we rarely see friends, and they rarely call. Rarely!"
+)
+
+
+@pytest.fixture(autouse=True)
+def fakes():
+    with install_fakes("zero", "zero"):
+        yield
+
+
+def assess(monkeypatch, group_words: int):
+    monkeypatch.setattr(settings, "PRONUNCIATION_GROUP_WORDS", group_words)
+
+    async def run():
+        with collect_stage_timings() as timings:
+            result = await PronunciationEvaluationService.pronunciation_assessment(TEXT)
+        return result, timings
+
+    return asyncio.run(run())
+
+
+def test_grouped_errors_point_at_the_same_words_as_one_call(monkeypatch):
+    whole, _ = assess(monkeypatch, 0)
+    grouped, timings = assess(monkeypatch, 6)
+    assert len(timings["predict_intended_word"]) == 4
+    spans = [
+        (e.errorStartIndexTranscription, e.errorEndIndexTranscription)
+        for e in grouped.phonemeErrorDetails
+    ]
+    assert spans == [
+        (e.errorStartIndexTranscription, e.errorEndIndexTranscription)
+        for e in whole.phonemeErrorDetails
+    ]
+    assert [TEXT[start : end + 1].lower() for start, end in spans] == ["rarely"] * 5
+
+
+def test_grouped_phonetic_transcriptions_cover_every_group(monkeypatch):
+    whole, _ = assess(monkeypatch, 0)
+    grouped, _ = assess(monkeypatch, 6)
+    assert grouped.actualPhoneticTranscription.split() == whole.actualPhoneticTranscription.split()
@@ -0,0 +1,191 @@
+import asyncio
+
+import pytest
+
+from utils.scheduler import BATCH, INTERACTIVE, FairScheduler, SchedulerFull, request_identity
+
+
+def scheduler(capacity=1, tenant_cap=0, interactive_reserved=0, max_queued=100, weights=None):
+    return FairScheduler(capacity, tenant_cap, interactive_reserved, max_queued, weights or {})
+
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def served_order(sched, requests, blocker=("blocker", INTERACTIVE)):
+    """Queue `requests` of (name, tenant, lane, timeout) behind one held slot; return grant order."""
+    order = []
+    release = asyncio.Event()
+
+    async def hold():
+        async with sched.slot(*blocker):
+            await release.wait()
+
+    async def request(name, tenant, lane, timeout):
+        async with sched.slot(tenant, lane, timeout):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    held = asyncio.create_task(hold())
+    await settle()
+    tasks = [asyncio.create_task(request(*r)) for r in requests]
+    await settle()
+    release.set()
+    await asyncio.gather(held, *tasks)
+    return order
+
+
+def test_backlogged_tenant_takes_turns_with_a_newcomer():
+    requests = [(f"a{i}", "a", INTERACTIVE, None) for i in range(4)]
+    requests += [(f"b{i}", "b", INTERACTIVE, None) for i in range(2)]
+    order = asyncio.run(served_order(scheduler(), requests))
+    assert order == ["a0", "b0", "a1", "b1", "a2", "a3"]
+
+
+def test_weights_split_turns():
+    requests = [(f"a{i}", "a", INTERACTIVE, None) for i in range(4)]
+    requests += [(f"b{i}", "b", INTERACTIVE, None) for i in range(4)]
+    order = asyncio.run(served_order(scheduler(weights={"a": 2.0}), requests))
+    assert order[:6] == ["a0", "a1", "b0", "a2", "a3", "b1"]
+
+
+def test_earliest_deadline_first_within_a_tenant():
+    requests = [("none", "a", INTERACTIVE, None), ("late", "a", INTERACTIVE, 60.0)]
+    requests.append(("soon", "a", INTERACTIVE, 5.0))
+    assert asyncio.run(served_order(scheduler(), requests)) == ["soon", "late", "none"]
+
+
+def test_interactive_lane_goes_first():
+    requests = [("batch", "a", BATCH, None), ("live", "b", INTERACTIVE, None)]
+    assert asyncio.run(served_order(scheduler(), requests)) == ["live", "batch"]
+
+
+def test_batch_never_takes_reserved_slots():
+    async def scenario():
+        sched = scheduler(capacity=3, interactive_reserved=1)
+        release = asyncio.Event()
+
+        async def hold(tenant, lane):
+            async with sched.slot(tenant, lane):
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold(f"t{i}", BATCH)) for i in range(3)]
+        await settle()
+        assert (sched.lanes[BATCH].running, sched.queued["t2"]) == (2, 1)
+        tasks.append(asyncio.create_task(hold("live", INTERACTIVE)))
+        await settle()
+        assert sched.in_use == 3 and sched.lanes[INTERACTIVE].running == 1
+        release.set()
+        await asyncio.gather(*tasks)
+        assert sched.in_use == 0
+
+    asyncio.run(scenario())
+
+
+def test_tenant_cap_leaves_room_for_others():
+    async def scenario():
+        sched = scheduler(capacity=3, tenant_cap=2)
+        release = asyncio.Event()
+
+        async def hold(tenant):
+            async with sched.slot(tenant):
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold("a")) for _ in range(3)]
+        await settle()
+        assert (sched.running["a"], sched.queued["a"], sched.in_use) == (2, 1, 2)
+        tasks.append(asyncio.create_task(hold("b")))
+        await settle()
+        assert sched.running == {"a": 2, "b": 1}
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+
+def test_rejects_past_the_per_tenant_queue_bound():
+    async def scenario():
+        sched = scheduler(max_queued=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with sched.slot("a"):
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold()) for _ in range(2)]
+        await settle()
+        with pytest.raises(SchedulerFull):
+            async with sched.slot("a"):
+                pass
+        assert sched.queued == {"a": 1}
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_is_withdrawn():
+    async def scenario():
+        sched = scheduler()
+        release = asyncio.Event()
+        order = []
+
+        async def hold(name, tenant):
+            async with sched.slot(tenant):
+                order.append(name)
+                await release.wait()
+
+        held = asyncio.create_task(hold("held", "a"))
+        await settle()
+        gone = asyncio.create_task(hold("gone", "b"))
+        await settle()
+        assert sched.queued["b"] == 1
+        gone.cancel()
+        await settle()
+        assert "b" not in sched.queued and "b" not in sched.lanes[INTERACTIVE].queues
+        assert "b" not in sched.lanes[INTERACTIVE].head_tags
+        release.set()
+        await held
+        assert order == ["held"] and sched.in_use == 0
+
+    asyncio.run(scenario())
+
+
+def test_no_state_outlives_a_tenant():
+    async def scenario():
+        sched = scheduler(capacity=2)
+
+        release = asyncio.Event()
+
+        async def request(tenant, lane):
+            async with sched.slot(tenant, lane):
+                await asyncio.sleep(0)
+
+        async def hold(tenant):
+            async with sched.slot(tenant):
+                await release.wait()
+
+        lanes = (INTERACTIVE, BATCH)
+        await asyncio.gather(*(request(f"t{i}", lanes[i % 2]) for i in range(200)))
+        # Withdrawn waiters are forgotten too.
+        held = [asyncio.create_task(hold(f"h{i}")) for i in range(2)]
+        await settle()
+        gone = asyncio.create_task(request("gone", INTERACTIVE))
+        await settle()
+        gone.cancel()
+        release.set()
+        await asyncio.gather(*held, gone, return_exceptions=True)
+        assert (sched.queued, sched.running, sched.in_use) == ({}, {}, 0)
+        for lane in sched.lanes.values():
+            assert (lane.queues, lane.head_tags, lane.last_tags) == ({}, {}, {})
+
+    asyncio.run(scenario())
+
+
+def test_request_identity_defaults():
+    assert request_identity(None) == ("default", INTERACTIVE)
+    metadata = (("x-tenant-id", "school-1"), ("x-priority", "batch"))
+    assert request_identity(metadata) == ("school-1", BATCH)
+    assert request_identity((("x-priority", "urgent"),)) == ("default", INTERACTIVE)
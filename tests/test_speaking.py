@@ -0,0 +1,35 @@
+import asyncio
+
+from grpc_service import speaking_pb2
+from services.assessment import AssessmentBuilder
+from services.speaking import run_stage
+
+
+async def times_out_inside():
+    raise asyncio.TimeoutError
+
+
+async def answers(value):
+    return value
+
+
+def statuses(result: AssessmentBuilder):
+    return {status.stage: status for status in result.message.stageStatuses}
+
+
+def test_timeout_inside_an_unbudgeted_stage_is_recorded():
+    result = AssessmentBuilder()
+    value = asyncio.run(run_stage(result, "unbudgeted", times_out_inside(), lambda _: None))
+    assert value is None
+    status = statuses(result)["unbudgeted"]
+    assert status.outcome == speaking_pb2.STAGE_TIMED_OUT
+    assert status.detail == "timed out"
+
+
+def test_failed_setter_marks_the_stage_failed():
+    def reject(_):
+        raise ValueError("empty")
+
+    result = AssessmentBuilder()
+    assert asyncio.run(run_stage(result, "advice", answers(1), reject)) is None
+    assert statuses(result)["advice"].outcome == speaking_pb2.STAGE_FAILED
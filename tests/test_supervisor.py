@@ -0,0 +1,29 @@
+import subprocess
+import time
+
+from supervisor import Supervisor
+
+
+def test_reap_respawns_workers_but_ignores_other_children(monkeypatch):
+    supervisor = Supervisor(target=lambda: None, workers=1)
+    spawned = []
+    monkeypatch.setattr(supervisor, "spawn", lambda: spawned.append(True))
+    monkeypatch.setattr(Supervisor, "CRASH_BACKOFF_SECONDS", 0.0)
+
+    worker = subprocess.Popen(["sleep", "30"])
+    helper = subprocess.Popen(["true"])
+    supervisor.children = {worker.pid: time.monotonic()}
+    try:
+        time.sleep(0.2)  # the helper has exited
+        supervisor.reap()
+        assert spawned == []
+        assert list(supervisor.children) == [worker.pid]
+
+        worker.kill()
+        time.sleep(0.2)
+        supervisor.reap()
+        assert spawned == [True]
+        assert supervisor.children == {}
+    finally:
+        worker.kill()
+        helper.kill()
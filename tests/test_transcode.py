@@ -0,0 +1,29 @@
+import io
+
+import numpy as np
+import soundfile as sf
+
+from utils.audio import DecodedAudio
+from utils.decoder import decode_file
+from utils.transcode import UPLOAD_SAMPLE_RATE, encode_for_upload
+
+
+def test_stereo_upload_keeps_its_duration(tmp_path):
+    t = np.arange(8000, dtype=np.float32) / 8000
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+    path = str(tmp_path / "stereo.wav")
+    sf.write(path, np.stack([tone, tone], axis=1), 8000, subtype="FLOAT")
+
+    stereo = decode_file(path, mono=False)
+    payload, filename, _ = encode_for_upload(stereo)
+    uploaded, rate = sf.read(io.BytesIO(payload), dtype="float32")
+
+    assert filename == "upload.ogg" and rate == UPLOAD_SAMPLE_RATE
+    assert uploaded.ndim == 1
+    assert abs(len(uploaded) / rate - stereo.duration) < 0.05
+    # Same signal as uploading the mono downmix
+    mono_payload, _, _ = encode_for_upload(DecodedAudio(samples=tone, sample_rate=8000))
+    mono, _ = sf.read(io.BytesIO(mono_payload), dtype="float32")
+    assert len(mono) == len(uploaded)
+    rms = float(np.sqrt(np.mean(uploaded**2)))
+    assert abs(rms - 0.5 / np.sqrt(2)) < 0.05
@@ -0,0 +1,50 @@
+import math
+
+from utils.transcript import ALIGN_WINDOW, TranscriptIndex, WordTimings, align
+
+
+def test_align_maps_words_in_order_and_skips_unmatched_ones():
+    tokens = ["i", "have", "twentyone", "cats", "and", "a", "dog"]
+    words = ["i", "have", "21", "cats", "and", "dog"]
+    assert align(tokens, words) == [0, 1, -1, 3, 4, 6]
+
+
+def test_align_does_not_jump_past_its_window():
+    tokens = ["a"] + ["x"] * ALIGN_WINDOW + ["b"]
+    assert align(tokens, ["a", "b"]) == [0, -1]
+
+
+def test_align_uses_each_token_once():
+    assert align(["the", "cat", "the"], ["the", "the", "the"]) == [0, 2, -1]
+
+
+def test_build_attaches_timings_to_aligned_tokens():
+    words = WordTimings.from_rows([("Hello", 0.0, 0.4), ("world", 0.5, 0.9)])
+    index = TranscriptIndex.build("Hello, big world.", words)
+    assert index.tokens == ["Hello", "big", "world"]
+    assert index.starts[0] == 0.0 and index.ends[2] == 0.9
+    assert math.isnan(index.starts[1])
+    assert index.char_span(2) == (11, 16)
+
+
+TEXT = "One two three. Four five. Six seven eight nine. Ten."
+
+
+def groups(max_tokens):
+    index = TranscriptIndex.build(TEXT)
+    return [TEXT[start:end] for start, end in index.sentence_groups(max_tokens)]
+
+
+def test_sentence_groups_pack_whole_sentences():
+    assert groups(5) == ["One two three. Four five. ", "Six seven eight nine. Ten."]
+
+
+def test_long_sentence_is_a_group_of_its_own():
+    assert groups(3) == ["One two three. ", "Four five. ", "Six seven eight nine. ", "Ten."]
+
+
+def test_sentence_groups_cover_the_text_in_order():
+    for max_tokens in (0, 1, 2, 4, 100):
+        assert "".join(groups(max_tokens)) == TEXT
+    assert groups(0) == [TEXT]
+    assert TranscriptIndex.build("").sentence_groups(5) == [(0, 0)]
@@ -0,0 +1,72 @@
+"""Praat (parselmouth) pitch and intensity tracks.
+
+With ACOUSTIC_BACKEND=praat the word stress and intonation stages read one
+pair of tracks per request instead of running librosa's `piptrack` and `yin`
+separately. Praat's autocorrelation pitch tracker runs in native code and
+marks unvoiced frames, which the librosa trackers do not.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from utils.audio import DecodedAudio, decode_audio
+
+if TYPE_CHECKING:
+    import numpy as np
+
+TIME_STEP = 0.01
+PITCH_FLOOR = 75.0
+PITCH_CEILING = 600.0
+
+@dataclass
+class AcousticTracks:
+    """Frame-aligned tracks; `times` are on the original recording's timeline."""
+
+    times: np.ndarray
+    # Hz, 0 where unvoiced
+    pitch: np.ndarray
+    # dB, None when the backend has no intensity track
+    intensity: Optional[np.ndarray] = None
+
+    def voiced_pitch(self) -> np.ndarray:
+        """Pitch with unvoiced frames as NaN, as the intonation rules expect."""
+        import numpy as np
+
+        return np.where(self.pitch > 0, self.pitch, np.nan)
+
+
+def praat_tracks(audio: DecodedAudio) -> AcousticTracks:
+    import numpy as np
+    import parselmouth
+
+    sound = parselmouth.Sound(
+        np.asarray(audio.samples, dtype=np.float64), sampling_frequency=audio.sample_rate
+    )
+    pitch = sound.to_pitch(
+        time_step=TIME_STEP, pitch_floor=PITCH_FLOOR, pitch_ceiling=PITCH_CEILING
+    )
+    times = pitch.xs()
+    intensity = sound.to_intensity(minimum_pitch=PITCH_FLOOR, time_step=TIME_STEP)
+    return AcousticTracks(
+        times=times + audio.offset,
+        pitch=np.nan_to_num(pitch.selected_array["frequency"]),
+        # Intensity frames are wider than pitch frames; put them on the pitch grid.
+        # Digital silence comes out at Praat's -300 dB floor.
+        intensity=np.maximum(np.interp(times, intensity.xs(), intensity.values[0]), 0.0),
+    )
+
+
+def acoustic_tracks(audio_path: str, audio: Optional[DecodedAudio] = None) -> AcousticTracks:
+    """Praat tracks of `audio` (or the decoded file), computed once per audio.
+
+    The stress and intonation stages ask concurrently from worker threads;
+    the second caller waits for the first instead of repeating the analysis.
+    """
+    if audio is None:
+        return praat_tracks(decode_audio(audio_path))
+    with audio.tracks_lock:
+        if audio.tracks is None:
+            audio.tracks = praat_tracks(audio)
+        return audio.tracks
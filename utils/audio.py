@@ -1,8 +1,65 @@
+from __future__ import annotations
+
 import io
 import base64
-from pydub import AudioSegment
+import threading
+from dataclasses import dataclass, field
 from pydantic import BaseModel, ValidationError
-from typing import Literal
+from typing import TYPE_CHECKING, Literal, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from utils.acoustics import AcousticTracks
+
+
+@dataclass
+class DecodedAudio:
+    """Mono PCM shared by the DSP stages (samples of shape (frames, channels)
+    only when decoded with `mono=False`).
+
+    `offset` is where `samples` starts in the original recording, in seconds,
+    so that times computed on a trimmed signal line up with Whisper's word
+    timestamps once it is added back.
+    """
+
+    samples: np.ndarray
+    sample_rate: int
+    offset: float = 0.0
+    # Praat tracks of this audio, computed once by utils.acoustics.acoustic_tracks
+    tracks: Optional[AcousticTracks] = field(default=None, init=False, repr=False, compare=False)
+    tracks_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    def slice(self, start: float, end: float) -> DecodedAudio:
+        """Sub-range given in seconds relative to `samples`."""
+        lo = max(0, int(start * self.sample_rate))
+        hi = min(len(self.samples), int(end * self.sample_rate))
+        return DecodedAudio(
+            samples=self.samples[lo:hi],
+            sample_rate=self.sample_rate,
+            offset=self.offset + lo / self.sample_rate,
+        )
+
+
+def decode_audio(file_path: str, mono: bool = True) -> DecodedAudio:
+    from utils.decoder import decode_file
+
+    return decode_file(file_path, mono)
+
+
+def encode_wav(audio: DecodedAudio) -> bytes:
+    """16-bit PCM WAV bytes of `audio`."""
+    import soundfile as sf
+
+    buffer = io.BytesIO()
+    sf.write(buffer, audio.samples, audio.sample_rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
 
 
 class AudioOutput(BaseModel):
@@ -26,11 +83,12 @@ class AudioReader:
     async def read_audio(
         file_path: str, output_format: Literal["binary", "base64"]
     ) -> AudioOutput:
+        """The file as 16-bit WAV with its own rate and channels."""
+        import asyncio
+
         try:
-            audio = AudioSegment.from_file(file_path)
-            buffer = io.BytesIO()
-            audio.export(buffer, format="wav")
-            binary_data = buffer.getvalue()
+            audio = await asyncio.to_thread(decode_audio, file_path, False)
+            binary_data = encode_wav(audio)
 
             if output_format == "binary":
                 return AudioOutput(output_format=output_format, data=binary_data)
@@ -42,13 +100,15 @@ class AudioReader:
 
 
 if __name__ == "__main__":
+    import asyncio
+
     file_path = (
         "/home/xuananle/Documents/Linglooma/Linglooma-core/resources/audio/part2-2.mp3"
     )
 
     try:
-        audio_binary = AudioReader.read_audio(file_path, "binary")
-        audio_base64 = AudioReader.read_audio(file_path, "base64")
+        audio_binary = asyncio.run(AudioReader.read_audio(file_path, "binary"))
+        audio_base64 = asyncio.run(AudioReader.read_audio(file_path, "base64"))
 
         print(f"Binary output (first 100 bytes): {audio_binary.data[:100]}")
         print(f"Base64 output (first 100 characters): {audio_base64.data[:100]}")
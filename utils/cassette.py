@@ -0,0 +1,196 @@
+import asyncio
+import fcntl
+import hashlib
+import importlib
+import json
+import logging
+import os
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+import msgpack
+
+CASSETTE_VERSION = 1
+
+# Request kwargs that do not change what the upstream answers.
+IGNORED_KWARGS = {"extra_headers", "extra_query", "extra_body", "timeout", "stream"}
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when no recorded response matches a request."""
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        # Prompts are indented triple-quoted strings; whitespace is noise.
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if hasattr(value, "read"):
+        data = value.read()
+        value.seek(0)
+        return {"sha256": hashlib.sha256(data).hexdigest()}
+    if isinstance(value, bytes):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if hasattr(value, "model_dump"):
+        return _normalize(value.model_dump())
+    return value
+
+
+def payload_hash(endpoint: str, kwargs: Dict[str, Any]) -> str:
+    payload = {
+        k: _normalize(v) for k, v in kwargs.items() if k not in IGNORED_KWARGS
+    }
+    blob = json.dumps(
+        [endpoint, payload], sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+
+class Cassette:
+    """Record/replay store for upstream SDK calls.
+
+    `mode` is "record" or "replay". `latency` is "original", "zero" or a
+    float scale applied to the recorded duration during replay.
+    Entries live in one zlib-compressed msgpack file keyed by payload hash;
+    repeated identical requests are replayed in recording order.
+
+    Recordings are written on a worker thread, batched while a write is in
+    flight, and merged into the file under a lock, so pre-forked workers
+    recording into one cassette keep each other's entries. Await `flush()`
+    before the process exits.
+    """
+
+    def __init__(self, path: str, mode: str, latency: str = "original"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = {"original": 1.0, "zero": 0.0}.get(latency)
+        if self.latency_scale is None:
+            self.latency_scale = float(latency)
+        self.entries: Dict[str, List[Dict[str, Any]]] = self._load()
+        self._cursors: Dict[str, int] = {}
+        # Record mode: recordings not on disk yet, and the task writing them
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._flushing: Optional[asyncio.Task] = None
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        if not os.path.isfile(self.path):
+            if self.mode == "replay":
+                raise FileNotFoundError(f"Cassette not found: {self.path}")
+            return {}
+        with open(self.path, "rb") as f:
+            data = msgpack.unpackb(zlib.decompress(f.read()), raw=False)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {self.path}")
+        return data["entries"]
+
+    def _save(self, recorded: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Append `recorded` to the entries on disk; blocking."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock:
+            # Other workers may have written since this one loaded the file.
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            entries = self._load()
+            for key, items in recorded.items():
+                entries.setdefault(key, []).extend(items)
+            blob = zlib.compress(
+                msgpack.packb({"version": CASSETTE_VERSION, "entries": entries}), 9
+            )
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, self.path)
+
+    async def _write_pending(self) -> None:
+        while self._pending:
+            recorded, self._pending = self._pending, {}
+            try:
+                await asyncio.to_thread(self._save, recorded)
+            except OSError as e:
+                logging.error(f"Could not write cassette {self.path}: {e}")
+                for key, items in recorded.items():
+                    self._pending[key] = items + self._pending.get(key, [])
+                return
+
+    async def flush(self) -> None:
+        """Wait until every recording so far is on disk."""
+        if self._flushing is not None and not self._flushing.done():
+            await self._flushing
+        await self._write_pending()
+
+    @staticmethod
+    def _response_class(response) -> str:
+        cls = type(response)
+        return f"{cls.__module__}:{cls.__qualname__}"
+
+    @staticmethod
+    def _rebuild(entry: Dict[str, Any]):
+        module_name, _, qualname = entry["class"].partition(":")
+        cls = importlib.import_module(module_name)
+        for part in qualname.split("."):
+            cls = getattr(cls, part)
+        return cls.model_validate(entry["body"])
+
+    def _intercept(self, endpoint: str, create):
+        async def replay_or_record(*args, **kwargs):
+            key = payload_hash(endpoint, kwargs)
+            if self.mode == "replay":
+                recorded = self.entries.get(key)
+                if not recorded:
+                    raise CassetteMiss(
+                        f"No recording for {endpoint} ({kwargs.get('model')}) hash={key}"
+                    )
+                cursor = self._cursors.get(key, 0)
+                self._cursors[key] = cursor + 1
+                entry = recorded[cursor % len(recorded)]
+                delay = entry["elapsed"] * self.latency_scale
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                return self._rebuild(entry)
+
+            start = time.monotonic()
+            response = await create(*args, **kwargs)
+            self._pending.setdefault(key, []).append(
+                {
+                    "endpoint": endpoint,
+                    "model": kwargs.get("model"),
+                    "elapsed": round(time.monotonic() - start, 4),
+                    "class": self._response_class(response),
+                    "body": response.model_dump(mode="json", exclude_unset=True),
+                }
+            )
+            if self._flushing is None or self._flushing.done():
+                self._flushing = asyncio.get_running_loop().create_task(self._write_pending())
+            logging.info(f"📼 Recorded {endpoint} ({kwargs.get('model')}) hash={key}")
+            return response
+
+        return replay_or_record
+
+    def wrap(self, client, name: str):
+        """Route the client's completion and transcription calls through the cassette.
+
+        The methods are replaced on the client's resource instances, so SDK
+        type checks (and `instructor.from_openai`/`from_groq`) still see the
+        original client object. Fireworks' AudioInference has no resources;
+        its `transcribe_async` is replaced on the client itself.
+        """
+        chat = getattr(client, "chat", None)
+        if chat is not None:
+            completions = chat.completions
+            completions.create = self._intercept(f"{name}.chat.completions", completions.create)
+        if hasattr(client, "transcribe_async"):
+            client.transcribe_async = self._intercept(
+                f"{name}.audio.transcribe", client.transcribe_async
+            )
+        audio = getattr(client, "audio", None)
+        if audio is not None and hasattr(audio, "transcriptions"):
+            transcriptions = audio.transcriptions
+            transcriptions.create = self._intercept(
+                f"{name}.audio.transcriptions", transcriptions.create
+            )
+        return client
@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+from utils.transcript import WordTimings
+
+
+@dataclass
+class Chunk:
+    """A slice of the recording to transcribe on its own (absolute seconds).
+
+    `start`/`end` include the overlap sent to the ASR; words are kept only if
+    their midpoint falls in [keep_from, keep_until), so each seam is owned by
+    exactly one chunk.
+    """
+
+    start: float
+    end: float
+    keep_from: float
+    keep_until: float
+
+
+def plan_chunks(
+    segments: Sequence[Tuple[float, float]],
+    start: float,
+    end: float,
+    target_seconds: float,
+    overlap_seconds: float,
+) -> List[Chunk]:
+    """Cut at the middle of the first pause after every `target_seconds`.
+
+    Overlaps are capped at half the pause, so they only ever contain silence.
+    """
+    cuts: List[Tuple[float, float]] = []  # (cut time, half pause length)
+    chunk_start = start
+    for (_, prev_end), (next_start, _) in zip(segments, segments[1:]):
+        middle = (prev_end + next_start) / 2
+        if middle - chunk_start >= target_seconds:
+            cuts.append((middle, (next_start - prev_end) / 2))
+            chunk_start = middle
+    # Fold a short tail into the previous chunk.
+    if cuts and end - cuts[-1][0] < target_seconds / 3:
+        cuts.pop()
+
+    bounds = [start] + [cut for cut, _ in cuts] + [end]
+    half_pauses = [0.0] + [half for _, half in cuts] + [0.0]
+    return [
+        Chunk(
+            start=max(start, bounds[i] - min(overlap_seconds, half_pauses[i])),
+            end=min(end, bounds[i + 1] + min(overlap_seconds, half_pauses[i + 1])),
+            keep_from=bounds[i] if i else float("-inf"),
+            keep_until=bounds[i + 1] if i + 1 < len(bounds) - 1 else float("inf"),
+        )
+        for i in range(len(bounds) - 1)
+    ]
+
+
+def stitch(results: List[Tuple[Chunk, str, WordTimings]]) -> Tuple[str, WordTimings]:
+    """Merge per-chunk (text, words) with words already on the absolute timeline.
+
+    Words outside a chunk's keep range are dropped, together with the same
+    number of leading/trailing tokens from that chunk's text.
+    """
+    import numpy as np
+
+    texts, parts = [], []
+    for chunk, text, words in results:
+        midpoints = words.midpoints
+        kept = np.flatnonzero((midpoints >= chunk.keep_from) & (midpoints < chunk.keep_until))
+        if len(kept):
+            leading, trailing = int(kept[0]), len(words) - 1 - int(kept[-1])
+        else:
+            leading, trailing = len(words), 0
+        tokens = text.split()
+        tokens = tokens[leading : len(tokens) - trailing if trailing else None]
+        if tokens:
+            texts.append(" ".join(tokens))
+        parts.append(words.take(kept))
+    return " ".join(texts), WordTimings.concat(parts)
@@ -0,0 +1,56 @@
+"""Remaining time of the current request, visible to every stage.
+
+The servicer opens a scope from the gRPC deadline; tasks started with
+`asyncio.gather`/`create_task` inherit it through the context, so nested
+stages can check it without the value being passed around.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from config import settings
+from utils import metrics
+
+# Durations a stage must have recorded before the deadline check trusts them
+MIN_OBSERVATIONS = 5
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Limit the enclosed work to `seconds` from now (None: no deadline)."""
+    token = _deadline.set(None if seconds is None else time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def ensure_time_for(stage: str) -> None:
+    """Refuse to start `stage` when it would almost surely overrun the deadline:
+    the time left is below the DEADLINE_SKIP_QUANTILE quantile of its observed
+    durations (a fast run of it), not merely below its average."""
+    left = remaining()
+    if left is None:
+        return
+    name = f"stage_seconds.{stage}"
+    if left > 0 and metrics.count(name) < MIN_OBSERVATIONS:
+        return
+    needed = metrics.quantile(name, settings.DEADLINE_SKIP_QUANTILE)
+    if left <= needed:
+        metrics.increment(f"deadline.skipped.{stage}")
+        raise DeadlineExceeded(f"{stage} takes ~{needed:.1f}s but only {left:.1f}s remain")
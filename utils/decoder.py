@@ -0,0 +1,253 @@
+"""Audio decoding: container sniffing, in-process fast path, ffmpeg worker pool.
+
+Uploads arrive as wav, mp3, webm and the odd m4a. Formats libsndfile can read
+(wav, flac, ogg and, with libsndfile >= 1.1, mp3) are decoded in-process by
+soundfile. Everything else goes to a pool of pre-started ffmpeg workers: each
+worker is already running and blocked on its stdin when a decode comes in,
+gets the file over one pipe and streams float PCM back over another, and is
+replaced in the background once it exits. DECODER_WORKERS caps how many
+ffmpeg processes decode at once. The pool belongs to the process that built
+it; a forked child builds its own instead of sharing the parent's pipes.
+
+The analysis stages get a mono signal (the channel mean). `mono=False` keeps
+the file's channels, as (frames, channels) samples, for callers that pass the
+audio on rather than analyse it.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import struct
+import subprocess
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+from config import settings
+from utils import metrics
+from utils.audio import DecodedAudio
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Containers soundfile decodes in-process, when libsndfile has the format.
+NATIVE_FORMATS = {"wav": "WAV", "flac": "FLAC", "ogg": "OGG", "mp3": "MP3"}
+# Containers whose index may sit at the end of the file; ffmpeg needs to seek.
+SEEKABLE_FORMATS = {"mp4"}
+
+HEADER_BYTES = 16
+
+
+def sniff(head: bytes) -> str:
+    """Container of a file from its first bytes: wav, flac, ogg, mp3, webm, mp4 or unknown."""
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:3] == b"ID3" or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return "mp3"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    return "unknown"
+
+
+def sniff_file(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        return sniff(f.read(HEADER_BYTES))
+
+
+def _native_available(container: str) -> bool:
+    import soundfile as sf
+
+    return NATIVE_FORMATS.get(container) in sf.available_formats()
+
+
+def _mix_down(frames: np.ndarray) -> np.ndarray:
+    """Channel mean of interleaved (frames, channels) float32 samples.
+
+    A matrix-vector product rather than `mean(axis=1)`, whose strided
+    reduction costs more than the decode itself on long stereo files.
+    """
+    import numpy as np
+
+    channels = frames.shape[1]
+    if channels == 1:
+        return frames[:, 0]
+    return frames @ np.full(channels, 1 / channels, dtype=np.float32)
+
+
+def decode_native(file_path: str, mono: bool = True) -> DecodedAudio:
+    """float32 at the file's own rate, read in-process by libsndfile."""
+    import soundfile as sf
+
+    samples, sample_rate = sf.read(file_path, dtype="float32", always_2d=True)
+    return DecodedAudio(samples=_mix_down(samples) if mono else samples, sample_rate=sample_rate)
+
+
+def _parse_wav(data: bytes, mono: bool = True) -> DecodedAudio:
+    """ffmpeg's float WAV written to a pipe: the sizes in the header are not
+    filled in, so everything after the data chunk header is taken as PCM."""
+    import numpy as np
+
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("ffmpeg did not produce WAV output")
+    position, channels, sample_rate = 12, None, None
+    while position + 8 <= len(data):
+        chunk, size = data[position : position + 4], struct.unpack_from("<I", data, position + 4)[0]
+        if chunk == b"fmt ":
+            channels, sample_rate = struct.unpack_from("<HI", data, position + 10)
+        elif chunk == b"data":
+            if sample_rate is None:
+                break
+            pcm = data[position + 8 :]
+            frames = len(pcm) // (4 * channels)
+            samples = np.frombuffer(pcm[: frames * 4 * channels], dtype="<f4")
+            samples = samples.reshape(frames, channels)
+            return DecodedAudio(
+                samples=_mix_down(samples) if mono else samples, sample_rate=sample_rate
+            )
+        position += 8 + size + (size & 1)
+    raise ValueError("ffmpeg WAV output has no data chunk")
+
+
+class FfmpegPool:
+    """Pre-started ffmpeg processes reading a container on stdin and writing
+    float32 WAV at the source rate on stdout.
+
+    Channels are averaged here rather than by ffmpeg's `-ac 1`, whose
+    power-preserving downmix is louder than the channel mean soundfile and
+    librosa give.
+    """
+
+    def __init__(self, size: int, binary: str = "ffmpeg"):
+        self.size = size
+        self.binary = binary
+        self._idle: List[subprocess.Popen] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(size, 1))
+        self.pid = os.getpid()
+
+    def _command(self, source: str) -> List[str]:
+        return [
+            self.binary,
+            "-hide_banner",
+            "-loglevel", "error",
+            "-i", source,
+            "-map", "0:a:0",
+            "-c:a", "pcm_f32le",
+            "-map_metadata", "-1",
+            "-f", "wav",
+            "pipe:1",
+        ]  # fmt: skip
+
+    def _spawn(self, source: str = "pipe:0") -> subprocess.Popen:
+        return subprocess.Popen(
+            self._command(source),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    def _refill(self) -> None:
+        with self._lock:
+            missing = self.size - len(self._idle)
+            for _ in range(missing):
+                self._idle.append(self._spawn())
+
+    def warm(self) -> None:
+        """Start the idle workers now rather than on the first decode."""
+        self._refill()
+
+    def _take(self) -> subprocess.Popen:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.poll() is None:
+                    return worker
+        return self._spawn()
+
+    @staticmethod
+    def _finish(worker: subprocess.Popen, data: Optional[bytes], mono: bool) -> DecodedAudio:
+        out, err = worker.communicate(data)
+        if worker.returncode != 0:
+            lines = err.decode("utf-8", "replace").strip().splitlines()
+            detail = lines[-1] if lines else ""
+            raise RuntimeError(f"ffmpeg exited with {worker.returncode}: {detail}")
+        return _parse_wav(out, mono)
+
+    def decode_bytes(self, data: bytes, mono: bool = True) -> DecodedAudio:
+        with self._slots:
+            worker = self._take()
+            try:
+                return self._finish(worker, data, mono)
+            finally:
+                # The replacement starts up while the caller works on the result.
+                if self.size:
+                    threading.Thread(target=self._refill, daemon=True).start()
+
+    def decode_path(self, file_path: str, mono: bool = True) -> DecodedAudio:
+        """For containers ffmpeg cannot decode from a pipe (index at the end)."""
+        with self._slots:
+            return self._finish(self._spawn(file_path), None, mono)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle, self.size = self._idle, [], 0
+        for worker in idle:
+            if self.pid == os.getpid():
+                worker.kill()
+                worker.communicate()
+            else:
+                # Inherited across a fork: the parent owns the process; only
+                # let go of this copy of its pipes.
+                for pipe in (worker.stdin, worker.stdout, worker.stderr):
+                    pipe.close()
+
+
+_pool: Optional[FfmpegPool] = None
+_pool_guard = threading.Lock()
+
+
+def ffmpeg_pool() -> FfmpegPool:
+    """This process's pool; one inherited from a parent process is dropped."""
+    global _pool
+    with _pool_guard:
+        if _pool is not None and _pool.pid != os.getpid():
+            _pool.close()
+            _pool = None
+        if _pool is None:
+            _pool = FfmpegPool(settings.DECODER_WORKERS, settings.FFMPEG_BINARY)
+            atexit.register(_pool.close)
+        return _pool
+
+
+def decode_file(file_path: str, mono: bool = True) -> DecodedAudio:
+    """Decode any supported upload to float32 at its own sample rate: mono, or
+    with `mono=False` the file's channels as (frames, channels)."""
+    start = time.perf_counter()
+    container = sniff_file(file_path)
+    path = "ffmpeg"
+    decoded = None
+    if container in NATIVE_FORMATS and _native_available(container):
+        try:
+            decoded = decode_native(file_path, mono)
+            path = "native"
+        except Exception as e:
+            # e.g. an Ogg stream with a codec this libsndfile lacks
+            logging.warning(f"soundfile could not decode {file_path} ({container}): {e}")
+    if decoded is None:
+        pool = ffmpeg_pool()
+        if container in SEEKABLE_FORMATS:
+            decoded = pool.decode_path(file_path, mono)
+        else:
+            with open(file_path, "rb") as f:
+                decoded = pool.decode_bytes(f.read(), mono)
+    metrics.increment(f"decoder.{path}.{container}")
+    metrics.observe(f"decoder.{path}.seconds", time.perf_counter() - start)
+    return decoded
@@ -1,17 +1,82 @@
 import time
 import logging
+import functools
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set
+
+from utils import metrics
+from utils.deadline import ensure_time_for
+from utils.profiling import stage_memory
 
 logging.basicConfig(level=logging.INFO)
 
+_stage_timings: contextvars.ContextVar[Optional[Dict[str, List[float]]]] = (
+    contextvars.ContextVar("stage_timings", default=None)
+)
+
+
+@contextmanager
+def collect_stage_timings():
+    """Collect the durations recorded by `log_execution_time` in this context.
+
+    Tasks spawned with `asyncio.gather` inherit a copy of the context, so the
+    stages they run are recorded into the same dict.
+    """
+    timings: Dict[str, List[float]] = {}
+    token = _stage_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _stage_timings.reset(token)
+
+
+_current_stage: contextvars.ContextVar[str] = contextvars.ContextVar("current_stage", default="")
+
+
+def current_stage() -> str:
+    """Name of the innermost `log_execution_time` function running in this context."""
+    return _current_stage.get()
+
+
+def record_stage_time(name: str, seconds: float) -> None:
+    timings = _stage_timings.get()
+    if timings is not None:
+        timings.setdefault(name, []).append(seconds)
+
+
+# Stages seen running other stages (e.g. `evaluate`); they are not deadline-gated
+_composite_stages: Set[str] = set()
+
 
 def log_execution_time(func):
-    """Decorator to log execution time of a function"""
+    """Decorator to log execution time of a function.
+
+    Also the stage hook: a leaf stage is not started when the request deadline
+    leaves too little time for it (see utils.deadline), and memory profiles
+    are broken down by stage (see utils.profiling). Stages that run other
+    stages are never skipped whole; their leaves are gated one by one, so the
+    request can still return what finished.
+    """
 
+    @functools.wraps(func)
     async def wrapper(*args, **kwargs):
+        parent = _current_stage.get()
+        if parent:
+            _composite_stages.add(parent)
+        if func.__name__ not in _composite_stages:
+            ensure_time_for(func.__name__)
+        token = _current_stage.set(func.__name__)
         start_time = time.monotonic()
-        result = await func(*args, **kwargs)
-        end_time = time.monotonic()
-        logging.info(f"⏳ {func.__name__} took {end_time - start_time:.4f} seconds")
-        return result
+        try:
+            with stage_memory(func.__name__):
+                return await func(*args, **kwargs)
+        finally:
+            _current_stage.reset(token)
+            elapsed = time.monotonic() - start_time
+            record_stage_time(func.__name__, elapsed)
+            metrics.observe(f"stage_seconds.{func.__name__}", elapsed)
+            metrics.histogram(f"stage_seconds.{func.__name__}", elapsed)
+            logging.info(f"⏳ {func.__name__} took {elapsed:.4f} seconds")
 
     return wrapper
@@ -0,0 +1,98 @@
+import bisect
+import threading
+from collections import defaultdict
+from typing import Dict, Sequence
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = defaultdict(float)
+_observations: Dict[str, Dict[str, float]] = {}
+_histograms: Dict[str, Dict] = {}
+
+SECONDS_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+
+
+def increment(name: str, value: float = 1.0) -> None:
+    with _lock:
+        _counters[name] += value
+
+
+def observe(name: str, value: float) -> None:
+    with _lock:
+        stats = _observations.setdefault(
+            name, {"count": 0, "sum": 0.0, "max": float("-inf")}
+        )
+        stats["count"] += 1
+        stats["sum"] += value
+        stats["max"] = max(stats["max"], value)
+
+
+def histogram(name: str, value: float, buckets: Sequence[float] = SECONDS_BUCKETS) -> None:
+    """Count `value` into the first bucket whose upper bound holds it (last: +Inf).
+
+    The buckets of a histogram are fixed by its first observation.
+    """
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = {
+                "buckets": tuple(buckets),
+                "counts": [0] * (len(buckets) + 1),
+                "count": 0,
+                "sum": 0.0,
+            }
+        hist["counts"][bisect.bisect_left(hist["buckets"], value)] += 1
+        hist["count"] += 1
+        hist["sum"] += value
+
+
+def mean(name: str, default: float = 0.0) -> float:
+    with _lock:
+        stats = _observations.get(name)
+        return stats["sum"] / stats["count"] if stats else default
+
+
+def count(name: str) -> int:
+    with _lock:
+        hist = _histograms.get(name)
+        return hist["count"] if hist else 0
+
+
+def quantile(name: str, q: float, default: float = 0.0) -> float:
+    """Estimate the `q` quantile of a histogram, interpolating linearly inside
+    the bucket that holds it (values past the last bound count as that bound)."""
+    with _lock:
+        hist = _histograms.get(name)
+        if not hist or not hist["count"]:
+            return default
+        rank = q * hist["count"]
+        cumulative, lower = 0, 0.0
+        for upper, bucket_count in zip(hist["buckets"], hist["counts"]):
+            if bucket_count and cumulative + bucket_count >= rank:
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = upper
+        return lower
+
+
+def snapshot() -> Dict[str, Dict]:
+    """Process-level counters, observation summaries and histograms."""
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "observations": {
+                name: {**stats, "mean": stats["sum"] / stats["count"]}
+                for name, stats in _observations.items()
+            },
+            "histograms": {
+                name: {
+                    "buckets": [
+                        *({"le": bound, "count": count} for bound, count in zip(hist["buckets"], hist["counts"])),
+                        {"le": "+Inf", "count": hist["counts"][-1]},
+                    ],
+                    "count": hist["count"],
+                    "sum": hist["sum"],
+                }
+                for name, hist in _histograms.items()
+            },
+        }
@@ -1,33 +1,32 @@
-import re
+from typing import Dict, Tuple
 
+from utils.transcript import TOKEN_RE, TranscriptIndex, normalize
 
-def find_all_word_indices(text, word_list):
-    word_indices = {word: [] for word in word_list}
 
-    for word in set(word_list):
-        matches = list(re.finditer(r"\b" + re.escape(word) + r"\b", text))
-        for match in matches:
-            start, end = match.start(), match.end() - 1
-            word_indices[word].append((start, end))
+def update_transcription_error_indices(index: TranscriptIndex, errors):
+    """Point each error at the next unused occurrence of its word or phrase.
 
-    return word_indices
-
-
-def update_transcription_error_indices(transcription, errors):
-    words_to_find = [entry.transcribedWord for entry in errors]
-    word_positions = find_all_word_indices(transcription, words_to_find)
-
-    word_occurrences = {
-        word: iter(word_positions.get(word, [])) for word in words_to_find
-    }
+    A multi-word `transcribedWord` ("used to") spans its consecutive tokens.
+    `errorEndIndexTranscription` is inclusive; (-1, -1) when the word is not
+    in the transcript.
+    """
+    used: Dict[Tuple[str, ...], int] = {}
 
     for entry in errors:
-        word = entry.transcribedWord
-        if word in word_occurrences:
-            indices = next(word_occurrences[word], (-1, -1))
-            (
-                entry.errorStartIndexTranscription,
-                entry.errorEndIndexTranscription,
-            ) = indices
+        key = tuple(normalize(token) for token in TOKEN_RE.findall(entry.transcribedWord))
+        occurrences = index.phrase_occurrences(entry.transcribedWord)
+        nth = used.get(key, 0)
+        used[key] = nth + 1
+        if nth < len(occurrences):
+            first = occurrences[nth]
+            start = index.char_span(first)[0]
+            end = index.char_span(first + len(key) - 1)[1]
+            indices = (start, end - 1)
+        else:
+            indices = (-1, -1)
+        (
+            entry.errorStartIndexTranscription,
+            entry.errorEndIndexTranscription,
+        ) = indices
 
     return errors
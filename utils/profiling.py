@@ -0,0 +1,353 @@
+"""On-demand CPU and memory profiling of a live worker.
+
+A capture is started by the admin service for the next N requests and/or T
+seconds. Requests join it in `request_scope()`; while at least one profiled
+request is in flight:
+
+- cProfile runs on the event loop thread. It sees everything the loop runs in
+  that time, including unprofiled requests interleaved with the profiled ones.
+- calls a profiled request hands to worker threads (`asyncio.to_thread`, i.e.
+  the DSP stages) are profiled on their thread through ProfilingExecutor, the
+  loop's default executor, and merged into the capture.
+- with memory profiling, tracemalloc traces allocations and every
+  `log_execution_time` stage of a profiled request records the allocations
+  it left behind (a snapshot diff). Stages that run concurrently see each
+  other's allocations. Taking snapshots is slow and shows up in the CPU
+  profile of the same capture; profile CPU and memory in separate captures
+  when the timings matter.
+
+When no capture runs, PROFILE_SAMPLE_RATE of requests are profiled (CPU only)
+one at a time, each persisted under PROFILE_DIR/samples. Artifacts of a
+capture go to PROFILE_DIR/<capture id>: cpu.pstats, cpu.txt, memory.json.
+They are written on a worker thread so that a capture ending does not stall
+the requests on the loop; `Profiler.stop()` waits for them.
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set
+
+from config import settings
+from utils import metrics
+
+CPU_SUMMARY_LINES = 40
+# Allocation sites that are profiling or import machinery, not the stage
+_IGNORED_SITES = (tracemalloc.__file__, __file__, "<frozen ")
+
+
+class ProfilingBusy(Exception):
+    pass
+
+
+@dataclass
+class StageMemory:
+    calls: int = 0
+    net_bytes: int = 0
+    # "file:line" -> [size, count]
+    top: Dict[str, List[int]] = field(default_factory=dict)
+
+
+@dataclass
+class Capture:
+    id: str
+    cpu: bool
+    memory: bool
+    # 0: unlimited
+    request_limit: int = 0
+    until: Optional[float] = None
+    sample: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+    requests_started: int = 0
+    in_flight: int = 0
+    finished: bool = False
+    ended_at: Optional[float] = None
+    loop_profile: Optional[cProfile.Profile] = None
+    thread_profiles: List[cProfile.Profile] = field(default_factory=list)
+    stages: Dict[str, StageMemory] = field(default_factory=dict)
+    started_tracemalloc: bool = False
+    artifact_dir: str = ""
+    cpu_summary: str = ""
+    # Set by Profiler.finish: writes the artifacts off the loop
+    written: Optional[asyncio.Task] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def accepts_requests(self) -> bool:
+        if self.finished or (self.until is not None and time.monotonic() >= self.until):
+            return False
+        return not self.request_limit or self.requests_started < self.request_limit
+
+    @property
+    def seconds_left(self) -> float:
+        return max(self.until - time.monotonic(), 0.0) if self.until is not None else 0.0
+
+    @property
+    def seconds(self) -> float:
+        return (self.ended_at or time.monotonic()) - self.started_at
+
+    def add_thread_profile(self, profile: cProfile.Profile) -> None:
+        with self.lock:
+            if not self.finished:
+                self.thread_profiles.append(profile)
+
+    def stats(self) -> Optional[pstats.Stats]:
+        profiles = [p for p in [self.loop_profile, *self.thread_profiles] if p is not None]
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+
+_capture: contextvars.ContextVar[Optional[Capture]] = contextvars.ContextVar(
+    "profile_capture", default=None
+)
+
+
+def _capture_id() -> str:
+    # Sorts by start time, which prune_samples relies on.
+    return time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+
+class Profiler:
+    """The process's one capture slot; used from the event loop thread only."""
+
+    def __init__(self):
+        self.active: Optional[Capture] = None
+        self.last: Optional[Capture] = None
+        self.sample_rate = settings.PROFILE_SAMPLE_RATE
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Artifact writes in flight; the loop only keeps weak references to tasks.
+        self._writes: Set[asyncio.Task] = set()
+
+    def start(
+        self, requests: int = 0, seconds: float = 0.0, cpu: bool = True, memory: bool = False
+    ) -> Capture:
+        if self.active is not None:
+            if not self.active.sample:
+                raise ProfilingBusy(f"Capture {self.active.id} is still running")
+            self.finish(self.active)
+        capture = Capture(
+            id=_capture_id(),
+            cpu=cpu,
+            memory=memory,
+            request_limit=max(requests, 0),
+            until=time.monotonic() + seconds if seconds > 0 else None,
+        )
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start(settings.PROFILE_TRACEMALLOC_FRAMES)
+            capture.started_tracemalloc = True
+        self.active = capture
+        if seconds > 0:
+            self._timer = asyncio.get_running_loop().call_later(seconds, self.finish, capture)
+        logging.info(
+            f"Profiling capture {capture.id} started "
+            f"(requests={requests or '-'}, seconds={seconds or '-'}, cpu={cpu}, memory={memory})"
+        )
+        return capture
+
+    async def stop(self) -> Optional[Capture]:
+        """Finish the running capture; returns it, or the last finished one,
+        once its artifacts are written."""
+        if self.active is not None:
+            self.finish(self.active)
+        if self.last is not None and self.last.written is not None:
+            await asyncio.shield(self.last.written)
+        return self.last
+
+    def finish(self, capture: Capture) -> None:
+        if capture.finished:
+            return
+        with capture.lock:
+            capture.finished = True
+        capture.ended_at = time.monotonic()
+        if capture.loop_profile is not None and capture.in_flight:
+            capture.loop_profile.disable()
+        if capture.started_tracemalloc:
+            tracemalloc.stop()
+        if self.active is capture:
+            self.active = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        capture.artifact_dir = os.path.join(settings.PROFILE_DIR, capture.id)
+        capture.written = asyncio.get_running_loop().create_task(
+            asyncio.to_thread(_write_artifacts, capture)
+        )
+        self._writes.add(capture.written)
+        capture.written.add_done_callback(self._writes.discard)
+        metrics.increment("profiling.samples" if capture.sample else "profiling.captures")
+        if not capture.sample:
+            self.last = capture
+            logging.info(
+                f"Profiling capture {capture.id} finished: {capture.requests_started} requests "
+                f"in {capture.seconds:.1f}s, artifacts in {capture.artifact_dir}"
+            )
+
+    def _join(self) -> Optional[Capture]:
+        capture = self.active
+        if capture is not None and capture.accepts_requests():
+            return capture
+        if capture is None and self.sample_rate > 0 and random.random() < self.sample_rate:
+            self.active = Capture(
+                id=f"samples/{_capture_id()}", cpu=True, memory=False, request_limit=1, sample=True
+            )
+            return self.active
+        return None
+
+    @contextmanager
+    def request_scope(self) -> Iterator[Optional[Capture]]:
+        """Profile the enclosed request if a capture (or the sampler) takes it."""
+        capture = self._join()
+        if capture is None:
+            yield None
+            return
+        capture.requests_started += 1
+        capture.in_flight += 1
+        if capture.cpu and capture.in_flight == 1:
+            if capture.loop_profile is None:
+                capture.loop_profile = cProfile.Profile()
+            capture.loop_profile.enable()
+        token = _capture.set(capture)
+        try:
+            yield capture
+        finally:
+            _capture.reset(token)
+            capture.in_flight -= 1
+            if capture.finished:
+                return
+            if capture.cpu and not capture.in_flight:
+                capture.loop_profile.disable()
+            if not capture.in_flight and not capture.accepts_requests():
+                self.finish(capture)
+
+
+profiler = Profiler()
+
+
+def current_capture() -> Optional[Capture]:
+    capture = _capture.get()
+    return capture if capture is not None and not capture.finished else None
+
+
+class ProfilingExecutor(ThreadPoolExecutor):
+    """Default executor that profiles the calls of profiled requests on their
+    worker thread. `submit` runs on the loop thread, in the request's context."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        capture = current_capture()
+        if capture is None or not capture.cpu:
+            return super().submit(fn, *args, **kwargs)
+
+        def profiled():
+            profile = cProfile.Profile()
+            try:
+                return profile.runcall(fn, *args, **kwargs)
+            finally:
+                capture.add_thread_profile(profile)
+
+        return super().submit(profiled)
+
+
+@contextmanager
+def stage_memory(stage: str) -> Iterator[None]:
+    """Record the allocations `stage` leaves behind, for memory captures."""
+    capture = current_capture()
+    if capture is None or not capture.memory or not tracemalloc.is_tracing():
+        yield
+        return
+    before = tracemalloc.take_snapshot()
+    try:
+        yield
+    finally:
+        if tracemalloc.is_tracing():
+            diff = [
+                stat
+                for stat in tracemalloc.take_snapshot().compare_to(before, "lineno")
+                if not stat.traceback[0].filename.startswith(_IGNORED_SITES)
+            ]
+            with capture.lock:
+                entry = capture.stages.setdefault(stage, StageMemory())
+                entry.calls += 1
+                entry.net_bytes += sum(stat.size_diff for stat in diff)
+                for stat in diff[: settings.PROFILE_TOP_ALLOCATIONS]:
+                    if stat.size_diff <= 0:
+                        break
+                    frame = stat.traceback[0]
+                    sizes = entry.top.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+                    sizes[0] += stat.size_diff
+                    sizes[1] += stat.count_diff
+
+
+def top_allocations(entry: StageMemory) -> List[List]:
+    """[location, bytes, blocks] of the stage's largest allocation sites."""
+    ranked = sorted(entry.top.items(), key=lambda item: item[1][0], reverse=True)
+    return [
+        [location, size, count]
+        for location, (size, count) in ranked[: settings.PROFILE_TOP_ALLOCATIONS]
+    ]
+
+
+def _write_artifacts(capture: Capture) -> None:
+    try:
+        write_artifacts(capture)
+    except OSError as e:
+        logging.error(f"Could not write profile {capture.id}: {e}")
+
+
+def write_artifacts(capture: Capture) -> None:
+    """Write the capture's profiles to `capture.artifact_dir`; blocking."""
+    os.makedirs(capture.artifact_dir, exist_ok=True)
+    stats = capture.stats()
+    if stats is not None:
+        stats.dump_stats(os.path.join(capture.artifact_dir, "cpu.pstats"))
+        stats.stream = io.StringIO()
+        stats.sort_stats("cumulative").print_stats(CPU_SUMMARY_LINES)
+        capture.cpu_summary = stats.stream.getvalue()
+        with open(os.path.join(capture.artifact_dir, "cpu.txt"), "w") as f:
+            f.write(capture.cpu_summary)
+    if capture.stages:
+        memory = {
+            stage: {
+                "calls": entry.calls,
+                "net_bytes": entry.net_bytes,
+                "top": top_allocations(entry),
+            }
+            for stage, entry in sorted(capture.stages.items())
+        }
+        with open(os.path.join(capture.artifact_dir, "memory.json"), "w") as f:
+            json.dump(memory, f, indent=2)
+    if capture.sample:
+        prune_samples()
+
+
+def prune_samples() -> None:
+    """Keep the newest PROFILE_MAX_SAMPLES sampled profiles."""
+    directory = os.path.join(settings.PROFILE_DIR, "samples")
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return
+    for name in names[: max(len(names) - settings.PROFILE_MAX_SAMPLES, 0)]:
+        path = os.path.join(directory, name)
+        try:
+            for child in os.listdir(path):
+                os.remove(os.path.join(path, child))
+            os.rmdir(path)
+        except OSError:
+            # Another sample's writer thread is pruning it too.
+            continue
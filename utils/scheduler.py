@@ -0,0 +1,235 @@
+"""Admission in front of `SpeakingEvaluationService.evaluate`.
+
+Every evaluation takes a slot from the process's FairScheduler first; at most
+SCHED_MAX_CONCURRENT run at once and the rest wait here rather than piling up
+inside grpc.aio. Waiters are served:
+
+- by lane: `interactive` (live practice) before `batch` (bulk uploads and
+  jobs). Batch never holds the last SCHED_INTERACTIVE_RESERVED slots, so a
+  student finds one free even while a backlog of batch work drains.
+- across tenants, by weighted fair queuing: when a request reaches the head
+  of its tenant's queue it is tagged max(V, tenant's last tag) + 1/weight,
+  the smallest tag goes first
+  and V moves to it (self-clocked fair queuing, one clock per lane). A tenant
+  with 500 queued files therefore gets a turn, not the next 500 turns, and a
+  tenant that was idle does not bank credit.
+- within a tenant, earliest deadline first (no deadline last, then arrival).
+
+A tenant runs at most SCHED_TENANT_MAX_CONCURRENT evaluations at once and may
+queue at most SCHED_MAX_QUEUED_PER_TENANT more. Each pre-forked worker process
+schedules its own slots. Time spent waiting is recorded as
+`scheduler.queue_wait_seconds.<lane>`, apart from the stage timings.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from config import settings
+from utils import metrics
+
+INTERACTIVE, BATCH = "interactive", "batch"
+LANES = (INTERACTIVE, BATCH)
+DEFAULT_TENANT = "default"
+
+# gRPC request metadata
+TENANT_KEY = "x-tenant-id"
+PRIORITY_KEY = "x-priority"
+
+
+class SchedulerFull(Exception):
+    pass
+
+
+def request_identity(metadata) -> Tuple[str, str]:
+    """(tenant, lane) from gRPC invocation metadata; unknown priorities are interactive."""
+    values = dict(metadata or ())
+    tenant = values.get(TENANT_KEY) or DEFAULT_TENANT
+    lane = values.get(PRIORITY_KEY, INTERACTIVE)
+    return tenant, lane if lane in LANES else INTERACTIVE
+
+
+@dataclass(eq=False)
+class _Waiter:
+    tenant: str
+    lane: str
+    deadline: Optional[float]
+    seq: int
+    enqueued_at: float
+    future: asyncio.Future
+
+    @property
+    def order(self) -> Tuple[float, int]:
+        return (self.deadline if self.deadline is not None else math.inf, self.seq)
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return self.order < other.order
+
+
+@dataclass
+class _Lane:
+    # Virtual time: the tag of the last request served in this lane.
+    clock: float = 0.0
+    last_tags: Dict[str, float] = field(default_factory=dict)
+    # Tag of each backlogged tenant's head waiter, fixed when it got there.
+    head_tags: Dict[str, float] = field(default_factory=dict)
+    # tenant -> heap of waiters, earliest deadline first
+    queues: Dict[str, List[_Waiter]] = field(default_factory=dict)
+    running: int = 0
+
+
+class FairScheduler:
+    def __init__(
+        self,
+        capacity: int = settings.SCHED_MAX_CONCURRENT,
+        tenant_cap: int = settings.SCHED_TENANT_MAX_CONCURRENT,
+        interactive_reserved: int = settings.SCHED_INTERACTIVE_RESERVED,
+        max_queued_per_tenant: int = settings.SCHED_MAX_QUEUED_PER_TENANT,
+        weights: Dict[str, float] = settings.SCHED_TENANT_WEIGHTS,
+    ):
+        self.capacity = capacity
+        self.tenant_cap = tenant_cap or capacity
+        self.batch_slots = max(capacity - interactive_reserved, 1)
+        self.max_queued_per_tenant = max_queued_per_tenant
+        self.weights = weights
+        self.lanes = {lane: _Lane() for lane in LANES}
+        self.running: Dict[str, int] = {}
+        self.queued: Dict[str, int] = {}
+        self._seq = itertools.count()
+
+    @property
+    def in_use(self) -> int:
+        return sum(lane.running for lane in self.lanes.values())
+
+    def _tag(self, lane: _Lane, tenant: str) -> float:
+        start = max(lane.clock, lane.last_tags.get(tenant, 0.0))
+        return start + 1.0 / self.weights.get(tenant, 1.0)
+
+    def _pick(self, name: str) -> Optional[_Waiter]:
+        """Pop the next waiter of lane `name` whose tenant is under its cap."""
+        lane = self.lanes[name]
+        best = None
+        for tenant, queue in lane.queues.items():
+            if self.running.get(tenant, 0) >= self.tenant_cap:
+                continue
+            key = (lane.head_tags[tenant], queue[0].order)
+            if best is None or key < best[0]:
+                best = (key, tenant)
+        if best is None:
+            return None
+        (tag, _), tenant = best
+        queue = lane.queues[tenant]
+        waiter = heapq.heappop(queue)
+        lane.clock = lane.last_tags[tenant] = tag
+        if queue:
+            lane.head_tags[tenant] = self._tag(lane, tenant)
+        else:
+            self._forget(lane, tenant)
+        return waiter
+
+    @staticmethod
+    def _forget(lane: _Lane, tenant: str) -> None:
+        """Drop the state of a tenant whose queue in `lane` emptied.
+
+        Tenants are whatever clients send, so nothing may outlive their
+        requests. A last tag at or behind the clock changes no future tag
+        (`_tag` takes the max), so dropping it loses no fairness.
+        """
+        del lane.queues[tenant], lane.head_tags[tenant]
+        if lane.last_tags.get(tenant, math.inf) <= lane.clock:
+            del lane.last_tags[tenant]
+
+    def _dequeued(self, tenant: str) -> None:
+        self.queued[tenant] -= 1
+        if not self.queued[tenant]:
+            del self.queued[tenant]
+
+    def _dispatch(self) -> None:
+        while self.in_use < self.capacity:
+            waiter = self._pick(INTERACTIVE)
+            if waiter is None and self.lanes[BATCH].running < self.batch_slots:
+                waiter = self._pick(BATCH)
+            if waiter is None:
+                return
+            self._dequeued(waiter.tenant)
+            self.running[waiter.tenant] = self.running.get(waiter.tenant, 0) + 1
+            self.lanes[waiter.lane].running += 1
+            waiter.future.set_result(None)
+
+    def _release(self, waiter: _Waiter) -> None:
+        self.running[waiter.tenant] -= 1
+        if not self.running[waiter.tenant]:
+            del self.running[waiter.tenant]
+        self.lanes[waiter.lane].running -= 1
+        self._dispatch()
+
+    def _withdraw(self, waiter: _Waiter) -> None:
+        lane = self.lanes[waiter.lane]
+        queue = lane.queues.get(waiter.tenant, [])
+        if waiter in queue:
+            queue.remove(waiter)
+            heapq.heapify(queue)
+            if not queue:
+                self._forget(lane, waiter.tenant)
+            self._dequeued(waiter.tenant)
+
+    @asynccontextmanager
+    async def slot(
+        self, tenant: str = DEFAULT_TENANT, lane: str = INTERACTIVE, timeout: Optional[float] = None
+    ) -> AsyncIterator[float]:
+        """Hold one evaluation slot; yields the seconds spent waiting for it.
+
+        `timeout` is the request's remaining time; it orders the tenant's own
+        waiters (earliest deadline first). Raises SchedulerFull when the
+        tenant already has SCHED_MAX_QUEUED_PER_TENANT requests waiting.
+        """
+        if self.capacity <= 0:
+            yield 0.0
+            return
+        if self.queued.get(tenant, 0) >= self.max_queued_per_tenant:
+            metrics.increment(f"scheduler.rejected.{lane}")
+            raise SchedulerFull(
+                f"Tenant {tenant} already has {self.max_queued_per_tenant} requests queued"
+            )
+
+        now = time.monotonic()
+        waiter = _Waiter(
+            tenant=tenant,
+            lane=lane,
+            deadline=None if timeout is None else now + timeout,
+            seq=next(self._seq),
+            enqueued_at=now,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        queues = self.lanes[lane].queues
+        if tenant not in queues:
+            self.lanes[lane].head_tags[tenant] = self._tag(self.lanes[lane], tenant)
+        heapq.heappush(queues.setdefault(tenant, []), waiter)
+        self.queued[tenant] = self.queued.get(tenant, 0) + 1
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted in the same tick the caller was cancelled.
+                self._release(waiter)
+            else:
+                self._withdraw(waiter)
+            metrics.increment(f"scheduler.abandoned.{lane}")
+            raise
+
+        wait = time.monotonic() - waiter.enqueued_at
+        metrics.histogram(f"scheduler.queue_wait_seconds.{lane}", wait)
+        metrics.observe(f"scheduler.queue_wait_seconds.{lane}", wait)
+        if wait >= 1.0:
+            logging.info(f"Tenant {tenant} waited {wait:.2f}s for a {lane} slot")
+        try:
+            yield wait
+        finally:
+            self._release(waiter)
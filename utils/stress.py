@@ -1,8 +1,20 @@
-from nltk.corpus import cmudict
-import pyphen
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_cmu_dict() -> dict:
+    """cmudict is ~130k entries and takes seconds to parse; load on first use."""
+    from nltk.corpus import cmudict
+
+    return cmudict.dict()
+
+
+@lru_cache(maxsize=None)
+def get_pyphen():
+    import pyphen
+
+    return pyphen.Pyphen(lang="en_US")
 
-cmu_dict = cmudict.dict()
-dic = pyphen.Pyphen(lang="en_US")
 
 VALID_ONSETS = {
     "b",
@@ -99,11 +111,12 @@ def advanced_syllabify(word: str, expected_count: int):
 
 
 def get_stress_index(word: str):
+    cmu_dict = get_cmu_dict()
     word_lower = word.lower()
     if word_lower not in cmu_dict:
         return None
 
-    syllables = dic.inserted(word).split("-")
+    syllables = get_pyphen().inserted(word).split("-")
     first_pron = cmu_dict[word_lower][0]
     expected_count = sum(1 for ph in first_pron if ph[-1].isdigit())
 
@@ -129,10 +142,31 @@ def get_stress_index(word: str):
     )
 
 
-WORD_DATABASE = {}
-for word in cmu_dict.keys():
-    details = get_stress_index(word)
-    if details:
-        WORD_DATABASE[word] = details
+# Distinct words looked up from transcripts; learners' vocabularies are far smaller.
+STRESS_CACHE_SIZE = 20_000
+
+
+@lru_cache(maxsize=STRESS_CACHE_SIZE)
+def lookup_stress(word: str):
+    """Stress details for a lowercase word, or None if cmudict cannot place it.
+
+    Equivalent to `WORD_DATABASE.get(word)` without building the whole table.
+    """
+    return get_stress_index(word)
+
+
+@lru_cache(maxsize=None)
+def build_word_database() -> dict:
+    database = {}
+    for word in get_cmu_dict().keys():
+        details = get_stress_index(word)
+        if details:
+            database[word] = details
+    return database
+
 
-print(WORD_DATABASE.get("rarely"))
+def __getattr__(name):
+    # Kept for callers that still want the full table; built on first access.
+    if name == "WORD_DATABASE":
+        return build_word_database()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
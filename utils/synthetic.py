@@ -0,0 +1,51 @@
+import wave
+from typing import List, Tuple
+
+import numpy as np
+
+SCRIPT = (
+    "I rarely like reading English but I find it youthful. "
+    "When I was a child my parents used to take me to the library every weekend. "
+    "Would you like to know why I prefer novels to newspapers? "
+    "First I read the summary, then I skim the chapters, and finally I take notes. "
+    "The more you read, the more natural you become."
+).split()
+
+WORDS_PER_SECOND = 2.5
+
+
+def script_words(duration: float) -> Tuple[str, List[Tuple[str, float, float]]]:
+    """Evenly spread a canned IELTS-style answer over `duration` seconds."""
+    n_words = max(1, int(duration * WORDS_PER_SECOND))
+    step = duration / n_words
+    tokens = [SCRIPT[i % len(SCRIPT)] for i in range(n_words)]
+    words = [
+        (token.strip(".,?"), round(i * step, 3), round(i * step + step * 0.8, 3))
+        for i, token in enumerate(tokens)
+    ]
+    return " ".join(tokens), words
+
+
+def synthesize_speech_like(path: str, duration: float, sr: int = 16000) -> str:
+    """Write a mono wav of voiced 'syllables' with pitch glides and pauses."""
+    rng = np.random.default_rng(int(duration))
+    signal = np.zeros(int(duration * sr), dtype=np.float32)
+    cursor = int(0.3 * sr)
+    while cursor < len(signal):
+        length = int(rng.uniform(0.12, 0.35) * sr)
+        t = np.arange(min(length, len(signal) - cursor)) / sr
+        f0 = rng.uniform(100, 220) + rng.uniform(-40, 40) * t / max(t[-1], 1e-3)
+        phase = 2 * np.pi * np.cumsum(f0) / sr
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+        envelope = np.hanning(len(t))
+        signal[cursor : cursor + len(t)] = 0.3 * voiced * envelope
+        cursor += len(t) + int(rng.uniform(0.03, 0.4) * sr)
+    signal += rng.normal(0, 0.003, len(signal)).astype(np.float32)
+
+    pcm = (np.clip(signal, -1, 1) * 32767).astype("<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sr)
+        f.writeframes(pcm.tobytes())
+    return path
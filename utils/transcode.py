@@ -0,0 +1,45 @@
+import io
+import time
+from typing import Tuple
+
+from utils.audio import DecodedAudio
+
+UPLOAD_SAMPLE_RATE = 16000
+
+# codec -> (soundfile format, subtype, file extension)
+CODECS = {
+    "opus": ("OGG", "OPUS", "ogg"),
+    "mp3": ("MP3", "MPEG_LAYER_III", "mp3"),
+}
+
+
+def encode_for_upload(
+    audio: DecodedAudio, codec: str = "opus", compression_level: float = 0.9
+) -> Tuple[bytes, str, float]:
+    """Downmix/resample to 16 kHz mono and encode with a compact speech codec.
+
+    Multichannel samples are (frames, channels), as `utils.decoder` returns
+    them. Returns (payload, filename, encode seconds). Encoding happens in-process
+    through libsndfile, so no ffmpeg subprocess is spawned.
+    """
+    import numpy as np
+    import soundfile as sf
+    import soxr
+
+    start = time.perf_counter()
+    samples = audio.samples
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    if audio.sample_rate != UPLOAD_SAMPLE_RATE:
+        samples = soxr.resample(samples, audio.sample_rate, UPLOAD_SAMPLE_RATE)
+    fmt, subtype, extension = CODECS[codec]
+    buffer = io.BytesIO()
+    sf.write(
+        buffer,
+        np.clip(samples, -1.0, 1.0).astype(np.float32),
+        UPLOAD_SAMPLE_RATE,
+        format=fmt,
+        subtype=subtype,
+        compression_level=compression_level,
+    )
+    return buffer.getvalue(), f"upload.{extension}", time.perf_counter() - start
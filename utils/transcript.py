@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _floats(values) -> np.ndarray:
+    import numpy as np
+
+    return np.asarray(values, dtype=np.float64).reshape(-1)
+
+
+@dataclass
+class WordTimings:
+    """Word-level ASR timings stored column-wise.
+
+    `starts`/`ends` are float64 arrays in seconds on the original recording's
+    timeline, so the DSP stages can slice pitch tracks with `searchsorted`
+    instead of walking per-word objects.
+    """
+
+    words: List[str] = field(default_factory=list)
+    starts: np.ndarray = None
+    ends: np.ndarray = None
+
+    def __post_init__(self):
+        self.starts = _floats(self.starts if self.starts is not None else [])
+        self.ends = _floats(self.ends if self.ends is not None else [])
+        if not len(self.words) == len(self.starts) == len(self.ends):
+            raise ValueError("words, starts and ends must have the same length")
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Tuple[str, float, float]], offset: float = 0.0
+    ) -> WordTimings:
+        """Build from (word, start, end) rows, shifting times by `offset` (ms precision)."""
+        import numpy as np
+
+        rows = list(rows)
+        return cls(
+            words=[word for word, _, _ in rows],
+            starts=np.round(_floats([start for _, start, _ in rows]) + offset, 3),
+            ends=np.round(_floats([end for _, _, end in rows]) + offset, 3),
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence[WordTimings]) -> WordTimings:
+        import numpy as np
+
+        if not parts:
+            return cls()
+        return cls(
+            words=[word for part in parts for word in part.words],
+            starts=np.concatenate([part.starts for part in parts]),
+            ends=np.concatenate([part.ends for part in parts]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __iter__(self) -> Iterator[Tuple[str, float, float]]:
+        return zip(self.words, self.starts.tolist(), self.ends.tolist())
+
+    @property
+    def midpoints(self) -> np.ndarray:
+        return (self.starts + self.ends) / 2
+
+    def take(self, indices) -> WordTimings:
+        """Subset by integer indices or a boolean mask."""
+        import numpy as np
+
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        return WordTimings(
+            words=[self.words[i] for i in indices.tolist()],
+            starts=self.starts[indices],
+            ends=self.ends[indices],
+        )
+
+    def frame_ranges(self, frame_times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """[lo, hi) indices of the sorted `frame_times` inside each word."""
+        import numpy as np
+
+        return (
+            np.searchsorted(frame_times, self.starts, side="left"),
+            np.searchsorted(frame_times, self.ends, side="right"),
+        )
+
+
+TOKEN_RE = re.compile(r"\w+(?:['’-]\w+)*")
+SENTENCE_END_RE = re.compile(r"[.!?]")
+# How far ahead of the cursor an ASR word may find its transcript token.
+ALIGN_WINDOW = 8
+
+
+def normalize(word: str) -> str:
+    return "".join(ch for ch in word.lower() if ch.isalnum())
+
+
+@dataclass
+class TranscriptIndex:
+    """Tokens of one transcript with their character spans, ASR timings and
+    sentence numbers, built once per request and shared by every stage that
+    reports positions.
+
+    Character ends are exclusive. Times are NaN for tokens no ASR word was
+    aligned to.
+    """
+
+    text: str
+    tokens: List[str]
+    norms: List[str]
+    char_starts: List[int]
+    char_ends: List[int]
+    sentence_ids: List[int]
+    starts: np.ndarray
+    ends: np.ndarray
+    # ASR word position -> token position, -1 when it could not be aligned
+    word_tokens: List[int]
+    _occurrences: Dict[str, List[int]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def build(cls, text: str, words: WordTimings = None) -> TranscriptIndex:
+        import numpy as np
+
+        tokens, char_starts, char_ends, sentence_ids = [], [], [], []
+        sentence, last_end = 0, 0
+        for match in TOKEN_RE.finditer(text):
+            if tokens and SENTENCE_END_RE.search(text, last_end, match.start()):
+                sentence += 1
+            tokens.append(match.group())
+            char_starts.append(match.start())
+            char_ends.append(match.end())
+            sentence_ids.append(sentence)
+            last_end = match.end()
+        norms = [normalize(token) for token in tokens]
+        occurrences: Dict[str, List[int]] = {}
+        for position, norm in enumerate(norms):
+            occurrences.setdefault(norm, []).append(position)
+
+        words = words if words is not None else WordTimings()
+        word_tokens = align(norms, [normalize(word) for word in words.words])
+        starts = np.full(len(tokens), np.nan)
+        ends = np.full(len(tokens), np.nan)
+        aligned = np.asarray(word_tokens, dtype=np.int64)
+        mask = aligned >= 0
+        starts[aligned[mask]] = words.starts[mask]
+        ends[aligned[mask]] = words.ends[mask]
+
+        return cls(
+            text=text,
+            tokens=tokens,
+            norms=norms,
+            char_starts=char_starts,
+            char_ends=char_ends,
+            sentence_ids=sentence_ids,
+            starts=starts,
+            ends=ends,
+            word_tokens=word_tokens,
+            _occurrences=occurrences,
+        )
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def occurrences(self, word: str) -> List[int]:
+        """Token positions of `word` (normalized), in transcript order."""
+        return self._occurrences.get(normalize(word), [])
+
+    def phrase_occurrences(self, phrase: str) -> List[int]:
+        """First-token positions where the tokens of `phrase` appear consecutively."""
+        parts = [normalize(token) for token in TOKEN_RE.findall(phrase)]
+        if not parts:
+            return []
+        return [
+            position
+            for position in self._occurrences.get(parts[0], [])
+            if self.norms[position : position + len(parts)] == parts
+        ]
+
+    def token_for_word(self, word_position: int) -> int:
+        return self.word_tokens[word_position]
+
+    def sentence_groups(self, max_tokens: int) -> List[Tuple[int, int]]:
+        """[start, end) character ranges of consecutive whole sentences, up to
+        `max_tokens` tokens each (a longer sentence is a group of its own).
+
+        The ranges cover the whole text in order; `max_tokens` <= 0 gives one.
+        """
+        if max_tokens <= 0 or not self.tokens:
+            return [(0, len(self.text))]
+        cuts, group_start, sentence_start = [], 0, 0
+        for position in range(1, len(self.tokens) + 1):
+            if position < len(self.tokens) and (
+                self.sentence_ids[position] == self.sentence_ids[position - 1]
+            ):
+                continue
+            # A sentence ends before `position`.
+            if position - group_start > max_tokens and sentence_start > group_start:
+                cuts.append(sentence_start)
+                group_start = sentence_start
+            sentence_start = position
+        starts = [0] + [self.char_starts[token] for token in cuts]
+        return list(zip(starts, starts[1:] + [len(self.text)]))
+
+    def char_span(self, token: int) -> Tuple[int, int]:
+        """[start, end) in the transcript text, or (-1, -1) for a missing token."""
+        if token < 0:
+            return -1, -1
+        return self.char_starts[token], self.char_ends[token]
+
+
+def align(tokens: Sequence[str], words: Sequence[str]) -> List[int]:
+    """Map each ASR word to a transcript token in one forward pass.
+
+    Both sides are in spoken order, so a word is looked for only within
+    ALIGN_WINDOW tokens of the cursor; words with no match (e.g. split
+    hyphenations, numbers spelled differently) stay unaligned and do not
+    move the cursor.
+    """
+    mapping = [-1] * len(words)
+    cursor = 0
+    for position, word in enumerate(words):
+        for candidate in range(cursor, min(cursor + ALIGN_WINDOW, len(tokens))):
+            if tokens[candidate] == word:
+                mapping[position] = candidate
+                cursor = candidate + 1
+                break
+    return mapping
@@ -0,0 +1,224 @@
+"""Token, audio and cost accounting for upstream LLM and ASR calls.
+
+Every chat completion and transcription is attributed to the innermost
+`log_execution_time` stage that made it (`predict_intended_word`, `grading`,
+...), summed per request inside `usage_scope()` and counted process-wide in
+`utils.metrics` as `usage.<stage>.*` and `usage.model.<model>.*`.
+
+Retries are HTTP attempts beyond one per call: the SDKs' transport retries,
+seen through an httpx request hook. An instructor re-ask after a validation
+error is a separate call of the same stage.
+"""
+
+import contextvars
+import json
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from config import settings
+from utils import metrics
+from utils.logging import current_stage
+
+# USD list prices: per 1M prompt/completion tokens, or per audio minute.
+# Override or extend with USAGE_PRICES.
+PRICES: Dict[str, Dict[str, float]] = {
+    "gpt-4o-mini": {"prompt": 0.15, "completion": 0.60},
+    "llama-3.3-70b-versatile": {"prompt": 0.59, "completion": 0.79},
+    "llama-3.2-1b-preview": {"prompt": 0.04, "completion": 0.04},
+    "whisper-1": {"audio_minute": 0.006},
+    "whisper-v3": {"audio_minute": 0.0015},
+    **settings.USAGE_PRICES,
+}
+
+
+@dataclass
+class StageUsage:
+    calls: int = 0
+    attempts: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    audio_seconds: float = 0.0
+    upstream_seconds: float = 0.0
+    cost_usd: float = 0.0
+    models: Set[str] = field(default_factory=set)
+
+    @property
+    def retries(self) -> int:
+        return max(self.attempts - self.calls, 0)
+
+    def as_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "audio_seconds": round(self.audio_seconds, 3),
+            "upstream_seconds": round(self.upstream_seconds, 3),
+            "cost_usd": round(self.cost_usd, 6),
+            "models": sorted(self.models),
+        }
+
+
+@dataclass
+class RequestUsage:
+    stages: Dict[str, StageUsage] = field(default_factory=dict)
+
+    def stage(self, name: str) -> StageUsage:
+        return self.stages.setdefault(name, StageUsage())
+
+    def total(self) -> StageUsage:
+        total = StageUsage()
+        for usage in self.stages.values():
+            total.calls += usage.calls
+            total.attempts += usage.attempts
+            total.errors += usage.errors
+            total.prompt_tokens += usage.prompt_tokens
+            total.completion_tokens += usage.completion_tokens
+            total.audio_seconds += usage.audio_seconds
+            total.upstream_seconds += usage.upstream_seconds
+            total.cost_usd += usage.cost_usd
+            total.models |= usage.models
+        return total
+
+    def metadata(self) -> List[Tuple[str, str]]:
+        """gRPC trailing metadata: request totals plus a per-stage JSON breakdown."""
+        total = self.total()
+        return [
+            ("usage-prompt-tokens", str(total.prompt_tokens)),
+            ("usage-completion-tokens", str(total.completion_tokens)),
+            ("usage-audio-seconds", f"{total.audio_seconds:.3f}"),
+            ("usage-calls", str(total.calls)),
+            ("usage-retries", str(total.retries)),
+            ("usage-cost-usd", f"{total.cost_usd:.6f}"),
+            (
+                "usage-stages",
+                json.dumps(
+                    {name: usage.as_dict() for name, usage in sorted(self.stages.items())},
+                    separators=(",", ":"),
+                ),
+            ),
+        ]
+
+
+_usage: contextvars.ContextVar[Optional[RequestUsage]] = contextvars.ContextVar(
+    "usage", default=None
+)
+
+
+@contextmanager
+def usage_scope() -> Iterator[RequestUsage]:
+    """Collect the usage of the calls made in this context (and its tasks)."""
+    usage = RequestUsage()
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+        total = usage.total()
+        if total.calls:
+            metrics.histogram("usage.request.prompt_tokens", total.prompt_tokens, metrics.TOKEN_BUCKETS)
+            metrics.histogram(
+                "usage.request.completion_tokens", total.completion_tokens, metrics.TOKEN_BUCKETS
+            )
+            metrics.observe("usage.request.cost_usd", total.cost_usd)
+            logging.info(
+                f"Usage: {total.calls} calls, {total.retries} retries, "
+                f"{total.prompt_tokens}+{total.completion_tokens} tokens, "
+                f"{total.audio_seconds:.1f}s audio, ${total.cost_usd:.5f}"
+            )
+
+
+def _cost(model: str, prompt_tokens: int, completion_tokens: int, audio_seconds: float) -> float:
+    price = PRICES.get(model, {})
+    return (
+        prompt_tokens * price.get("prompt", 0.0) / 1e6
+        + completion_tokens * price.get("completion", 0.0) / 1e6
+        + audio_seconds / 60 * price.get("audio_minute", 0.0)
+    )
+
+
+def record(
+    model: str,
+    seconds: float,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    audio_seconds: float = 0.0,
+    error: bool = False,
+) -> None:
+    """Account one upstream call to the current stage and request."""
+    stage = current_stage() or "unattributed"
+    cost = _cost(model, prompt_tokens, completion_tokens, audio_seconds)
+    usage = _usage.get()
+    if usage is not None:
+        entry = usage.stage(stage)
+        entry.calls += 1
+        entry.errors += error
+        entry.prompt_tokens += prompt_tokens
+        entry.completion_tokens += completion_tokens
+        entry.audio_seconds += audio_seconds
+        entry.upstream_seconds += seconds
+        entry.cost_usd += cost
+        entry.models.add(model)
+
+    for prefix in (f"usage.{stage}", f"usage.model.{model}"):
+        metrics.increment(f"{prefix}.calls")
+        if error:
+            metrics.increment(f"{prefix}.errors")
+        metrics.increment(f"{prefix}.prompt_tokens", prompt_tokens)
+        metrics.increment(f"{prefix}.completion_tokens", completion_tokens)
+        metrics.increment(f"{prefix}.audio_seconds", audio_seconds)
+        metrics.increment(f"{prefix}.cost_usd", cost)
+    metrics.histogram(f"usage.model.{model}.seconds", seconds)
+    if prompt_tokens:
+        metrics.histogram(f"usage.{stage}.prompt_tokens", prompt_tokens, metrics.TOKEN_BUCKETS)
+
+
+async def _on_request(request) -> None:
+    stage = current_stage() or "unattributed"
+    usage = _usage.get()
+    if usage is not None:
+        usage.stage(stage).attempts += 1
+    metrics.increment(f"usage.{stage}.attempts")
+
+
+def http_client(sdk):
+    """The SDK's default async httpx client with the attempt-counting hook."""
+    return sdk.DefaultAsyncHttpxClient(event_hooks={"request": [_on_request]})
+
+
+def instrument(client):
+    """Record usage of the client's chat completions.
+
+    Like the cassette, this replaces the method on the resource instance, so
+    instructor still recognises the client. Transcriptions are recorded by
+    the ASR router, which sees every backend; clients without chat
+    completions are returned as they are.
+    """
+    if getattr(client, "chat", None) is None:
+        return client
+    create = client.chat.completions.create
+
+    async def create_and_record(*args, **kwargs):
+        model = kwargs.get("model", "")
+        start = time.monotonic()
+        try:
+            response = await create(*args, **kwargs)
+        except Exception:
+            record(model, time.monotonic() - start, error=True)
+            raise
+        tokens = getattr(response, "usage", None)
+        record(
+            model,
+            time.monotonic() - start,
+            prompt_tokens=getattr(tokens, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(tokens, "completion_tokens", 0) or 0,
+        )
+        return response
+
+    client.chat.completions.create = create_and_record
+    return client
@@ -0,0 +1,61 @@
+from typing import List, Tuple
+
+import numpy as np
+
+FRAME_SECONDS = 0.03
+HOP_SECONDS = 0.01
+# Frames quieter than this are never speech, whatever the noise floor.
+ABSOLUTE_FLOOR_DB = -55.0
+# Speech sits at least this far above the noise floor...
+NOISE_MARGIN_DB = 8.0
+# ...and no further than this below the loudest frames.
+DYNAMIC_RANGE_DB = 35.0
+
+
+def frame_energy_db(y: np.ndarray, sr: int) -> np.ndarray:
+    """Mean-square energy (dBFS) of overlapping frames, via a running sum."""
+    frame = max(1, int(FRAME_SECONDS * sr))
+    hop = max(1, int(HOP_SECONDS * sr))
+    if len(y) < frame:
+        return np.full(1, 10 * np.log10(np.mean(np.square(y, dtype=np.float64)) + 1e-12))
+    squares = np.concatenate(([0.0], np.cumsum(np.square(y, dtype=np.float64))))
+    starts = np.arange(0, len(y) - frame + 1, hop)
+    energy = (squares[starts + frame] - squares[starts]) / frame
+    return 10 * np.log10(energy + 1e-12)
+
+
+def detect_speech(
+    y: np.ndarray,
+    sr: int,
+    min_gap: float = 0.25,
+    min_segment: float = 0.1,
+) -> List[Tuple[float, float]]:
+    """Return (start, end) seconds of speech using an adaptive energy threshold.
+
+    Pauses shorter than `min_gap` are bridged and blips shorter than
+    `min_segment` dropped.
+    """
+    db = frame_energy_db(y, sr)
+    noise_floor = np.percentile(db, 10)
+    threshold = max(
+        noise_floor + NOISE_MARGIN_DB,
+        np.percentile(db, 99) - DYNAMIC_RANGE_DB,
+        ABSOLUTE_FLOOR_DB,
+    )
+    voiced = np.concatenate(([False], db > threshold, [False]))
+    edges = np.flatnonzero(np.diff(voiced.astype(np.int8)))
+    frame = FRAME_SECONDS
+    segments: List[Tuple[float, float]] = []
+    for start_idx, end_idx in zip(edges[::2], edges[1::2]):
+        start = start_idx * HOP_SECONDS
+        end = (end_idx - 1) * HOP_SECONDS + frame
+        if segments and start - segments[-1][1] < min_gap:
+            segments[-1] = (segments[-1][0], end)
+        else:
+            segments.append((start, end))
+    duration = len(y) / sr
+    return [
+        (round(s, 3), round(min(e, duration), 3))
+        for s, e in segments
+        if e - s >= min_segment
+    ]